@@ -1,3 +1,33 @@
-from .alephmarc21reader import AlephMarc21Reader
-from .alephmarcxmlreader import AlephMarcXMLReader
-from .alephxreader import AlephXReader
\ No newline at end of file
+import sys
+
+# public name -> module defining it. On Python 3.7+ the modules are imported on first access,
+# so that only the backend in use (and its dependency, pymarc or lxml) is loaded.
+_LAZY_NAMES = {
+    'AlephMarc21Reader': 'alephmarc21reader',
+    'AlephMarc21Dump': 'alephmarc21reader',
+    'AlephMarc21RawReader': 'alephmarc21rawreader',
+    'AlephMarcXMLReader': 'alephmarcxmlreader',
+    'AlephXReader': 'alephxreader',
+}
+
+__all__ = sorted(_LAZY_NAMES)
+
+if sys.version_info < (3, 7):
+    # no module level __getattr__ (PEP 562)
+    from .alephmarc21reader import AlephMarc21Reader, AlephMarc21Dump
+    from .alephmarc21rawreader import AlephMarc21RawReader
+    from .alephmarcxmlreader import AlephMarcXMLReader
+    from .alephxreader import AlephXReader
+else:
+    def __getattr__(name):
+        module_name = _LAZY_NAMES.get(name)
+        if module_name is None:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+        import importlib
+        value = getattr(importlib.import_module('.' + module_name, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_NAMES))
@@ -0,0 +1,154 @@
+"""
+Helpers shared by the modules that store a corpus in files or NumPy arrays
+(`sysnoindex`, `sync`, `gndindex`, `dateindex`, `dates` and `columnar`).
+
+The index files written with NumPy consist of a `struct` header followed by arrays, each padded
+to a multiple of 8 bytes, the last of which holds the record ids. They are memory mapped on lookup.
+"""
+import contextlib
+import os
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def require_numpy(module_name):
+    """
+    Raises an ImportError if NumPy is not installed.
+    :param str module_name: the name of the module that requires NumPy, e.g. 'alephmarcreader.dates'.
+    """
+    if numpy is None:
+        raise ImportError('{} requires NumPy, install it with `pip install numpy`'.format(module_name))
+require_numpy.__annotations__ = {'module_name': str}
+
+
+def align(n):
+    """
+    Rounds a size in bytes up to the next multiple of 8.
+    """
+    return (n + 7) // 8 * 8
+
+
+def to_bytes_array(values):
+    """
+    Returns UTF-8 encoded strings as a fixed width byte string array (at least 1 byte wide).
+    """
+    values = [value.encode('utf-8') for value in values]
+    return numpy.array(values, dtype='S{}'.format(max([len(value) for value in values] + [1])))
+
+
+@contextlib.contextmanager
+def replace_atomically(path, mode='wb'):
+    """
+    Opens a temporary file that replaces `path` once it has been written completely.
+    A concurrent reader never sees a half written file, and if writing fails, the previous file is kept.
+    :param str path: the path of the file.
+    :param str mode: the mode to open the temporary file with.
+    :return: context manager yielding the open temporary file.
+    """
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, mode) as tmp_file:
+            yield tmp_file
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+replace_atomically.__annotations__ = {'path': str}
+
+
+def write_index(path, header, arrays):
+    """
+    Writes an index file: the header, then the arrays, each padded to a multiple of 8 bytes.
+    :param str path: the path of the index file.
+    :param bytes header: the packed header.
+    :param [numpy.ndarray] arrays: the arrays, the record ids last.
+    """
+    with replace_atomically(path) as index_file:
+        index_file.write(header)
+        for array in arrays:
+            data = array.tobytes()
+            index_file.write(data + b'\0' * (align(len(data)) - len(data)))
+write_index.__annotations__ = {'path': str, 'header': bytes}
+
+
+class MemoryMappedIndex(object):
+    """
+    Base of the indexes that are read from a memory mapped file written by `write_index`.
+    Subclasses read their arrays with `_take` in the order they were written, the record ids last.
+    Can be used as a context manager, which releases the file on exit.
+    :param str path: the path of the index file.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.__data = None
+        self.__position = 0
+        self.__record_ids = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open(self, header, magic, description):
+        """
+        Reads and checks the header and memory maps the file.
+        :param struct.Struct header: the header, starting with the magic.
+        :param bytes magic: the magic that identifies the kind of index.
+        :param str description: the kind of index, used in the error message, e.g. 'GND index'.
+        :return: tuple the unpacked header, without the magic.
+        """
+        with open(self.path, 'rb') as index_file:
+            packed = index_file.read(header.size)
+        if len(packed) < header.size or packed[:len(magic)] != magic:
+            raise ValueError('{} is not a {}'.format(self.path, description))
+
+        self.__data = numpy.memmap(self.path, dtype=numpy.uint8, mode='r')
+        self.__position = header.size
+        return header.unpack(packed)[1:]
+
+    def _take(self, dtype, count):
+        """
+        Returns the next array of the file.
+        :param dtype: the NumPy type of the array.
+        :param int count: the number of values.
+        :return: numpy.ndarray a view of the memory map.
+        """
+        dtype = numpy.dtype(dtype)
+        start = self.__position
+        self.__position = align(start + dtype.itemsize * count)
+        return self.__data[start:start + dtype.itemsize * count].view(dtype)
+
+    def _take_record_ids(self, width, count):
+        """
+        Reads the record ids, the last array of the file.
+        :param int width: the width of a record id in bytes.
+        :param int count: the number of records.
+        """
+        self.__record_ids = self._take('S{}'.format(width), count)
+        self.__data = None
+
+    def close(self):
+        """
+        Releases the memory map. Arrays returned before are not valid any more.
+        """
+        self.__data = self.__record_ids = None
+
+    @property
+    def record_count(self):
+        """
+        :return: int the number of records in the corpus.
+        """
+        return len(self.__record_ids)
+
+    def get_record_ids(self, records):
+        """
+        Returns the ids of records.
+        :param numpy.ndarray records: record numbers.
+        :return: [str]
+        """
+        return [record_id.decode('utf-8') for record_id in self.__record_ids[numpy.asarray(records, dtype=numpy.int64)]]
@@ -1,13 +1,182 @@
 import abc
+import functools
+import importlib
+import os
 import sys
 
+from . import diagnostics as _diagnostics
+
 # compatible with Python 2 *and* 3:
 ABC = abc.ABCMeta('ABC', (object,), {'__slots__': ()})
 
+try:
+    _intern = sys.intern
+    _TEXT_TYPES = (str,)
+except AttributeError:
+    # Python 2, where the readers mostly return unicode text, which intern() does not accept
+    _TEXT_TYPES = (str, unicode)
+    _interned_unicode = {}
+
+    def _intern(value):
+        if type(value) is unicode:
+            return _interned_unicode.setdefault(value, value)
+        return intern(value)
+
+
+def _intern_text(value):
+    """
+    Interns a string, so that repeated values (role codes, GNDs, institutions) are held in memory only once.
+    Other values (e.g. False) are returned as they are.
+    """
+    # not isinstance: subclasses of str cannot be interned
+    if type(value) in _TEXT_TYPES:
+        return _intern(value)
+    return value
+
+
+def _get_class_path(cls):
+    """
+    Returns the module and the dotted path of a class within it (Python 2 has no `__qualname__`).
+    :return: (str, str)
+    """
+    path = getattr(cls, '__qualname__', None)
+    if path is None:
+        path = cls.__name__
+        for name, value in vars(sys.modules[cls.__module__]).items():
+            if isinstance(value, type) and value.__dict__.get(cls.__name__) is cls:
+                path = name + '.' + cls.__name__
+                break
+    return cls.__module__, path
+
+
+def _make_entity(class_path, values, frozen):
+    """
+    Recreates an entity (used for pickling).
+    Classes are referenced by their path, because Python 2 cannot pickle nested classes.
+    """
+    cls = importlib.import_module(class_path[0])
+    for name in class_path[1].split('.'):
+        cls = getattr(cls, name)
+    entity = cls.__new__(cls)
+    for name, value in zip(cls._get_fields(), values):
+        object.__setattr__(entity, name, value)
+    return entity.freeze() if frozen else entity
+
+
+class _Entity(object):
+    """
+    Base of the entities returned by the getters.
+
+    Entities store their attributes in `__slots__` (no per-instance `__dict__`) and compare by identity.
+    Calling `freeze()` makes an entity immutable; frozen entities compare equal and hash alike
+    if they are of the same type and have the same attribute values.
+    """
+    __slots__ = ()
+
+    __fields = {}
+    __frozen_classes = {}
+
+    @classmethod
+    def _get_fields(cls):
+        """
+        Returns the names of all attributes, from the base class to the subclass.
+        :return: (str)
+        """
+        fields = _Entity.__fields.get(cls)
+        if fields is None:
+            fields = []
+            for klass in reversed(cls.__mro__):
+                fields.extend(klass.__dict__.get('__slots__', ()))
+            fields = _Entity.__fields[cls] = tuple(fields)
+        return fields
+
+    def _get_values(self):
+        """
+        Returns the attribute values, with lists turned into tuples.
+        :return: tuple
+        """
+        return tuple(tuple(value) if isinstance(value, list) else value
+                     for value in (getattr(self, name) for name in self._get_fields()))
+
+    def __reduce__(self):
+        return _make_entity, (_get_class_path(self._get_base_class()),
+                              tuple(getattr(self, name) for name in self._get_fields()),
+                              type(self) is not self._get_base_class())
+
+    def __repr__(self):
+        return '{}({})'.format(self._get_base_class().__name__,
+                               ', '.join('{}={!r}'.format(name, getattr(self, name)) for name in self._get_fields()))
+
+    @classmethod
+    def _get_base_class(cls):
+        return cls.__dict__.get('_base_class', cls)
+
+    def freeze(self):
+        """
+        Makes the entity immutable: lists (e.g. roles) become tuples and setting attributes raises an AttributeError.
+        From then on, it compares equal to and hashes like frozen entities of the same type with the same values.
+        :return: the entity itself.
+        """
+        for name in self._get_fields():
+            value = getattr(self, name)
+            if isinstance(value, list):
+                object.__setattr__(self, name, tuple(value))
+
+        base_class = self._get_base_class()
+        frozen_class = _Entity.__frozen_classes.get(base_class)
+        if frozen_class is None:
+            # same slots as the base class, so that instances can switch to it
+            frozen_class = type(base_class)('Frozen' + base_class.__name__, (base_class,), {
+                '__slots__': (),
+                '__module__': base_class.__module__,
+                '_base_class': base_class,
+                '__setattr__': _Entity.__setattr_frozen,
+                '__delattr__': _Entity.__setattr_frozen,
+                '__eq__': _Entity.__eq_frozen,
+                '__ne__': _Entity.__ne_frozen,
+                '__hash__': _Entity.__hash_frozen,
+            })
+            _Entity.__frozen_classes[base_class] = frozen_class
+        self.__class__ = frozen_class
+        return self
+
+    def __setattr_frozen(self, name, value=None):
+        raise AttributeError('{} is frozen'.format(type(self).__name__))
+
+    def __eq_frozen(self, other):
+        # mutable entities compare by identity, they are never equal to a frozen one
+        if not isinstance(other, _Entity) or type(other) is other._get_base_class() or \
+                self._get_base_class() is not other._get_base_class():
+            return NotImplemented
+        return self._get_values() == other._get_values()
+
+    def __ne_frozen(self, other):
+        equal = self.__eq_frozen(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash_frozen(self):
+        return hash((self._get_base_class(), self._get_values()))
+
+
+def _memoized(getter):
+    """
+    Caches the result list of a getter per reader, if memoization is enabled for the reader.
+    A copy of the cached list is returned, so callers may modify it.
+    """
+    @functools.wraps(getter)
+    def memoized_getter(self):
+        if not self.memoize:
+            return getter(self)
+        result = self._memo.get(getter.__name__)
+        if result is None:
+            result = self._memo[getter.__name__] = getter(self)
+        return list(result)
+    return memoized_getter
+
 
 class AbstractAlephMarcReader(ABC):
 
-    class Correspondent(ABC):
+    class Correspondent(ABC, _Entity):
         """
         Represents an abstract correspondent.
         Both Persons and Organisations can be Correspondents.
@@ -17,13 +186,15 @@ class AbstractAlephMarcReader(ABC):
 
         """
 
+        __slots__ = ('name', 'gnd', 'roles')
+
         CORRESPONDENT_TYPE_PERSON = 'Person'
         CORRESPONDENT_TYPE_ORGANISATION = 'Organisation'
 
         def __init__(self, name, gnd, roles):
             self.name = name
-            self.gnd = gnd
-            self.roles = roles
+            self.gnd = _intern_text(gnd)
+            self.roles = [_intern_text(role) for role in roles] if isinstance(roles, list) else roles
 
         @abc.abstractmethod
         def get_type(self):
@@ -43,6 +214,8 @@ class AbstractAlephMarcReader(ABC):
 
         """
 
+        __slots__ = ('lifespan',)
+
         def __init__(self, name, lifespan, gnd, roles):
             super(AbstractAlephMarcReader.Person, self).__init__(name, gnd, roles)
             self.lifespan = lifespan
@@ -60,26 +233,30 @@ class AbstractAlephMarcReader(ABC):
         :param str|False division of the organisation.
         """
 
+        __slots__ = ('place', 'division')
+
         def __init__(self, name, gnd, roles, place, division):
-            super(AbstractAlephMarcReader.Organisation, self).__init__(name, gnd, roles)
-            self.place = place
-            self.division = division
+            super(AbstractAlephMarcReader.Organisation, self).__init__(_intern_text(name), gnd, roles)
+            self.place = _intern_text(place)
+            self.division = _intern_text(division)
 
         def get_type(self):
             return AbstractAlephMarcReader.Correspondent.CORRESPONDENT_TYPE_ORGANISATION
 
-    class Place:
+    class Place(_Entity):
         """
         Represents a place.
         :param str|False name: the name of the place, if any.
         :param str|False gnd: the GND of the place, otherwise 'no_GND', if any.
         """
 
+        __slots__ = ('name', 'gnd')
+
         def __init__(self, name, gnd):
-            self.name = name
-            self.gnd = gnd
+            self.name = _intern_text(name)
+            self.gnd = _intern_text(gnd)
 
-    class Shelfmark:
+    class Shelfmark(_Entity):
         """
         Represents a shelfmark.
         :param str|False institution: the name of the institution, if any.
@@ -87,13 +264,16 @@ class AbstractAlephMarcReader(ABC):
         :param str|False country: the country, if any.
         :param str|False collection: the collection, if any.
         """
+
+        __slots__ = ('institution', 'identifier', 'country', 'collection')
+
         def __init__(self, institution, identifier, country, collection):
-            self.institution = institution
+            self.institution = _intern_text(institution)
             self.identifier = identifier
-            self.country = country
-            self.collection = collection
+            self.country = _intern_text(country)
+            self.collection = _intern_text(collection)
 
-    class Description:
+    class Description(_Entity):
         """
         Represents the physical description.
         :param str extent: the extent of the manuscript, i.e. number of pages.
@@ -101,31 +281,40 @@ class AbstractAlephMarcReader(ABC):
         :param str|False dimension: the dimension of the manuscript, if any.
         :param str|False supplement: supplementary material, if any.
         """
+
+        __slots__ = ('extent', 'attribute', 'dimension', 'supplement')
+
         def __init__(self, extent, attribute, dimension, supplement):
             self.extent = extent
             self.attribute = attribute
             self.dimension = dimension
             self.supplement = supplement
 
-    class OriginalDate:
+    class OriginalDate(_Entity):
         """
         Represents the date, as written on the letter.
         :param str|False date; transcription of the date, as given in the letter, if any.
         :param str|False place; transcription of the place, as given in the letter, if any.
         """
+
+        __slots__ = ('date', 'place')
+
         def __init__(self, date, place):
             self.date = date
             self.place = place
 
-    class BiblioReference:
+    class BiblioReference(_Entity):
         """
         Represents bibliographic references.
         :param str reference; a string refering to one or more bibliographic items
         :param str|False prefix; prefix to the bibliographic item, if any. (e.g. "Abgedruckt in", "Inhaltsangabe", etc)
         """
+
+        __slots__ = ('reference', 'prefix')
+
         def __init__(self, reference, prefix):
             self.reference = reference
-            self.prefix = prefix
+            self.prefix = _intern_text(prefix)
 
         def get_pretty_string(self):
             """
@@ -137,7 +326,9 @@ class AbstractAlephMarcReader(ABC):
             else:
                 return self.reference
 
-    class StandardizedDate:
+    class StandardizedDate(_Entity):
+
+        __slots__ = ('start_span', 'end_span')
 
         TIMESPAN_SEPARATOR_KNORA = u':'
         CALENDAR_PREFIX_KNORA = u'GREGORIAN' + TIMESPAN_SEPARATOR_KNORA
@@ -197,13 +388,33 @@ class AbstractAlephMarcReader(ABC):
             if self.end_span:
                 self.end_span = self.end_span.replace('.', '-')
 
+    # sink for warnings and errors (see `alephmarcreader.diagnostics`), None for the default sink.
+    # Can be set per reader class or per reader.
+    diagnostics = None
+
+    # the marc tags read by the getters, e.g. as projection (`tags`) when creating readers.
+    # Control fields (00X) are always kept.
+    GETTER_TAGS = frozenset(['024', '041', '046', '100', '250', '264', '300', '500', '520', '525', '533', '534',
+                             '544', '581', '600', '610', '700', '710', '751', '852'])
 
     def __init__(self, gnd_index, file_path):
         """
         :param gnd_index: index of the GND subfield.
+        :param str|None file_path: the path to the file the record was read from, if any. Only used in messages.
         """
         self._gnd_index = gnd_index
         self._file_path = file_path
+        self.__subfield_maps = {}
+
+        # opt-in: when set to True, parsed correspondents and getter results are cached (see `clear_cache`)
+        self.memoize = False
+        self._memo = {}
+
+    def clear_cache(self):
+        """
+        Drops all results cached while memoization was enabled (`memoize = True`).
+        """
+        self._memo.clear()
 
     @abc.abstractmethod
     def __get_subfield_texts(self, marc_field, index):
@@ -213,12 +424,84 @@ class AbstractAlephMarcReader(ABC):
     def __get_field(self, index):
         pass
 
+    @abc.abstractmethod
+    def __iter_subfields(self, marc_field):
+        """
+        Yields the subfields of a marc field as (code, text) pairs, in the order they occur.
+        :param marc_field: marc field.
+        :return: iterator of (str, str)
+        """
+        pass
+
+    @abc.abstractmethod
+    def __get_control_fields(self, index):
+        """
+        Returns the data of the control fields (e.g. 001, 005) with the given tag.
+        :param index: tag of the control field.
+        :return: [str]
+        """
+        pass
+
+    def control_field(self, tag):
+        """
+        Returns the data of a control field, e.g. the system number (001)
+        or the date and time of the latest transaction (005).
+        Control fields are kept by all projections (`tags`).
+        :param str tag: tag of the control field.
+        :return: str|None the data of the first control field with the tag, None if the record has none.
+        """
+        values = self.__get_control_fields(tag)
+        if not values:
+            return None
+        return values[0]
+    control_field.__annotations__ = {'tag': str}
+
+    def record_id(self):
+        """
+        Returns the id of the record used by the indexes and exports by default:
+        the system number (controlfield 001), or the file name without extension if there is none.
+        :return: str
+        """
+        sysno = self.control_field('001')
+        if sysno:
+            return sysno
+        if self._file_path is None:
+            return ''
+        return os.path.splitext(os.path.basename(self._file_path))[0]
+    record_id.__annotations__ = {'return': str}
+
+    def _get_subfield_map(self, marc_field):
+        """
+        Returns the subfield texts of a marc field grouped by subfield code.
+        The map is built on first access and reused by all later lookups on the same field.
+        :param marc_field: marc field.
+        :return: {str: [str]}
+        """
+        # keyed by id(), the field is kept in the entry so that the id cannot be reused
+        entry = self.__subfield_maps.get(id(marc_field))
+        if entry is None:
+            subfield_map = {}
+            for code, text in self.__iter_subfields(marc_field):
+                subfield_map.setdefault(code, []).append(text)
+            entry = (marc_field, subfield_map)
+            self.__subfield_maps[id(marc_field)] = entry
+        return entry[1]
+
+    def _get_source_name(self):
+        """
+        Returns the path of the file the record was read from, or a placeholder for records read from memory.
+        :return: str
+        """
+        if self._file_path is None:
+            return u'<in-memory record>'
+        return self._file_path
+
     def _handle_subfields_cardinality_max_one(self, subfields, field_tag, subfield_code):
         """
         Handles subfields whose occurrence is max one (optional):
         - empty list -> False
         - one entry -> str
-        If more than one Subfield should occur, the first one is used and a warning printed to `stderr`.
+        If more than one Subfield should occur, the first one is used and a warning reported to the diagnostics sink.
         :param [str] subfields: the subfields to handle
         :param str field_tag: The marc field tag of the field containing subfields
         :param str subfield_code: The marc subfield code of subfields
@@ -227,14 +510,46 @@ class AbstractAlephMarcReader(ABC):
         if len(subfields) == 1:
             return subfields[0]
         elif len(subfields) > 1:
-            sys.stderr.write(u'!!! WARNING: In \'{}\', Field \'{}\', Subfield \'{}\': '
-                             u'Expected maximum 1 Subfield, found {}.\n'
-                             .format(self._file_path, field_tag, subfield_code, len(subfields)))
+            _diagnostics.resolve(self).report(_diagnostics.ISSUE_CARDINALITY, self._get_source_name(),
+                                              field_tag, subfield_code, len(subfields))
             return subfields[0]
         else:
             return False
 
+    def __get_memoized_info(self, kind, marc_field, field_tag, get_info):
+        """
+        Returns the entity parsed from a marc field, parsing it only once if memoization is enabled.
+        """
+        if not self.memoize:
+            return get_info(marc_field, field_tag)
+        # keyed by id(), the field is kept in the entry so that the id cannot be reused
+        key = (kind, id(marc_field), field_tag)
+        entry = self._memo.get(key)
+        if entry is None:
+            entry = self._memo[key] = (marc_field, get_info(marc_field, field_tag))
+        return entry[1]
+
     def _get_person_info(self, marc_field, field_tag):
+        """
+        Extracts person information from a Marc field incl. the GND, if any.
+        If memoization is enabled, each field is parsed only once and the same Person is returned on every call.
+        :param pymarc.field.Field marc_field: the Marc21 field that contains information about a person.
+        :param str field_tag: The marc field tag of marc_field
+        :return: Person
+        """
+        return self.__get_memoized_info('person', marc_field, field_tag, self.__get_person_info)
+
+    def _get_organisation_info(self, marc_field, field_tag):
+        """
+        Extracts organisation info from a Marc field incl. the GND, if any.
+        If memoization is enabled, each field is parsed only once and the same Organisation is returned on every call.
+        :param pymarc.field.Field marc_field: the Marc21 field that contains information about a person.
+        :param str field_tag: The marc field tag of marc_field
+        :return: [Organisation]
+        """
+        return self.__get_memoized_info('organisation', marc_field, field_tag, self.__get_organisation_info)
+
+    def __get_person_info(self, marc_field, field_tag):
         """
         Extracts person information from a Marc field incl. the GND, if any.
         :param pymarc.field.Field marc_field: the Marc21 field that contains information about a person.
@@ -256,7 +571,7 @@ class AbstractAlephMarcReader(ABC):
 
         return self.Person(name, date, gnd, roles)
 
-    def _get_organisation_info(self, marc_field, field_tag):
+    def __get_organisation_info(self, marc_field, field_tag):
         """
         Extracts organisation info from a Marc field incl. the GND, if any.
         :param pymarc.field.Field marc_field: the Marc21 field that contains information about a person.
@@ -279,6 +594,7 @@ class AbstractAlephMarcReader(ABC):
 
         return self.Organisation(name, gnd, roles, place, division)
 
+    @_memoized
     def get_author(self):
         """
         Returns information about the author.
@@ -305,6 +621,7 @@ class AbstractAlephMarcReader(ABC):
         return author
     get_author.__annotations__ = {'return': [Correspondent]}
 
+    @_memoized
     def get_recipient(self):
         """
         Returns information about the recipient.
@@ -326,6 +643,7 @@ class AbstractAlephMarcReader(ABC):
         return recipient
     get_recipient.__annotations__ = {'return': [Correspondent]}
 
+    @_memoized
     def get_mentioned_person(self):
         """
         Returns information about a mentioned person.
@@ -338,6 +656,7 @@ class AbstractAlephMarcReader(ABC):
         return mentioned
     get_mentioned_person.__annotations__ = {'return': [Person]}
 
+    @_memoized
     def get_standardized_date(self):
         """
         Returns the standardized date.
@@ -355,6 +674,7 @@ class AbstractAlephMarcReader(ABC):
         return std_date
     get_standardized_date.__annotations__ = {'return': [StandardizedDate]}
 
+    @_memoized
     def get_date(self):
         """
         Returns the date.
@@ -370,6 +690,7 @@ class AbstractAlephMarcReader(ABC):
         return date
     get_date.__annotations__ = {'return': [str]}
 
+    @_memoized
     def get_creation_place(self):
         """
         Returns the place of creation.
@@ -389,6 +710,7 @@ class AbstractAlephMarcReader(ABC):
         return creation_place
     get_creation_place.__annotations__ = {'return': [Place]}
 
+    @_memoized
     def get_shelfmark(self):
         """
         Returns the shelfmark.
@@ -408,6 +730,7 @@ class AbstractAlephMarcReader(ABC):
         return shelfmark
     get_shelfmark.__annotations__ = {'return': [Shelfmark]}
 
+    @_memoized
     def get_general_remarks(self):
         """
         Returns the general remarks.
@@ -424,6 +747,7 @@ class AbstractAlephMarcReader(ABC):
         return footnote
     get_general_remarks.__annotations__ = {'return': [str]}
 
+    @_memoized
     def get_content_summary(self):
         """
         Returns the content summary.
@@ -440,6 +764,7 @@ class AbstractAlephMarcReader(ABC):
         return summary
     get_content_summary.__annotations__ = {'return': [str]}
 
+    @_memoized
     def get_emanuscripta_doi(self):
         """
         Returns the emanuscripta DOI.
@@ -457,6 +782,7 @@ class AbstractAlephMarcReader(ABC):
 
     get_emanuscripta_doi.__annotations__ = {'return': [str]}
 
+    @_memoized
     def get_physical_description(self):
         """
         Returns the physical description.
@@ -476,6 +802,7 @@ class AbstractAlephMarcReader(ABC):
 
     get_physical_description.__annotations__ = {'return': [Description]}
 
+    @_memoized
     def get_language(self):
         """
         Returns the language.
@@ -494,6 +821,7 @@ class AbstractAlephMarcReader(ABC):
 
     get_language.__annotations__ = {'return': [str]}
 
+    @_memoized
     def get_mentioned_organisation(self):
         """
         Returns the mentioned organisation.
@@ -507,6 +835,7 @@ class AbstractAlephMarcReader(ABC):
 
     get_mentioned_organisation.__annotations__ = {'return': [Organisation]}
 
+    @_memoized
     def get_supplement_remarks(self):
         """
         Returns comments on supplementing material following the letter.
@@ -524,6 +853,7 @@ class AbstractAlephMarcReader(ABC):
 
     get_supplement_remarks.__annotations__ = {'return': [str]}
 
+    @_memoized
     def get_document_state(self):
         """
         Returns a description of the document state. (i.e. "original", "copy", "draft", etc.)
@@ -541,6 +871,7 @@ class AbstractAlephMarcReader(ABC):
 
     get_document_state.__annotations__ = {'return': [str]}
 
+    @_memoized
     def get_original_date_and_place(self):
         """
         Returns a transcription of the date and place, as given on the letter.
@@ -568,6 +899,7 @@ class AbstractAlephMarcReader(ABC):
 
     get_original_date_and_place.__annotations__ = {'return': [OriginalDate]}
 
+    @_memoized
     def get_references_to_related_entries(self):
         """
         Returns a list of related entries.
@@ -600,6 +932,7 @@ class AbstractAlephMarcReader(ABC):
 
     get_references_to_related_entries.__annotations__ = {'return': [OriginalDate]}
 
+    @_memoized
     def get_bibliographic_references(self):
         """
         Returns bibliographic references relevant to the letter. (Usually, where it has been printed.)
@@ -617,7 +950,79 @@ class AbstractAlephMarcReader(ABC):
 
     get_bibliographic_references.__annotations__ = {'return': [BiblioReference]}
 
+    def extract_all(self):
+        """
+        Returns the results of all public getters at once, visiting each field only once.
+        (`get_author` and `get_recipient` both parse the fields 700 and 710,
+        `get_date` and `get_standardized_date` both read the field 046.)
+        :return: {str: list} getter name without `get_` -> the same list the getter returns.
+        """
+        persons = [self._get_person_info(field, '700') for field in self.__get_field('700')]
+        organisations = [self._get_organisation_info(field, '710') for field in self.__get_field('710')]
 
+        author = [self._get_person_info(field, '100') for field in self.__get_field('100')]
+        author.extend(person for person in persons if "aut" in person.roles)
+        author.extend(organisation for organisation in organisations if "aut" in organisation.roles)
 
+        recipient = [person for person in persons if "rcp" in person.roles]
+        recipient.extend(organisation for organisation in organisations if "rcp" in organisation.roles)
 
+        std_date = []
+        date = []
+        for field in self.__get_field('046'):
+            date_start = self._handle_subfields_cardinality_max_one(self.__get_subfield_texts(field, 'c'), '046', 'c')
+            date_end = self._handle_subfields_cardinality_max_one(self.__get_subfield_texts(field, 'e'), '046', 'e')
+
+            if date_start:
+                std_date.append(self.StandardizedDate(date_start, date_end))
+                date.append(date_start)
+
+        return {
+            'author': author,
+            'recipient': recipient,
+            'mentioned_person': self.get_mentioned_person(),
+            'standardized_date': std_date,
+            'date': date,
+            'creation_place': self.get_creation_place(),
+            'shelfmark': self.get_shelfmark(),
+            'general_remarks': self.get_general_remarks(),
+            'content_summary': self.get_content_summary(),
+            'emanuscripta_doi': self.get_emanuscripta_doi(),
+            'physical_description': self.get_physical_description(),
+            'language': self.get_language(),
+            'mentioned_organisation': self.get_mentioned_organisation(),
+            'supplement_remarks': self.get_supplement_remarks(),
+            'document_state': self.get_document_state(),
+            'original_date_and_place': self.get_original_date_and_place(),
+            'references_to_related_entries': self.get_references_to_related_entries(),
+            'bibliographic_references': self.get_bibliographic_references(),
+        }
+
+    extract_all.__annotations__ = {'return': {str: list}}
+
+    def to_dict(self):
+        """
+        Returns the results of all public getters as plain data (dicts, lists and strings),
+        e.g. for serialisation to JSON. Entities become dicts of their attributes,
+        correspondents additionally hold their `type` ('Person' or 'Organisation').
+        :return: {str: list} getter name without `get_` -> list of plain data.
+        """
+        return dict((name, self._to_plain(value)) for name, value in self.extract_all().items())
+
+    to_dict.__annotations__ = {'return': {str: list}}
 
+    @classmethod
+    def _to_plain(cls, value):
+        """
+        Turns a getter result into plain data.
+        :param value: a list of entities or strings, an entity or a string.
+        :return: list|dict|str|False
+        """
+        if isinstance(value, (list, tuple)):
+            return [cls._to_plain(item) for item in value]
+        if isinstance(value, _Entity):
+            plain = dict((key, cls._to_plain(getattr(value, key))) for key in value._get_fields())
+            if isinstance(value, cls.Correspondent):
+                plain['type'] = value.get_type()
+            return plain
+        return value
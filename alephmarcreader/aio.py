@@ -0,0 +1,302 @@
+"""
+Asynchronous AlephX client: fetches the `find-doc` responses of many system numbers concurrently
+over a pool of keep-alive HTTP/1.1 connections and parses them into `AlephXReader` instances in a thread pool.
+
+Only the standard library (asyncio streams) is used, no HTTP client package is needed. Requires Python 3.7+.
+
+    results = asyncio.run(fetch_records(['000055275', '000056870'], 'https://aleph.unibas.ch/X', concurrency=8))
+"""
+import asyncio
+import collections
+import concurrent.futures
+import random
+import ssl
+from urllib.parse import urlencode, urlsplit
+
+from lxml import etree
+
+from .alephxreader import AlephXReader
+
+DEFAULT_LIBRARY = 'DSV05'
+
+# responses that are worth another try
+RETRY_STATUSES = frozenset([408, 429, 500, 502, 503, 504])
+
+FetchResult = collections.namedtuple('FetchResult', ['sysno', 'reader', 'error'])
+FetchResult.__doc__ = """
+Result of fetching one record.
+:param str sysno: the system number.
+:param AlephXReader|None reader: the reader for the record, None if fetching or parsing failed.
+:param str|None error: the error if fetching or parsing failed, otherwise None.
+"""
+
+
+class StaleConnectionError(ConnectionError):
+    """
+    Raised if a reused idle connection has been closed by the server in the meantime.
+    The request can be retried right away on a new connection.
+    """
+
+
+class ProtocolError(Exception):
+    """
+    Raised if the server sends a response that is not valid HTTP/1.1, e.g. a malformed status line or chunk size.
+    The connection is closed, the request can be retried.
+    """
+
+
+class _Connection(object):
+    """
+    One HTTP/1.1 connection.
+    """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+    async def request(self, target, host):
+        """
+        Sends a GET request and reads the response.
+        :return: (int, bytes, bool) status, body and whether the connection can be reused.
+        :raise ProtocolError: if the response is malformed.
+        """
+        self.writer.write('GET {} HTTP/1.1\r\nHost: {}\r\nUser-Agent: alephmarcreader\r\n'
+                          'Accept-Encoding: identity\r\nConnection: keep-alive\r\n\r\n'
+                          .format(target, host).encode('latin-1'))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by the server')
+        parts = status_line.split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith(b'HTTP/') or not parts[1].isdigit():
+            raise ProtocolError('Malformed status line {!r}'.format(status_line))
+        version, status = parts[:2]
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == b'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size_line = await self.reader.readline()
+                try:
+                    size = int(size_line.split(b';')[0], 16)
+                except ValueError:
+                    raise ProtocolError('Malformed chunk size {!r}'.format(size_line))
+                if size == 0:
+                    # skip the trailers
+                    while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            if not headers['content-length'].isdigit():
+                raise ProtocolError('Malformed content length {!r}'.format(headers['content-length']))
+            body = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            # the body ends when the server closes the connection
+            body = await self.reader.read()
+            keep_alive = False
+
+        return int(status), body, keep_alive
+
+
+class ConnectionPool(object):
+    """
+    Keep-alive HTTP/1.1 connections to the host of an AlephX endpoint.
+    At most `size` requests are in flight at a time; idle connections are reused.
+    Must be created and used within a running event loop.
+    :param str base_url: the AlephX endpoint, e.g. 'https://aleph.unibas.ch/X'.
+    :param int size: the maximum number of connections and requests in flight.
+    :param float timeout: seconds to wait for a connection and a response.
+    """
+    def __init__(self, base_url, size=8, timeout=30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError('Unsupported URL {!r}, expected http or https'.format(base_url))
+
+        self.base_url = base_url
+        self.timeout = timeout
+        self.__ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.__hostname = parts.hostname
+        self.__port = parts.port or (443 if self.__ssl else 80)
+        self.__host = parts.netloc
+        self.__path = parts.path or '/'
+        self.__semaphore = asyncio.Semaphore(size)
+        self.__idle = []
+
+        # statistics
+        self.connections_opened = 0
+        self.requests = 0
+
+    def get_url(self, query):
+        """
+        :param dict query: the query parameters.
+        :return: str the complete URL of a request.
+        """
+        return self.base_url + '?' + urlencode(query)
+
+    async def __open(self):
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.__hostname, self.__port, ssl=self.__ssl), self.timeout)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    async def get(self, query):
+        """
+        Sends a GET request to the endpoint.
+        A request is sent once, retrying is up to the caller.
+        :param dict query: the query parameters.
+        :return: (int, bytes) status and body of the response.
+        :raise StaleConnectionError: if a reused idle connection has been closed by the server.
+        :raise ProtocolError: if the response is malformed. The connection is closed.
+        """
+        target = self.__path + '?' + urlencode(query)
+
+        async with self.__semaphore:
+            reused = bool(self.__idle)
+            connection = self.__idle.pop() if reused else await self.__open()
+            self.requests += 1
+            try:
+                status, body, keep_alive = await asyncio.wait_for(connection.request(target, self.__host),
+                                                                  self.timeout)
+            except asyncio.TimeoutError:
+                # before the OSError branch: a timeout is no sign of a stale connection
+                # (asyncio.TimeoutError is an OSError since Python 3.11)
+                connection.close()
+                raise
+            except (OSError, EOFError) as e:
+                connection.close()
+                if reused:
+                    raise StaleConnectionError('Idle connection closed by the server: {}'.format(e))
+                raise
+            except BaseException:
+                connection.close()
+                raise
+
+            if keep_alive:
+                self.__idle.append(connection)
+            else:
+                connection.close()
+            return status, body
+
+    def close(self):
+        """
+        Closes all idle connections.
+        """
+        while self.__idle:
+            self.__idle.pop().close()
+
+
+def _parse_find_doc(body, url):
+    """
+    Parses a `find-doc` response. AlephX reports unknown system numbers in an `<error>` element.
+    """
+    root = etree.fromstring(body)
+    if root.find('record') is None:
+        raise ValueError(root.findtext('error') or 'No record in the AlephX response')
+    return AlephXReader.from_element(root, url)
+
+
+async def _parse(executor, sysno, body, url):
+    try:
+        reader = await asyncio.get_running_loop().run_in_executor(executor, _parse_find_doc, body, url)
+    except Exception as e:
+        return FetchResult(sysno, None, '{}: {} for {}'.format(type(e).__name__, e, url))
+    return FetchResult(sysno, reader, None)
+
+
+async def _fetch_record(pool, executor, sysno, library, retries, backoff, cache, cache_executor):
+    query = [('op', 'find-doc'), ('doc_num', sysno), ('base', library)]
+    url = pool.get_url(query)
+    loop = asyncio.get_running_loop()
+
+    if cache is not None:
+        body = await loop.run_in_executor(cache_executor, cache.get, url)
+        if body is not None:
+            return await _parse(executor, sysno, body, url)
+
+    stale = False
+    for attempt in range(retries + 1):
+        if attempt > 0 and not stale:
+            # exponential backoff with jitter
+            await asyncio.sleep(backoff * 2 ** (attempt - 1) * (0.5 + random.random()))
+
+        try:
+            status, body = await pool.get(query)
+        except (OSError, EOFError, asyncio.TimeoutError, ProtocolError) as e:
+            # every retry counts, but a stale idle connection is retried without waiting
+            stale = isinstance(e, StaleConnectionError)
+            error = '{}: {}'.format(type(e).__name__, e)
+            continue
+        stale = False
+
+        if status != 200:
+            error = 'HTTP status {}'.format(status)
+            if status in RETRY_STATUSES:
+                continue
+            break
+
+        if cache is not None:
+            await loop.run_in_executor(cache_executor, cache.put, url, body)
+        return await _parse(executor, sysno, body, url)
+
+    return FetchResult(sysno, None, '{} for {}'.format(error, url))
+
+
+async def fetch_records(sysnos, base_url, concurrency=8, library=DEFAULT_LIBRARY, retries=3, backoff=0.5,
+                        timeout=30.0, executor=None, cache=None):
+    """
+    Fetches and parses the `find-doc` responses of many system numbers concurrently.
+
+    Connection errors, timeouts, malformed responses and responses with a status in RETRY_STATUSES are retried
+    with exponential backoff
+    (a request on an idle connection the server has closed in the meantime is retried right away).
+    Every retry counts against `retries`.
+    An error for one system number does not stop the others: it is captured in the `error` of its result.
+    :param [str] sysnos: the system numbers, e.g. '000055275'.
+    :param str base_url: the AlephX endpoint, e.g. 'https://aleph.unibas.ch/X'.
+    :param int concurrency: the maximum number of connections and requests in flight.
+    :param str library: the Aleph library (`base` parameter).
+    :param int retries: the number of retries per system number, at least 0.
+    :param float backoff: seconds to wait before the first retry, doubled for each further retry.
+    :param float timeout: seconds to wait for a connection and a response.
+    :param concurrent.futures.Executor|None executor: where responses are parsed,
+    defaults to a thread pool of `concurrency` threads.
+    :param ResponseCache|None cache: if given, responses are looked up in and added to this cache
+    (see `alephmarcreader.responsecache`), keyed by the request URL. Cached system numbers are not fetched.
+    The cache is accessed in a thread of its own, one call at a time, so that it does not block the event loop.
+    :return: [FetchResult] in the order of `sysnos`.
+    """
+    if retries < 0:
+        raise ValueError('retries must be at least 0, got {}'.format(retries))
+
+    pool = ConnectionPool(base_url, concurrency, timeout)
+    own_executor = executor is None
+    if own_executor:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency)
+    # SQLite connections must not be used by several threads at a time
+    cache_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1) if cache is not None else None
+
+    try:
+        return list(await asyncio.gather(*[_fetch_record(pool, executor, sysno, library, retries, backoff, cache,
+                                                         cache_executor)
+                                           for sysno in sysnos]))
+    finally:
+        pool.close()
+        if own_executor:
+            executor.shutdown(wait=False)
+        if cache_executor is not None:
+            cache_executor.shutdown(wait=True)
@@ -0,0 +1,145 @@
+from .abstractalephmarcreader import AbstractAlephMarcReader
+from . import diagnostics as _diagnostics
+from . import iso2709
+
+
+class AlephMarc21RawReader(AbstractAlephMarcReader):
+    """
+    Represents the record read from a Marc21 file, read directly from its ISO 2709 leader and directory.
+    Unlike `AlephMarc21Reader`, no pymarc record is built: the raw record is kept as a `memoryview`
+    and only the fields a getter asks for are sliced out and decoded (as UTF-8).
+    :param memoryview __record raw data of the record.
+    """
+    def __init__(self, file_path, marc21=None, tags=None):
+        """
+        :param str file_path: the path to the Marc21 file.
+        :param bytes marc21: Marc21 data that is already in memory, if any.
+        If given, `file_path` is not read and only used in messages.
+        :param set|None tags: if given, only the data fields with these tags are indexed, e.g. `GETTER_TAGS`.
+        Getters reading other tags return no results.
+        """
+        super(AlephMarc21RawReader, self).__init__('0', file_path)
+        if marc21 is None:
+            marc21 = self.__get_marc21(file_path)
+        self.__record = memoryview(marc21)
+        self.__field_index = self.__index_fields(tags)
+
+    def from_bytes(cls, marc21, file_path=None, tags=None):
+        """
+        Creates a reader for the first record of Marc21 data that is already in memory.
+        :param bytes marc21: Marc21 data.
+        :param str|None file_path: where the data came from, if any. Only used in messages.
+        :param set|None tags: if given, only the data fields with these tags are indexed.
+        :return: AlephMarc21RawReader
+        """
+        return cls(file_path, marc21=marc21, tags=tags)
+    from_bytes.__annotations__ = {'marc21': bytes}
+    from_bytes = classmethod(from_bytes)
+
+    def iter_records(cls, file_path, tags=None):
+        """
+        Streams a Marc21 file and yields a reader for every record it contains.
+        The file is read record by record, it is never loaded into memory as a whole.
+        :param str file_path: the path to the Marc21 file.
+        :param set|None tags: if given, only the data fields with these tags are indexed.
+        :return: iterator of AlephMarc21RawReader
+        """
+        try:
+            marc_file = open(file_path, 'rb')
+        except Exception as e:
+            _diagnostics.resolve(cls).report(_diagnostics.ISSUE_PARSE_ERROR, file_path,
+                                             detail="Getting Marc21 failed: " + str(e) + " for file_path: " + file_path + "\n")
+            raise
+
+        with marc_file:
+            try:
+                for marc21 in iso2709.read_records(marc_file):
+                    yield cls(file_path, marc21=marc21, tags=tags)
+            except ValueError as e:
+                _diagnostics.resolve(cls).report(_diagnostics.ISSUE_PARSE_ERROR, file_path,
+                                                 detail="Error reading Marc21 data: " + str(e) + " for file_path: " + file_path + "\n")
+                raise
+    iter_records.__annotations__ = {'file_path': str}
+    iter_records = classmethod(iter_records)
+
+    def __get_marc21(self, file_path):
+        """
+        Returns the contents of a Marc21 file as binary data.
+        :param str file_path: the path to the Marc21 file.
+        :return: bytes
+        """
+        try:
+            with open(file_path, 'rb') as marc_file:
+                return marc_file.read()
+        except Exception as e:
+            _diagnostics.resolve(self).report(_diagnostics.ISSUE_PARSE_ERROR, file_path,
+                                              detail="Getting Marc21 failed: " + str(e) + " for file_path: " + file_path + "\n")
+            raise
+    __get_marc21.__annotations__ = {'file_path': str, 'return': bytes}
+
+    def __index_fields(self, tags=None):
+        """
+        Maps each tag to the (not yet decoded) data of its fields, in directory order.
+        Only the leader and the directory are read, the fields are slices of the raw record without the field terminator.
+        :param set|None tags: if given, only data fields with these tags are indexed.
+        :return: {str: [memoryview]}
+        """
+        if tags is not None:
+            tags = frozenset(tags)
+
+        field_index = {}
+        try:
+            # the record length in the leader is authoritative, the data may hold further records
+            record = self.__record[:iso2709.get_record_length(self.__record[:5].tobytes())]
+            for tag, start, length in iso2709.iter_directory(record):
+                tag = tag.decode('ascii')
+                if tags is None or tag in tags or tag.startswith('00'):
+                    field_index.setdefault(tag, []).append(record[start:start + length - 1])
+        except ValueError as e:
+            _diagnostics.resolve(self).report(_diagnostics.ISSUE_PARSE_ERROR, self._get_source_name(),
+                                              detail="Error reading Marc21 data: " + str(e) + '\n')
+            raise
+        return field_index
+    __index_fields.__annotations__ = {'return': {str: [memoryview]}}
+
+    def _AbstractAlephMarcReader__iter_subfields(self, marc_field):
+        """
+        Yields the subfields of a marc field as (code, text) pairs.
+        The indicators before the first subfield delimiter are skipped.
+        :param marc_field: marc field.
+        :return: iterator of (str, str)
+        """
+        for subfield in marc_field.tobytes().split(iso2709.SUBFIELD_DELIMITER)[1:]:
+            if subfield:
+                yield subfield[:1].decode('utf-8'), subfield[1:].decode('utf-8')
+    _AbstractAlephMarcReader__iter_subfields.__annotations__ = {'marc_field': memoryview}
+
+    def _AbstractAlephMarcReader__get_subfield_texts(self, marc_field, index):
+        """
+        Given a marc field, get the indicated subfield's text or False if it does not exist.
+        :param marc_field: marc field.
+        :param index: index of the subfield.
+        :return: [str].
+        """
+        return list(self._get_subfield_map(marc_field).get(index, []))
+    _AbstractAlephMarcReader__get_subfield_texts.__annotations__ = {'index': str, 'marc_field': memoryview, 'return': [str]}
+
+    def _AbstractAlephMarcReader__get_field(self, index):
+        """
+        Returns marc fields corresponding to the given index.
+        :param index: index of marc field.
+        :return: [memoryview]
+        """
+        return self.__field_index.get(index, [])
+    _AbstractAlephMarcReader__get_field.__annotations__ = {'index': str, 'return': [memoryview]}
+
+    def _AbstractAlephMarcReader__get_control_fields(self, index):
+        """
+        Returns the data of the control fields with the given tag.
+        :param index: tag of the control field.
+        :return: [str]
+        """
+        if not index.startswith('00'):
+            return []
+        return [field.tobytes().decode('utf-8') for field in self.__field_index.get(index, [])]
+    _AbstractAlephMarcReader__get_control_fields.__annotations__ = {'index': str, 'return': [str]}
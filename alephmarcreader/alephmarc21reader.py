@@ -1,7 +1,9 @@
 from .abstractalephmarcreader import AbstractAlephMarcReader
+from . import diagnostics as _diagnostics
+from . import iso2709
 import pymarc
 import codecs
-import sys
+import mmap
 
 
 class AlephMarc21Reader(AbstractAlephMarcReader):
@@ -9,13 +11,85 @@ class AlephMarc21Reader(AbstractAlephMarcReader):
     Represents the record read from a Marc21 file.
     :param pymarc.record.Record __record record read from a Marc21 file.
     """
-    def __init__(self, file_path):
+    def __init__(self, file_path, record=None, tags=None):
         """
         :param str file_path: the path to the Marc21 file.
+        :param pymarc.record.Record record: an already parsed record, if any.
+        If given, `file_path` is not read and only used in messages.
+        :param set|None tags: if given, only the control fields and the data fields with these tags
+        are parsed from `file_path`, e.g. `GETTER_TAGS`. Getters reading other tags return no results.
         """
         super(AlephMarc21Reader, self).__init__('0', file_path)
-        marc21 = self.__get_marc21(file_path)
-        self.__record = self.__get_record(marc21)
+        if record is None:
+            marc21 = self.__get_marc21(file_path)
+            record = self.__get_record(marc21, file_path, tags)
+        self.__record = record
+
+    def from_bytes(cls, marc21, file_path=None, tags=None):
+        """
+        Creates a reader for the first record of Marc21 data that is already in memory.
+        :param bytes marc21: Marc21 data.
+        :param str|None file_path: where the data came from, if any. Only used in messages.
+        :param set|None tags: if given, only the control fields and the data fields with these tags are parsed.
+        :return: AlephMarc21Reader
+        """
+        return cls(file_path, record=cls.__get_record(marc21, file_path, tags))
+    from_bytes.__annotations__ = {'marc21': bytes}
+    from_bytes = classmethod(from_bytes)
+
+    def from_record(cls, record, file_path=None):
+        """
+        Creates a reader for a record that has already been parsed by pymarc.
+        :param pymarc.record.Record record: the record.
+        :param str|None file_path: where the record came from, if any. Only used in messages.
+        :return: AlephMarc21Reader
+        """
+        return cls(file_path, record=record)
+    from_record.__annotations__ = {'record': pymarc.record.Record}
+    from_record = classmethod(from_record)
+
+    def iter_records(cls, file_path, tags=None):
+        """
+        Streams a Marc21 file and yields a reader for every record it contains.
+        The file is read record by record, it is never loaded into memory as a whole.
+        :param str file_path: the path to the Marc21 file.
+        :param set|None tags: if given, only the control fields and the data fields with these tags are parsed,
+        e.g. `GETTER_TAGS`.
+        :return: iterator of AlephMarc21Reader
+        """
+        try:
+            marc_file = open(file_path, 'rb')
+        except Exception as e:
+            _diagnostics.resolve(cls).report(_diagnostics.ISSUE_PARSE_ERROR, file_path,
+                                             detail="Getting Marc21 failed: " + str(e) + " for file_path: " + file_path + "\n")
+            raise
+
+        with marc_file:
+            if tags is not None:
+                # the other fields are dropped from the raw records before pymarc sees them
+                records = iso2709.read_records(marc_file)
+                while True:
+                    try:
+                        marc21 = next(records)
+                    except StopIteration:
+                        return
+                    except ValueError as e:
+                        _diagnostics.resolve(cls).report(_diagnostics.ISSUE_PARSE_ERROR, file_path,
+                                                         detail="Error reading Marc21 data: " + str(e) + " for file_path: " + file_path + "\n")
+                        raise
+                    yield cls(file_path, record=cls.__get_record(marc21, file_path, tags))
+
+            reader = pymarc.MARCReader(marc_file, force_utf8=True, to_unicode=True)
+            for record in reader:
+                if record is None:
+                    # recent versions of pymarc yield None instead of raising on a malformed record
+                    e = reader.current_exception
+                    _diagnostics.resolve(cls).report(_diagnostics.ISSUE_PARSE_ERROR, file_path,
+                                                     detail="Error reading Marc21 data: " + str(e) + " for file_path: " + file_path + "\n")
+                    raise e
+                yield cls(file_path, record=record)
+    iter_records.__annotations__ = {'file_path': str}
+    iter_records = classmethod(iter_records)
 
     def __get_marc21(self, file_path):
         """
@@ -32,23 +106,45 @@ class AlephMarc21Reader(AbstractAlephMarcReader):
             return marc21
 
         except Exception as e:
-            sys.stderr.write("Getting Marc21 failed: " + str(e) + " for file_path: " + file_path + "\n")
+            _diagnostics.resolve(self).report(_diagnostics.ISSUE_PARSE_ERROR, file_path,
+                                              detail="Getting Marc21 failed: " + str(e) + " for file_path: " + file_path + "\n")
             raise
     __get_marc21.__annotations__ = {'file_path': str, 'return': bytes}
 
-    def __get_record(self, marc21):
+    def __get_record(cls, marc21, file_path=None, tags=None):
         """
         Parses the given Marc21 data and returns the record.
         :param bytes marc21: Marc21 data.
+        :param str|None file_path: where the data came from, if any. Only used in messages.
+        :param set|None tags: if given, only the control fields and the data fields with these tags are parsed.
         :return: pymarc.record.Record
         """
         try:
+            if tags is not None:
+                marc21 = iso2709.project_record(marc21, tags)
             reader = pymarc.MARCReader(marc21, force_utf8=True, to_unicode=True)
-            return next(reader)
+            record = next(reader)
+            if record is None:
+                # recent versions of pymarc yield None instead of raising on a malformed record
+                raise reader.current_exception
+            return record
         except Exception as e:
-            sys.stderr.write("Error reading Marc21 data: " + str(e) + '\n')
+            _diagnostics.resolve(cls).report(_diagnostics.ISSUE_PARSE_ERROR, file_path or "<in-memory record>",
+                                             detail="Error reading Marc21 data: " + str(e) + '\n')
             raise
     __get_record.__annotations__ = {'marc21': bytes, 'return': pymarc.record.Record}
+    __get_record = classmethod(__get_record)
+
+    def _AbstractAlephMarcReader__iter_subfields(self, marc_field):
+        """
+        Yields the subfields of a marc field as (code, text) pairs.
+        :param marc_field: marc field.
+        :return: iterator of (str, str)
+        """
+        for code, text in marc_field:
+            yield code, text
+
+    _AbstractAlephMarcReader__iter_subfields.__annotations__ = {'marc_field': pymarc.field.Field}
 
     def _AbstractAlephMarcReader__get_subfield_texts(self, marc_field, index):
         """
@@ -58,7 +154,7 @@ class AlephMarc21Reader(AbstractAlephMarcReader):
         :return: [str].
         """
 
-        return marc_field.get_subfields(index)
+        return list(self._get_subfield_map(marc_field).get(index, []))
 
     _AbstractAlephMarcReader__get_subfield_texts.__annotations__ = {'index': str, 'marc_field': pymarc.field.Field, 'return': [str]}
 
@@ -72,3 +168,94 @@ class AlephMarc21Reader(AbstractAlephMarcReader):
         return elements
     _AbstractAlephMarcReader__get_field.__annotations__ = {'index': str, 'return': [pymarc.field.Field]}
 
+    def _AbstractAlephMarcReader__get_control_fields(self, index):
+        """
+        Returns the data of the control fields with the given tag.
+        :param index: tag of the control field.
+        :return: [str]
+        """
+        return [field.data for field in self.__record.get_fields(index) if field.is_control_field()]
+    _AbstractAlephMarcReader__get_control_fields.__annotations__ = {'index': str, 'return': [str]}
+
+
+class AlephMarc21Dump(object):
+    """
+    Random access to the records of a (large) Marc21 file.
+
+    The file is memory mapped and its record boundaries are scanned once from the record leaders,
+    without parsing any record. A record is only parsed when a reader for it is requested.
+    Can be used as a context manager, which closes the file on exit.
+    :param str file_path: the path to the Marc21 file.
+    """
+    def __init__(self, file_path):
+        """
+        :param str file_path: the path to the Marc21 file.
+        """
+        self._file_path = file_path
+        self.__file = open(file_path, 'rb')
+        # for close() if mapping or scanning the file fails
+        self.__data = None
+        try:
+            # an empty file cannot be mapped
+            self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ) \
+                if self.__get_size() > 0 else b''
+            self.__offsets, self.__lengths = iso2709.scan_record_offsets(self.__data)
+        except Exception as e:
+            _diagnostics.get_default().report(_diagnostics.ISSUE_PARSE_ERROR, file_path,
+                                              detail="Scanning Marc21 failed: " + str(e) + " for file_path: " + file_path + "\n")
+            self.close()
+            raise
+
+    def __get_size(self):
+        self.__file.seek(0, 2)
+        return self.__file.tell()
+
+    def __len__(self):
+        return len(self.__offsets)
+
+    def __iter__(self):
+        for n in range(len(self)):
+            yield self.reader_at(n)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the memory map and the file.
+        """
+        if isinstance(self.__data, mmap.mmap):
+            self.__data.close()
+        self.__data = b''
+        self.__file.close()
+
+    def get_offset(self, n):
+        """
+        Returns the byte offset and length of the n-th record.
+        :param int n: index of the record (negative indices count from the end).
+        :return: (int, int)
+        """
+        return self.__offsets[n], self.__lengths[n]
+    get_offset.__annotations__ = {'n': int}
+
+    def record_bytes(self, n):
+        """
+        Returns the raw Marc21 data of the n-th record.
+        :param int n: index of the record (negative indices count from the end).
+        :return: bytes
+        """
+        offset, length = self.get_offset(n)
+        return self.__data[offset:offset + length]
+    record_bytes.__annotations__ = {'n': int, 'return': bytes}
+
+    def reader_at(self, n):
+        """
+        Parses the n-th record and returns a reader for it.
+        :param int n: index of the record (negative indices count from the end).
+        :return: AlephMarc21Reader
+        """
+        return AlephMarc21Reader.from_bytes(self.record_bytes(n), self._file_path)
+    reader_at.__annotations__ = {'n': int, 'return': AlephMarc21Reader}
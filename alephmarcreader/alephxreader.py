@@ -1,6 +1,8 @@
 from .abstractalephmarcreader import AbstractAlephMarcReader
-import sys
+from . import xmlstream
+from . import diagnostics as _diagnostics
 from lxml import etree
+import io
 
 
 class AlephXReader(AbstractAlephMarcReader):
@@ -9,27 +11,123 @@ class AlephXReader(AbstractAlephMarcReader):
         :param etree.ElementTree __root root element of a parsed MarcXML file..
         """
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, root=None, tags=None):
         """
         :param str file_path: the path to the MarcXML file.
+        :param etree.Element root: an already parsed record (or response) element, if any.
+        If given, `file_path` is not read and only used in messages.
+        :param set|None tags: if given, only the varfields with these tags are kept when parsing `file_path`,
+        e.g. `GETTER_TAGS`. Getters reading other tags return no results.
         """
         super(AlephXReader, self).__init__('1', file_path)
-        self.__root = self.__parseMarcXML(file_path)
+        self.__root = self.__parseMarcXML(file_path, tags) if root is None else root
+        self.__field_index, self.__control_field_index = self.__index_fields()
 
-    def __parseMarcXML(self, file_path):
+    def from_bytes(cls, xml, file_path=None, tags=None):
+        """
+        Creates a reader for AlephX data that is already in memory.
+        :param bytes xml: the AlephX document.
+        :param str|None file_path: where the data came from, if any. Only used in messages.
+        :param set|None tags: if given, only the varfields with these tags are kept, e.g. `GETTER_TAGS`.
+        :return: AlephXReader
+        """
+        try:
+            root = etree.fromstring(xml) if tags is None else \
+                xmlstream.parse(io.BytesIO(xml), cls.__get_projection(tags)).getroot()
+        except Exception as e:
+            _diagnostics.resolve(cls).report(_diagnostics.ISSUE_PARSE_ERROR, file_path or "<in-memory record>",
+                                             detail="Parsing MarcXML failed for " + (file_path or "<in-memory record>") + " " + str(e))
+            raise
+        return cls(file_path, root=root)
+    from_bytes.__annotations__ = {'xml': bytes}
+    from_bytes = classmethod(from_bytes)
+
+    def from_element(cls, element, file_path=None):
+        """
+        Creates a reader for an already parsed AlephX record (or document) element.
+        :param etree.Element element: the element.
+        :param str|None file_path: where the element came from, if any. Only used in messages.
+        :return: AlephXReader
+        """
+        return cls(file_path, root=element)
+    from_element.__annotations__ = {'element': etree.Element}
+    from_element = classmethod(from_element)
+
+    def iter_records(cls, file_path, tags=None):
+        """
+        Streams an AlephX response holding several records (e.g. of a `present` request)
+        and yields a reader for every `<record>`, scoped to the varfields of that record.
+        Only about one record is kept in memory at a time: once the iterator advances,
+        the record that has been handed out before is released from the parsed document.
+        Readers that are kept by the caller stay usable, but also keep their record in memory.
+        :param str file_path: the path to the AlephX file.
+        :param set|None tags: if given, only the varfields with these tags are kept, e.g. `GETTER_TAGS`.
+        :return: iterator of AlephXReader
+        """
+        projection = cls.__get_projection(tags) if tags is not None else None
+        try:
+            for record in xmlstream.iter_elements(file_path, 'record', projection):
+                yield cls(file_path, root=record)
+        except etree.XMLSyntaxError as e:
+            _diagnostics.resolve(cls).report(_diagnostics.ISSUE_PARSE_ERROR, file_path,
+                                             detail="Parsing MarcXML failed for " + file_path + " " + str(e))
+            raise
+    iter_records.__annotations__ = {'file_path': str}
+    iter_records = classmethod(iter_records)
+
+    def __parseMarcXML(self, file_path, tags=None):
         """
         Returns the root element of a parsed MarcXML file.
         :param str file_path: the path to the MarcXML file.
+        :param set|None tags: if given, only the varfields with these tags are kept.
         :return: etree.ElementTree
         """
         try:
+            if tags is not None:
+                return xmlstream.parse(file_path, self.__get_projection(tags))
             tree = etree.parse(file_path)
             return tree
         except Exception as e:
-            sys.stderr.write("Parsing MarcXML failed for " + file_path + " " + str(e))
+            _diagnostics.resolve(self).report(_diagnostics.ISSUE_PARSE_ERROR, file_path,
+                                              detail="Parsing MarcXML failed for " + file_path + " " + str(e))
             raise
     __parseMarcXML.__annotations__ = {'file_path': str, 'return': etree.ElementTree}
 
+    @classmethod
+    def __get_projection(cls, tags):
+        """
+        Returns the projection keeping the varfields with the given tags, see `xmlstream.parse`.
+        :param set tags: marc tags.
+        :return: (str, str, set)
+        """
+        return 'varfield', 'id', frozenset(tags)
+
+    def __index_fields(self):
+        """
+        Maps each varfield id to its varfield elements and each fixfield id to its fixfield elements,
+        in document order.
+        The tree is walked only once, all field lookups are answered from these maps.
+        :return: ({str: [etree.Element]}, {str: [etree.Element]})
+        """
+        field_tag = 'varfield'
+        field_index = {}
+        control_field_index = {}
+        for ele in self.__root.iter(field_tag, 'fixfield'):
+            index = field_index if ele.tag == field_tag else control_field_index
+            index.setdefault(ele.get('id'), []).append(ele)
+        return field_index, control_field_index
+    __index_fields.__annotations__ = {'return': ({str: [etree.Element]}, {str: [etree.Element]})}
+
+    def _AbstractAlephMarcReader__iter_subfields(self, marc_ele):
+        """
+        Yields the subfields of a marc field as (code, text) pairs.
+        :param marc_ele: marc field.
+        :return: iterator of (str, str)
+        """
+        for ele in marc_ele.iter('subfield'):
+            yield ele.get('label'), ele.text
+    _AbstractAlephMarcReader__iter_subfields.__annotations__ = {'marc_ele': etree.Element}
+
     def _AbstractAlephMarcReader__get_subfield_texts(self, marc_ele, index):
         """
         Given a marc field, get the indicated subfield's text or False if it does not exist.
@@ -37,8 +135,7 @@ class AlephXReader(AbstractAlephMarcReader):
         :param index: index of the subfield.
         :return: [str].
         """
-        eles = marc_ele.xpath(".//subfield[@label='" + index + "']")
-        return list(map(lambda ele: ele.text, eles))
+        return list(self._get_subfield_map(marc_ele).get(index, []))
     _AbstractAlephMarcReader__get_subfield_texts.__annotations__ = {'index': str, 'marc_ele': etree.Element, 'return': [str]}
 
     def _AbstractAlephMarcReader__get_field(self, index):
@@ -47,6 +144,14 @@ class AlephXReader(AbstractAlephMarcReader):
         :param index: index of marc field.
         :return: [etree.Element]
         """
-        elements = self.__root.xpath(".//varfield[@id='" + index + "']")
-        return elements
-    _AbstractAlephMarcReader__get_field.__annotations__ = {'index': str, 'return': [etree.Element]}
\ No newline at end of file
+        return self.__field_index.get(index, [])
+    _AbstractAlephMarcReader__get_field.__annotations__ = {'index': str, 'return': [etree.Element]}
+
+    def _AbstractAlephMarcReader__get_control_fields(self, index):
+        """
+        Returns the data of the control fields with the given tag.
+        :param index: tag of the control field.
+        :return: [str]
+        """
+        return [ele.text or u'' for ele in self.__control_field_index.get(index, [])]
+    _AbstractAlephMarcReader__get_control_fields.__annotations__ = {'index': str, 'return': [str]}
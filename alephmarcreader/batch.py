@@ -0,0 +1,162 @@
+"""
+Batch extraction of many record files in a pool of worker processes.
+
+Parsing and all getters run in the workers. Only plain data (dicts, lists and strings)
+is sent back to the calling process, so results can be pickled, stored or serialised to JSON directly.
+"""
+import collections
+import concurrent.futures
+import itertools
+import traceback
+
+from . import diagnostics as _diagnostics
+
+FORMAT_MARC21 = 'marc21'
+FORMAT_MARC21_RAW = 'marc21-raw'
+FORMAT_MARCXML = 'marcxml'
+FORMAT_ALEPHX = 'alephx'
+
+# module and class name, imported in the worker so that only the backend in use is loaded
+_READER_CLASSES = {
+    FORMAT_MARC21: ('alephmarc21reader', 'AlephMarc21Reader'),
+    FORMAT_MARC21_RAW: ('alephmarc21rawreader', 'AlephMarc21RawReader'),
+    FORMAT_MARCXML: ('alephmarcxmlreader', 'AlephMarcXMLReader'),
+    FORMAT_ALEPHX: ('alephxreader', 'AlephXReader'),
+}
+
+BatchResult = collections.namedtuple('BatchResult', ['path', 'data', 'error'])
+BatchResult.__doc__ = """
+Result of the extraction of one file.
+:param str path: the path of the file.
+:param dict|None data: the results of all getters as plain data, None if the extraction failed.
+:param str|None error: the error (with traceback) if the extraction failed, otherwise None.
+"""
+
+
+def get_reader_class(file_format):
+    """
+    Returns the reader class for a format.
+    :param str file_format: FORMAT_MARC21, FORMAT_MARC21_RAW, FORMAT_MARCXML or FORMAT_ALEPHX.
+    :return: type
+    """
+    import importlib
+
+    try:
+        module_name, class_name = _READER_CLASSES[file_format]
+    except KeyError:
+        raise ValueError('Unknown format {!r}, expected one of {}'.format(file_format, sorted(_READER_CLASSES)))
+    return getattr(importlib.import_module('.' + module_name, __package__), class_name)
+
+
+def _extract_file(path, file_format):
+    try:
+        reader_class = get_reader_class(file_format)
+        # only the fields read by the getters are parsed
+        return BatchResult(path, reader_class(path, tags=reader_class.GETTER_TAGS).to_dict(), None)
+    except Exception:
+        return BatchResult(path, None, traceback.format_exc())
+
+
+def _extract_chunk(paths, file_format, diagnostics=None):
+    """
+    Extracts a chunk of files. If a diagnostics sink is given, the issues of the chunk are reported to
+    a fresh sink of the same kind, which is returned with the results to be merged by the caller.
+    """
+    if diagnostics is None:
+        return [_extract_file(path, file_format) for path in paths], None
+
+    sink = diagnostics.spawn()
+    previous = _diagnostics.set_default(sink)
+    try:
+        return [_extract_file(path, file_format) for path in paths], sink
+    finally:
+        _diagnostics.set_default(previous)
+
+
+def _extract_with_cache(paths, file_format, cache, ordered, progress, **kwargs):
+    """
+    Answers the files that are unchanged from the cache, extracts only the others and adds them to the cache.
+    """
+    cached = {}
+    for path in paths:
+        try:
+            data = cache.get(path, file_format)
+        except OSError:
+            # e.g. a missing file, its error is reported by the extraction
+            data = None
+        if data is not None:
+            cached[path] = data
+
+    extracted = extract_many([path for path in paths if path not in cached], file_format, ordered=ordered, **kwargs)
+    if ordered:
+        results = (BatchResult(path, cached[path], None) if path in cached else next(extracted) for path in paths)
+    else:
+        results = itertools.chain((BatchResult(path, cached[path], None) for path in paths if path in cached),
+                                  extracted)
+
+    total = len(paths)
+    for done, result in enumerate(results, 1):
+        if result.path not in cached and result.error is None:
+            cache.put(result.path, file_format, result.data)
+        if progress is not None:
+            progress(done, total)
+        yield result
+
+
+def extract_many(paths, file_format=FORMAT_MARCXML, workers=None, chunksize=16, ordered=True, progress=None,
+                 diagnostics=None, cache=None):
+    """
+    Extracts all getters from many single record files, spread over a pool of worker processes.
+
+    An error in one file does not stop the batch: it is captured in the `error` of that file's result.
+    :param [str] paths: the paths of the files.
+    :param str file_format: FORMAT_MARC21, FORMAT_MARC21_RAW, FORMAT_MARCXML or FORMAT_ALEPHX.
+    :param int|None workers: number of worker processes, defaults to the number of CPUs.
+    If 1, the files are processed in the calling process.
+    :param int chunksize: number of files sent to a worker at once.
+    :param bool ordered: if True, results are yielded in the order of `paths`, otherwise as soon as they are completed.
+    :param callable|None progress: called as `progress(done, total)` after each result.
+    :param Diagnostics|None diagnostics: sink for the warnings of all files, see `alephmarcreader.diagnostics`.
+    The workers report to sinks of the same kind, whose counts are merged into it as the chunks complete.
+    Defaults to the default sink of each worker process.
+    :param ExtractionCache|None cache: if given, files that are unchanged since they were added to this cache
+    (see `alephmarcreader.extractioncache`) are not parsed at all, the others are extracted and added to it.
+    :return: iterator of BatchResult
+    """
+    get_reader_class(file_format)
+
+    paths = list(paths)
+    if cache is not None:
+        for result in _extract_with_cache(paths, file_format, cache, ordered, progress, workers=workers,
+                                          chunksize=chunksize, diagnostics=diagnostics):
+            yield result
+        return
+
+    chunks = [paths[start:start + chunksize] for start in range(0, len(paths), chunksize)]
+    total = len(paths)
+    done = 0
+
+    if workers == 1:
+        for chunk in chunks:
+            results, sink = _extract_chunk(chunk, file_format, diagnostics)
+            if sink is not None:
+                diagnostics.merge(sink)
+            for result in results:
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+                yield result
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_extract_chunk, chunk, file_format, diagnostics) for chunk in chunks]
+
+        for future in (futures if ordered else concurrent.futures.as_completed(futures)):
+            results, sink = future.result()
+            if sink is not None:
+                diagnostics.merge(sink)
+            for result in results:
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+                yield result
@@ -0,0 +1,192 @@
+"""
+Columnar export of a corpus of records into NumPy arrays, for vectorized analytics.
+
+Fields that can occur several times per record (author and recipient GNDs, languages, institutions, dates)
+are stored as ragged columns: a flat value array plus an offsets array of length `len(corpus) + 1`,
+so that the values of record `i` are `values[offsets[i]:offsets[i + 1]]`.
+Strings are stored as integer codes into a dictionary array (-1 for a missing value).
+Dates are stored as the first and last day they may refer to (`datetime64[D]`, NaT if they cannot be parsed)
+with precision flags, see `alephmarcreader.dates`.
+
+Requires NumPy.
+"""
+from ._storage import require_numpy
+from .dates import DateSpans, PRECISION_INVALID, PRECISION_NONE, PRECISION_YEAR, PRECISION_MONTH, PRECISION_DAY
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# ragged column -> the value arrays that share its offsets
+RAGGED_COLUMNS = {
+    'author_gnd': ('author_gnd',),
+    'recipient_gnd': ('recipient_gnd',),
+    'language': ('language',),
+    'institution': ('institution',),
+    'date': ('date_start', 'date_end', 'date_start_precision', 'date_end_precision'),
+}
+
+# value array -> its dictionary
+DICTIONARIES = {
+    'author_gnd': 'gnd_dictionary',
+    'recipient_gnd': 'gnd_dictionary',
+    'language': 'language_dictionary',
+    'institution': 'institution_dictionary',
+}
+
+
+class _Dictionary(object):
+    """
+    Assigns consecutive integer codes to strings.
+    """
+    def __init__(self):
+        self.codes = {}
+
+    def encode(self, value):
+        if not value:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        return code
+
+    def to_array(self):
+        values = [None] * len(self.codes)
+        for value, code in self.codes.items():
+            values[code] = value
+        return numpy.array(values, dtype=numpy.str_)
+
+
+class Corpus(object):
+    """
+    Columnar data of a corpus of records, as built by `build`.
+    :param {str: numpy.ndarray} arrays: the arrays, by name.
+    """
+    def __init__(self, arrays):
+        require_numpy(__name__)
+        self.arrays = arrays
+
+    def __len__(self):
+        return len(self.arrays['record_id'])
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def values(self, name, n):
+        """
+        Returns the values of a ragged column for the n-th record.
+        :param str name: the name of the value array, e.g. 'author_gnd' or 'date_start'.
+        :param int n: the index of the record.
+        :return: numpy.ndarray
+        """
+        offsets = self.arrays[self.__get_ragged_column(name) + '_offsets']
+        return self.arrays[name][offsets[n]:offsets[n + 1]]
+
+    def first(self, name, missing=-1):
+        """
+        Returns the first value of a ragged column for every record.
+        :param str name: the name of the value array, e.g. 'author_gnd' or 'date_start'.
+        :param missing: the value for records without any value.
+        :return: numpy.ndarray
+        """
+        offsets = self.arrays[self.__get_ragged_column(name) + '_offsets']
+        values = self.arrays[name]
+        has_value = offsets[1:] > offsets[:-1]
+
+        if values.dtype.kind == 'M' and missing == -1:
+            missing = numpy.datetime64('NaT')
+        result = numpy.full(len(self), missing, dtype=values.dtype)
+        result[has_value] = values[offsets[:-1][has_value]]
+        return result
+
+    def decode(self, name, codes):
+        """
+        Turns the integer codes of a column back into strings ('' for -1).
+        :param str name: the name of the value array, e.g. 'author_gnd'.
+        :param numpy.ndarray codes: codes.
+        :return: numpy.ndarray
+        """
+        dictionary = self.arrays[DICTIONARIES[name]]
+        codes = numpy.asarray(codes)
+        return numpy.where(codes >= 0, dictionary[numpy.maximum(codes, 0)] if len(dictionary) else '', '')
+
+    def save(self, path):
+        """
+        Saves all arrays to a `.npz` file.
+        :param str path: the path of the file.
+        """
+        numpy.savez(path, **self.arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads arrays saved by `save`.
+        :param str path: the path of the file.
+        :return: Corpus
+        """
+        require_numpy(__name__)
+        with numpy.load(path, allow_pickle=False) as npz:
+            return cls(dict((name, npz[name]) for name in npz.files))
+
+    @staticmethod
+    def __get_ragged_column(name):
+        for column, value_names in RAGGED_COLUMNS.items():
+            if name in value_names:
+                return column
+        raise KeyError('{!r} is not a ragged column'.format(name))
+
+
+def build(readers, record_ids=None):
+    """
+    Builds the columnar data of a corpus.
+    :param iterable readers: the readers of the records, e.g. from `iter_records`.
+    :param iterable|None record_ids: an id per record, defaults to the system numbers
+    (see `AbstractAlephMarcReader.record_id`).
+    :return: Corpus
+    """
+    require_numpy(__name__)
+
+    gnds = _Dictionary()
+    languages = _Dictionary()
+    institutions = _Dictionary()
+
+    ids = []
+    values = dict((name, []) for value_names in RAGGED_COLUMNS.values() for name in value_names)
+    offsets = dict((column, [0]) for column in RAGGED_COLUMNS)
+
+    record_ids = iter(record_ids) if record_ids is not None else None
+
+    for reader in readers:
+        ids.append(next(record_ids) if record_ids is not None else reader.record_id())
+
+        values['author_gnd'].extend(gnds.encode(author.gnd) for author in reader.get_author())
+        values['recipient_gnd'].extend(gnds.encode(recipient.gnd) for recipient in reader.get_recipient())
+        values['language'].extend(languages.encode(language) for language in reader.get_language())
+        values['institution'].extend(institutions.encode(shelfmark.institution)
+                                     for shelfmark in reader.get_shelfmark())
+
+        for date in reader.get_standardized_date():
+            # parsed all at once below
+            values['date_start'].append(date.start_span)
+            values['date_end'].append(date.end_span)
+
+        for column, value_names in RAGGED_COLUMNS.items():
+            offsets[column].append(len(values[value_names[0]]))
+
+    arrays = {
+        'record_id': numpy.array(ids, dtype=numpy.str_),
+        'gnd_dictionary': gnds.to_array(),
+        'language_dictionary': languages.to_array(),
+        'institution_dictionary': institutions.to_array(),
+    }
+    for name in ('author_gnd', 'recipient_gnd', 'language', 'institution'):
+        arrays[name] = numpy.array(values[name], dtype=numpy.int32)
+    spans = DateSpans.parse(values['date_start'], values['date_end'])
+    arrays['date_start'], arrays['date_end'] = spans.to_datetime64()
+    arrays['date_start_precision'] = spans.start_precision
+    arrays['date_end_precision'] = spans.end_precision
+    for column in RAGGED_COLUMNS:
+        arrays[column + '_offsets'] = numpy.array(offsets[column], dtype=numpy.int64)
+
+    return Corpus(arrays)
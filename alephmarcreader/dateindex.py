@@ -0,0 +1,254 @@
+"""
+Persistent interval index over the standardized dates (field 046) of a corpus.
+
+Every date is a range of days, from the first day of its start span to the last day of its end span
+(see `alephmarcreader.dates`), so '1705' covers the whole year and '1705-09' the whole month.
+The index answers which records have a date that overlaps a range of days, contains a day,
+lies within a range or covers a range. It is written to one file that is memory mapped on lookup:
+
+- the dates sorted by their first day (binary searched for the dates starting in a range),
+- the dates binned by the highest bit in which the ordinals of their first and last day differ
+  (a static interval tree over the days: a date in the bin `(level, node)` contains the day
+  `node << level | 1 << (level - 1)`, so the dates of a bin that contain a day left of it are a prefix
+  when sorted by first day and those that contain a day right of it a suffix when sorted by last day),
+  once sorted by first day and once by last day within each bin,
+- the record ids (e.g. the system numbers), by record number.
+
+A day is found in one binary search per level (at most 22 for the ordinals up to year 9999),
+so `containing` and `overlapping` take O(log n + k) for k dates found.
+
+Requires NumPy.
+"""
+import struct
+
+from ._storage import MemoryMappedIndex, require_numpy, to_bytes_array, write_index
+from .dates import DateSpans, _to_ordinal
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# magic, number of dates, number of records, width of a record id, highest level
+_HEADER = struct.Struct('<8sqqqq')
+_MAGIC = b'AMRDAT01'
+
+# bin key: level << _LEVEL_SHIFT | node
+_LEVEL_SHIFT = 32
+
+
+def _get_levels(first, last):
+    """
+    Returns the bin level of ranges of days, the number of bits of `first ^ last` (0 for single days).
+    """
+    return numpy.frexp((first ^ last).astype(numpy.float64))[1].astype(numpy.int64)
+
+
+def _to_day(day):
+    """
+    Returns a day as int32, the type of the arrays (searching an int64 in an int32 array would convert the array).
+    """
+    return numpy.int32(min(max(day, 0), numpy.iinfo(numpy.int32).max))
+
+
+def _unique(records):
+    records = numpy.sort(records)
+    keep = numpy.ones(len(records), dtype=bool)
+    keep[1:] = records[1:] != records[:-1]
+    return records[keep]
+
+
+class DateIndexBuilder(object):
+    """
+    Collects the standardized dates of a corpus record by record and writes the index.
+    The spans are parsed all at once on `write`.
+    """
+    def __init__(self):
+        require_numpy(__name__)
+        self.__record_ids = []
+        self.__records = []
+        self.__start_spans = []
+        self.__end_spans = []
+
+    def __len__(self):
+        return len(self.__record_ids)
+
+    def add(self, record_id, dates):
+        """
+        Adds a record.
+        :param str record_id: the id of the record, e.g. its system number.
+        :param [StandardizedDate] dates: the dates of the record, as returned by `get_standardized_date()`.
+        """
+        record_number = len(self.__record_ids)
+        self.__record_ids.append(record_id)
+
+        for date in dates:
+            self.__records.append(record_number)
+            self.__start_spans.append(date.start_span)
+            self.__end_spans.append(date.end_span)
+
+    def write(self, path):
+        """
+        Writes the index file. Dates that cannot be parsed or end before they start are left out.
+        :param str path: the path of the index file.
+        """
+        spans = DateSpans.parse(self.__start_spans, self.__end_spans)
+        valid = spans.is_valid() & (spans.start <= spans.end)
+        first = spans.start[valid].astype(numpy.int64)
+        last = spans.end[valid].astype(numpy.int64)
+        records = numpy.array(self.__records, dtype=numpy.int64)[valid]
+
+        order = numpy.lexsort((last, first))
+        by_first = (first[order], last[order], records[order])
+
+        levels = _get_levels(first, last)
+        keys = levels << _LEVEL_SHIFT | first >> levels
+        order = numpy.lexsort((first, keys))
+        keys_sorted = keys[order]
+        bin_by_first = (first[order], last[order], records[order])
+        order = numpy.lexsort((last, keys))
+        bin_by_last = (first[order], last[order], records[order])
+
+        record_id_array = to_bytes_array(self.__record_ids)
+        max_level = int(levels.max()) if len(levels) else 0
+
+        arrays = [array.astype(numpy.int32) for array in by_first + bin_by_first + bin_by_last]
+        write_index(path, _HEADER.pack(_MAGIC, len(first), len(self.__record_ids), record_id_array.itemsize, max_level),
+                    [keys_sorted] + arrays + [record_id_array])
+
+
+def build(readers, path, record_ids=None):
+    """
+    Streams a corpus once and writes the index.
+    :param iterable readers: the readers of the records, e.g. from `iter_records` with `tags=GETTER_TAGS`.
+    :param str path: the path of the index file.
+    :param iterable|None record_ids: an id per record, defaults to the system numbers
+    (see `AbstractAlephMarcReader.record_id`).
+    :return: int the number of records.
+    """
+    builder = DateIndexBuilder()
+    record_ids = iter(record_ids) if record_ids is not None else None
+    for reader in readers:
+        builder.add(next(record_ids) if record_ids is not None else reader.record_id(),
+                    reader.get_standardized_date())
+    builder.write(path)
+    return len(builder)
+build.__annotations__ = {'path': str, 'return': int}
+
+
+class DateIndex(MemoryMappedIndex):
+    """
+    Looks up the records by their standardized dates, in a memory mapped index file written by `build`.
+    Days are given as `datetime.date` or as proleptic Gregorian ordinals, ranges include their first and last day.
+    Can be used as a context manager, which releases the file on exit.
+    :param str path: the path of the index file.
+    """
+    def __init__(self, path):
+        require_numpy(__name__)
+        super(DateIndex, self).__init__(path)
+
+        count, record_count, record_id_width, self.__max_level = self._open(_HEADER, _MAGIC, 'date index')
+        self.__keys = self._take(numpy.int64, count)
+        # (first days, last days, record numbers) of the dates, sorted by first day,
+        # and sorted by bin and first day or bin and last day
+        self.__by_first, self.__bin_by_first, self.__bin_by_last = [
+            tuple(self._take(numpy.int32, count) for _ in range(3)) for _ in range(3)]
+        self._take_record_ids(record_id_width, record_count)
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def close(self):
+        """
+        Releases the memory map. Arrays returned before are not valid any more.
+        """
+        self.__keys = self.__by_first = self.__bin_by_first = self.__bin_by_last = None
+        super(DateIndex, self).close()
+
+    def __stab(self, day):
+        """
+        Returns the dates that contain a day, as (first days, last days, record numbers) per bin.
+        """
+        if day < 1:
+            return []
+        levels = numpy.arange(self.__max_level + 1, dtype=numpy.int64)
+        keys = levels << _LEVEL_SHIFT | day >> levels
+        starts = numpy.searchsorted(self.__keys, keys, side='left')
+        ends = numpy.searchsorted(self.__keys, keys, side='right')
+
+        day = _to_day(day)
+        found = []
+        for level, start, end in zip(levels, starts, ends):
+            if start == end:
+                continue
+            if level == 0:
+                arrays, found_slice = self.__bin_by_first, slice(start, end)
+            elif not day >> (level - 1) & 1:
+                # the day is left of the split day of the bin: dates starting on or before the day
+                arrays = self.__bin_by_first
+                found_slice = slice(start, start + int(numpy.searchsorted(arrays[0][start:end], day, side='right')))
+            else:
+                # right of it: dates ending on or after the day
+                arrays = self.__bin_by_last
+                found_slice = slice(start + int(numpy.searchsorted(arrays[1][start:end], day, side='left')), end)
+            found.append(tuple(array[found_slice] for array in arrays))
+        return found
+
+    def __starting(self, first, last):
+        """
+        Returns the slice of the dates sorted by first day that start within a range.
+        """
+        return slice(int(numpy.searchsorted(self.__by_first[0], _to_day(first), side='left')),
+                     int(numpy.searchsorted(self.__by_first[0], _to_day(last), side='right')))
+
+    def containing(self, day):
+        """
+        Returns the records with a date that contains a day, e.g. the letters that may have been written on that day.
+        :param int|datetime.date day: the day.
+        :return: numpy.ndarray the record numbers, sorted and unique.
+        """
+        return _unique(numpy.concatenate([numpy.empty(0, dtype=numpy.int32)] + [
+            records for _, _, records in self.__stab(_to_ordinal(day))]))
+
+    def overlapping(self, first, last):
+        """
+        Returns the records with a date that overlaps a range of days,
+        e.g. the letters that may have been written between 1720 and 1725.
+        :param int|datetime.date first: the first day of the range.
+        :param int|datetime.date last: the last day of the range.
+        :return: numpy.ndarray the record numbers, sorted and unique.
+        """
+        first, last = _to_ordinal(first), _to_ordinal(last)
+        if first > last:
+            return numpy.empty(0, dtype=numpy.int32)
+        # the dates that contain the first day, and those that start after it within the range
+        found = [records for _, _, records in self.__stab(first)]
+        found.append(self.__by_first[2][self.__starting(first + 1, last)])
+        return _unique(numpy.concatenate(found))
+
+    def within(self, first, last):
+        """
+        Returns the records with a date that lies within a range of days,
+        e.g. the letters that were certainly written between 1720 and 1725.
+        Takes time proportional to the number of dates that start within the range.
+        :param int|datetime.date first: the first day of the range.
+        :param int|datetime.date last: the last day of the range.
+        :return: numpy.ndarray the record numbers, sorted and unique.
+        """
+        first, last = _to_ordinal(first), _to_ordinal(last)
+        starting = self.__starting(first, last)
+        return _unique(self.__by_first[2][starting][self.__by_first[1][starting] <= last])
+
+    def covering(self, first, last):
+        """
+        Returns the records with a date that contains a whole range of days.
+        Takes time proportional to the number of dates that contain the first day.
+        :param int|datetime.date first: the first day of the range.
+        :param int|datetime.date last: the last day of the range.
+        :return: numpy.ndarray the record numbers, sorted and unique.
+        """
+        first, last = _to_ordinal(first), _to_ordinal(last)
+        if first > last:
+            return numpy.empty(0, dtype=numpy.int32)
+        return _unique(numpy.concatenate([numpy.empty(0, dtype=numpy.int32)] + [
+            records[lasts >= last] for _, lasts, records in self.__stab(first)]))
@@ -0,0 +1,205 @@
+"""
+Vectorized parsing of standardized dates (field 046, subfields c and e) into numeric day ranges.
+
+A span like '1705', '1705-09' or '1705-09-23' (or with '.' as separator, as in the Marc data) covers a range of days.
+The start of a date is the first day of its start span, the end is the last day of its end span
+(or of the start span, if there is no end span). Days are given as proleptic Gregorian ordinals,
+as returned by `datetime.date.toordinal()`.
+
+All parsing is done with NumPy array operations, without a Python loop per date.
+
+Requires NumPy.
+"""
+import datetime
+
+from ._storage import require_numpy
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PRECISION_INVALID = -1
+PRECISION_NONE = 0
+PRECISION_YEAR = 1
+PRECISION_MONTH = 2
+PRECISION_DAY = 3
+
+INVALID_ORDINAL = -1
+
+# ordinal of 1970-01-01, the epoch of numpy.datetime64
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def _parse(spans):
+    """
+    Parses spans into the ordinals of their first and last day and their precision.
+    :param numpy.ndarray spans: unicode array, '' for a missing span.
+    :return: (numpy.ndarray, numpy.ndarray, numpy.ndarray) first, last, precision
+    """
+    count = len(spans)
+    lengths = numpy.char.str_len(spans) if count else numpy.zeros(0, dtype=numpy.int64)
+
+    # one row of 10 code points per span, shorter spans are padded with 0
+    # (longer spans are truncated, they are invalid anyway)
+    chars = spans.astype('U10').view(numpy.uint32).reshape(count, 10)
+    is_digit = (chars >= ord('0')) & (chars <= ord('9'))
+
+    def is_separator(column):
+        return (chars[:, column] == ord('-')) | (chars[:, column] == ord('.'))
+
+    def number(start, end):
+        value = numpy.zeros(count, dtype=numpy.int64)
+        for column in range(start, end):
+            value = value * 10 + (chars[:, column].astype(numpy.int64) - ord('0'))
+        return value
+
+    year_ok = is_digit[:, 0:4].all(axis=1)
+    month_ok = year_ok & is_separator(4) & is_digit[:, 5:7].all(axis=1)
+    day_ok = month_ok & is_separator(7) & is_digit[:, 8:10].all(axis=1)
+
+    precision = numpy.full(count, PRECISION_INVALID, dtype=numpy.int8)
+    precision[(lengths == 4) & year_ok] = PRECISION_YEAR
+    precision[(lengths == 7) & month_ok] = PRECISION_MONTH
+    precision[(lengths == 10) & day_ok] = PRECISION_DAY
+    precision[lengths == 0] = PRECISION_NONE
+
+    year = numpy.where(precision > PRECISION_NONE, number(0, 4), 1970)
+    month = numpy.where(precision >= PRECISION_MONTH, number(5, 7), 1)
+    day = numpy.where(precision == PRECISION_DAY, number(8, 10), 1)
+
+    month_valid = (month >= 1) & (month <= 12)
+    month_index = (year - 1970) * 12 + numpy.clip(month, 1, 12) - 1
+    month_start = month_index.astype('datetime64[M]').astype('datetime64[D]').astype(numpy.int64)
+    next_month_start = (month_index + 1).astype('datetime64[M]').astype('datetime64[D]').astype(numpy.int64)
+    day_valid = (day >= 1) & (day <= next_month_start - month_start)
+
+    invalid = (year < 1) | ~month_valid | ~day_valid
+    precision[invalid & (precision > PRECISION_NONE)] = PRECISION_INVALID
+
+    first = month_start + day - 1
+    last = numpy.select(
+        [precision == PRECISION_YEAR, precision == PRECISION_MONTH],
+        [(year - 1970 + 1).astype('datetime64[Y]').astype('datetime64[D]').astype(numpy.int64) - 1,
+         next_month_start - 1],
+        first)
+
+    valid = precision > PRECISION_NONE
+    first = numpy.where(valid, first + _EPOCH_ORDINAL, INVALID_ORDINAL)
+    last = numpy.where(valid, last + _EPOCH_ORDINAL, INVALID_ORDINAL)
+    return first, last, precision
+
+
+def _to_unicode_array(spans):
+    if isinstance(spans, numpy.ndarray) and spans.dtype.kind == 'U':
+        return spans
+    # missing end spans are given as False or None
+    return numpy.array([span if span else u'' for span in spans], dtype=numpy.str_)
+
+
+class DateSpans(object):
+    """
+    Numeric day ranges of many standardized dates.
+
+    :param numpy.ndarray start: ordinal of the first day of each date, INVALID_ORDINAL if the start span is invalid.
+    :param numpy.ndarray end: ordinal of the last day of each date, INVALID_ORDINAL if a span is invalid.
+    :param numpy.ndarray start_precision: PRECISION_YEAR, PRECISION_MONTH, PRECISION_DAY or PRECISION_INVALID.
+    :param numpy.ndarray end_precision: as `start_precision`, or PRECISION_NONE if a date has no end span.
+    """
+    def __init__(self, start, end, start_precision, end_precision):
+        self.start = start
+        self.end = end
+        self.start_precision = start_precision
+        self.end_precision = end_precision
+
+    def __len__(self):
+        return len(self.start)
+
+    @classmethod
+    def parse(cls, starts, ends=None):
+        """
+        Parses the start and end spans (046 $c and $e) of many dates.
+        :param [str]|numpy.ndarray starts: the start spans.
+        :param [str|False|None]|numpy.ndarray|None ends: the end spans, False, None or '' if a date has none.
+        :return: DateSpans
+        """
+        require_numpy(__name__)
+
+        first, start_last, start_precision = _parse(_to_unicode_array(starts))
+        start_precision[start_precision == PRECISION_NONE] = PRECISION_INVALID
+
+        if ends is None:
+            end_precision = numpy.full(len(first), PRECISION_NONE, dtype=numpy.int8)
+            end = start_last
+        else:
+            end_first, end_last, end_precision = _parse(_to_unicode_array(ends))
+            end = numpy.where(end_precision == PRECISION_NONE, start_last, end_last)
+
+        # a date is only valid if all of its spans are
+        end = numpy.where((start_precision == PRECISION_INVALID) | (end_precision == PRECISION_INVALID),
+                          INVALID_ORDINAL, end)
+        return cls(first, end, start_precision, end_precision)
+
+    @classmethod
+    def from_standardized_dates(cls, dates):
+        """
+        Parses StandardizedDate objects, e.g. as returned by `get_standardized_date()`.
+        :param [StandardizedDate] dates: the dates.
+        :return: DateSpans
+        """
+        dates = list(dates)
+        return cls.parse([date.start_span for date in dates], [date.end_span for date in dates])
+
+    def is_valid(self):
+        """
+        :return: numpy.ndarray bool mask of the dates whose spans could all be parsed.
+        """
+        return self.end != INVALID_ORDINAL
+
+    def overlapping(self, first, last):
+        """
+        Returns a mask of the dates whose range overlaps the given range of days.
+        :param int|datetime.date first: first day of the range.
+        :param int|datetime.date last: last day of the range.
+        :return: numpy.ndarray bool
+        """
+        first, last = _to_ordinal(first), _to_ordinal(last)
+        return self.is_valid() & (self.start <= last) & (self.end >= first)
+
+    def to_datetime64(self):
+        """
+        Returns start and end as datetime64[D] arrays (NaT for invalid dates).
+        :return: (numpy.ndarray, numpy.ndarray)
+        """
+        valid = self.is_valid()
+        start = numpy.where(valid, self.start - _EPOCH_ORDINAL, 0).astype('datetime64[D]')
+        end = numpy.where(valid, self.end - _EPOCH_ORDINAL, 0).astype('datetime64[D]')
+        start[~valid] = numpy.datetime64('NaT')
+        end[~valid] = numpy.datetime64('NaT')
+        return start, end
+
+    def to_iso8601(self):
+        """
+        Formats the dates like `StandardizedDate.get_standardized_date_string_ISO8601` ('' for invalid dates).
+        :return: numpy.ndarray of str
+        """
+        start, end = self.to_datetime64()
+        valid = self.is_valid()
+        result = numpy.where(valid, _format(start, self.start_precision), u'')
+        has_end = valid & (self.end_precision > PRECISION_NONE)
+        return numpy.where(has_end, numpy.char.add(numpy.char.add(result, u'--'), _format(end, self.end_precision)),
+                           result)
+
+
+def _format(days, precision):
+    formatted = numpy.datetime_as_string(days, unit='D')
+    return numpy.select([precision == PRECISION_YEAR, precision == PRECISION_MONTH],
+                        [numpy.datetime_as_string(days.astype('datetime64[Y]')),
+                         numpy.datetime_as_string(days.astype('datetime64[M]'))],
+                        formatted)
+
+
+def _to_ordinal(day):
+    if isinstance(day, datetime.date):
+        return day.toordinal()
+    return day
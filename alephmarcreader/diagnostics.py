@@ -0,0 +1,230 @@
+"""
+Pluggable sinks for the warnings and errors reported while reading records.
+
+By default, every issue is written to `stderr` as it occurs (`StderrDiagnostics`).
+On large, dirty batches this can be replaced, globally with `set_default` or per reader by setting
+`reader.diagnostics` (or per reader class, e.g. `AlephMarcXMLReader.diagnostics`), by a sink that
+is silent, aggregates counts per (tag, subfield, issue), rate limits the messages or forwards them to `logging`.
+
+Reporting an issue to `SilentDiagnostics` or `AggregateDiagnostics` does not format any message.
+"""
+import collections
+import logging
+import sys
+
+ISSUE_CARDINALITY = 'cardinality'
+ISSUE_PARSE_ERROR = 'parse_error'
+ISSUE_NO_SYSTEM_NUMBER = 'no_system_number'
+
+
+def format_message(issue, source, tag, subfield, detail):
+    """
+    Formats the message of an issue.
+    :param str issue: the kind of issue, e.g. ISSUE_CARDINALITY.
+    :param str source: the file (or placeholder) the issue occurred in.
+    :param str|None tag: the marc field tag, if any.
+    :param str|None subfield: the marc subfield code, if any.
+    :param detail: issue specific detail: the number of subfields found for ISSUE_CARDINALITY,
+    the byte offset of the record for ISSUE_NO_SYSTEM_NUMBER, the complete message for ISSUE_PARSE_ERROR.
+    :return: str
+    """
+    if issue == ISSUE_CARDINALITY:
+        return (u'!!! WARNING: In \'{}\', Field \'{}\', Subfield \'{}\': Expected maximum 1 Subfield, found {}.\n'
+                .format(source, tag, subfield, detail))
+    if issue == ISSUE_NO_SYSTEM_NUMBER:
+        return (u'!!! WARNING: In \'{}\', record at byte offset {}: '
+                u'No numeric system number in controlfield 001, record not indexed.\n'.format(source, detail))
+    if issue == ISSUE_PARSE_ERROR:
+        return detail
+    return u'!!! WARNING: In \'{}\', Field \'{}\', Subfield \'{}\': {} ({}).\n'.format(source, tag, subfield, issue,
+                                                                                    detail)
+
+
+class Diagnostics(object):
+    """
+    Base class of the sinks. Writes every issue to `stderr` as it occurs.
+    """
+
+    def report(self, issue, source, tag=None, subfield=None, detail=None):
+        """
+        Reports an issue, see `format_message` for the parameters.
+        """
+        sys.stderr.write(format_message(issue, source, tag, subfield, detail))
+
+    def spawn(self):
+        """
+        Returns a new, empty sink of the same kind and configuration, e.g. for a worker process of a batch.
+        :return: Diagnostics
+        """
+        return type(self)()
+
+    def merge(self, other):
+        """
+        Adds what a spawned sink has collected to this sink. Sinks that do not collect anything ignore this.
+        :param Diagnostics other: the spawned sink.
+        """
+        pass
+
+
+class StderrDiagnostics(Diagnostics):
+    """
+    Writes every issue to `stderr` as it occurs (the default).
+    """
+    pass
+
+
+class SilentDiagnostics(Diagnostics):
+    """
+    Ignores all issues.
+    """
+
+    def report(self, issue, source, tag=None, subfield=None, detail=None):
+        pass
+
+
+class AggregateDiagnostics(Diagnostics):
+    """
+    Counts the issues per (tag, subfield, issue) and keeps a sample of the files they occurred in.
+    Nothing is written until `write_summary` is called.
+    :param int max_samples: the number of files kept per (tag, subfield, issue).
+    """
+
+    def __init__(self, max_samples=5):
+        self.max_samples = max_samples
+        self.counts = collections.Counter()
+        self.samples = collections.defaultdict(list)
+
+    def report(self, issue, source, tag=None, subfield=None, detail=None):
+        key = (tag, subfield, issue)
+        self.counts[key] += 1
+        samples = self.samples[key]
+        if len(samples) < self.max_samples and source not in samples:
+            samples.append(source)
+
+    def spawn(self):
+        return type(self)(self.max_samples)
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        for key, sources in other.samples.items():
+            samples = self.samples[key]
+            for source in sources:
+                if len(samples) < self.max_samples and source not in samples:
+                    samples.append(source)
+
+    def total(self):
+        """
+        :return: int the number of issues reported.
+        """
+        return sum(self.counts.values())
+
+    def summary(self):
+        """
+        Returns one line per (tag, subfield, issue), the most frequent first.
+        :return: str
+        """
+        lines = []
+        for (tag, subfield, issue), count in self.counts.most_common():
+            lines.append(u'{} x {} in Field \'{}\', Subfield \'{}\', e.g. in {}\n'.format(
+                count, issue, tag, subfield, u', '.join(u'\'{}\''.format(s) for s in self.samples[(tag, subfield, issue)])))
+        return u''.join(lines)
+
+    def write_summary(self, stream=None):
+        """
+        Writes the summary, to `stderr` by default.
+        :param file stream: the stream to write to.
+        """
+        (stream if stream is not None else sys.stderr).write(self.summary())
+
+
+class RateLimitedDiagnostics(AggregateDiagnostics):
+    """
+    Writes the first `limit` issues per (tag, subfield, issue) to `stderr` and only counts the others.
+    The counts can be written with `write_summary`.
+    :param int limit: the number of messages written per (tag, subfield, issue).
+    :param int max_samples: the number of files kept per (tag, subfield, issue).
+    """
+
+    def __init__(self, limit=10, max_samples=5):
+        super(RateLimitedDiagnostics, self).__init__(max_samples)
+        self.limit = limit
+
+    def report(self, issue, source, tag=None, subfield=None, detail=None):
+        super(RateLimitedDiagnostics, self).report(issue, source, tag, subfield, detail)
+        if self.counts[(tag, subfield, issue)] <= self.limit:
+            sys.stderr.write(format_message(issue, source, tag, subfield, detail))
+
+    def spawn(self):
+        return type(self)(self.limit, self.max_samples)
+
+
+class LoggingDiagnostics(Diagnostics):
+    """
+    Forwards every issue to a logger, as a warning (errors for ISSUE_PARSE_ERROR).
+    Messages are only formatted if the logger is enabled for the level.
+    :param str logger_name: the name of the logger.
+    """
+
+    def __init__(self, logger_name='alephmarcreader'):
+        self.logger_name = logger_name
+        self.logger = logging.getLogger(logger_name)
+
+    def report(self, issue, source, tag=None, subfield=None, detail=None):
+        level = logging.ERROR if issue == ISSUE_PARSE_ERROR else logging.WARNING
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, format_message(issue, source, tag, subfield, detail).strip())
+
+    def spawn(self):
+        return type(self)(self.logger_name)
+
+
+MODES = {
+    'stderr': StderrDiagnostics,
+    'silent': SilentDiagnostics,
+    'aggregate': AggregateDiagnostics,
+    'rate-limited': RateLimitedDiagnostics,
+    'logging': LoggingDiagnostics,
+}
+
+_default = StderrDiagnostics()
+
+
+def create(mode, **kwargs):
+    """
+    Creates a sink by name.
+    :param str mode: 'stderr', 'silent', 'aggregate', 'rate-limited' or 'logging'.
+    :return: Diagnostics
+    """
+    try:
+        return MODES[mode](**kwargs)
+    except KeyError:
+        raise ValueError('Unknown diagnostics mode {!r}, expected one of {}'.format(mode, sorted(MODES)))
+
+
+def get_default():
+    """
+    :return: Diagnostics the sink used by readers that do not have their own.
+    """
+    return _default
+
+
+def set_default(sink):
+    """
+    Sets the sink used by readers that do not have their own.
+    :param Diagnostics|str sink: the sink or the name of a mode.
+    :return: Diagnostics the previous default sink.
+    """
+    global _default
+    previous = _default
+    _default = create(sink) if isinstance(sink, str) else sink
+    return previous
+
+
+def resolve(owner):
+    """
+    Returns the sink of a reader (or reader class), falling back to the default sink.
+    :param owner: an object with a `diagnostics` attribute.
+    :return: Diagnostics
+    """
+    sink = getattr(owner, 'diagnostics', None)
+    return sink if sink is not None else _default
@@ -0,0 +1,3 @@
+"""
+Exports of the results of the getters of a corpus into other stores, e.g. `alephmarcreader.export.sqlite`.
+"""
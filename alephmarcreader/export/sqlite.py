@@ -0,0 +1,312 @@
+"""
+Bulk export of the results of all getters of a corpus into a normalised SQLite database.
+
+Records are read one by one (e.g. from `iter_records`) and their rows are buffered per table.
+Every `batch_size` records, the buffers are written with `executemany` in one transaction, so memory stays bounded
+by the batch. The database is in WAL mode; the indexes are dropped before and created after the load.
+
+Tables (`record` refers to `records.id`, `position` is the index in the list returned by the getter):
+
+- records: id, record_id (system number or file name), source (file path), timestamp (controlfield 005)
+- correspondents: id, record, relation ('author', 'recipient', 'mentioned_person', 'mentioned_organisation'),
+  position, type ('Person' or 'Organisation'), name, lifespan, gnd, place, division
+- correspondent_roles: correspondent, role (e.g. 'aut', 'rcp')
+- places (751): record, position, name, gnd
+- shelfmarks (852): record, position, institution, identifier, country, collection
+- physical_descriptions (300): record, position, extent, attribute, dimension, supplement
+- dates (046): record, position, start_span, end_span, start_day and end_day (proleptic Gregorian ordinals of the
+  first and last day the date may refer to, NULL if it cannot be parsed), start_precision, end_precision
+  (see `alephmarcreader.dates`)
+- original_dates (264): record, position, date, place
+- remarks: record, kind (the getter: 'general_remarks', 'content_summary', 'supplement_remarks', 'document_state',
+  'references_to_related_entries'), position, text
+- languages (041): record, position, language
+- dois (024): record, position, doi
+- bibliographic_references (581): record, position, prefix, reference
+
+Requires NumPy (for the numeric bounds of the dates).
+"""
+import sqlite3
+
+from ..dates import DateSpans
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    record_id TEXT,
+    source TEXT,
+    timestamp TEXT
+);
+CREATE TABLE IF NOT EXISTS correspondents (
+    id INTEGER PRIMARY KEY,
+    record INTEGER NOT NULL REFERENCES records (id),
+    relation TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT,
+    lifespan TEXT,
+    gnd TEXT,
+    place TEXT,
+    division TEXT
+);
+CREATE TABLE IF NOT EXISTS correspondent_roles (
+    correspondent INTEGER NOT NULL REFERENCES correspondents (id),
+    role TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS places (
+    record INTEGER NOT NULL REFERENCES records (id),
+    position INTEGER NOT NULL,
+    name TEXT,
+    gnd TEXT
+);
+CREATE TABLE IF NOT EXISTS shelfmarks (
+    record INTEGER NOT NULL REFERENCES records (id),
+    position INTEGER NOT NULL,
+    institution TEXT,
+    identifier TEXT,
+    country TEXT,
+    collection TEXT
+);
+CREATE TABLE IF NOT EXISTS physical_descriptions (
+    record INTEGER NOT NULL REFERENCES records (id),
+    position INTEGER NOT NULL,
+    extent TEXT,
+    attribute TEXT,
+    dimension TEXT,
+    supplement TEXT
+);
+CREATE TABLE IF NOT EXISTS dates (
+    record INTEGER NOT NULL REFERENCES records (id),
+    position INTEGER NOT NULL,
+    start_span TEXT,
+    end_span TEXT,
+    start_day INTEGER,
+    end_day INTEGER,
+    start_precision INTEGER,
+    end_precision INTEGER
+);
+CREATE TABLE IF NOT EXISTS original_dates (
+    record INTEGER NOT NULL REFERENCES records (id),
+    position INTEGER NOT NULL,
+    date TEXT,
+    place TEXT
+);
+CREATE TABLE IF NOT EXISTS remarks (
+    record INTEGER NOT NULL REFERENCES records (id),
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    text TEXT
+);
+CREATE TABLE IF NOT EXISTS languages (
+    record INTEGER NOT NULL REFERENCES records (id),
+    position INTEGER NOT NULL,
+    language TEXT
+);
+CREATE TABLE IF NOT EXISTS dois (
+    record INTEGER NOT NULL REFERENCES records (id),
+    position INTEGER NOT NULL,
+    doi TEXT
+);
+CREATE TABLE IF NOT EXISTS bibliographic_references (
+    record INTEGER NOT NULL REFERENCES records (id),
+    position INTEGER NOT NULL,
+    prefix TEXT,
+    reference TEXT
+);
+"""
+
+# index name -> table and columns, created after the load
+INDEXES = {
+    'records_record_id': ('records', 'record_id'),
+    'correspondents_record': ('correspondents', 'record'),
+    'correspondents_gnd': ('correspondents', 'gnd'),
+    'correspondent_roles_correspondent': ('correspondent_roles', 'correspondent'),
+    'places_record': ('places', 'record'),
+    'places_gnd': ('places', 'gnd'),
+    'shelfmarks_record': ('shelfmarks', 'record'),
+    'physical_descriptions_record': ('physical_descriptions', 'record'),
+    'dates_record': ('dates', 'record'),
+    'dates_days': ('dates', 'start_day, end_day'),
+    'original_dates_record': ('original_dates', 'record'),
+    'remarks_record': ('remarks', 'record'),
+    'languages_record': ('languages', 'record'),
+    'dois_record': ('dois', 'record'),
+    'bibliographic_references_record': ('bibliographic_references', 'record'),
+}
+
+# table -> the INSERT statement of its rows
+_INSERTS = {
+    'records': 'INSERT INTO records (id, record_id, source, timestamp) VALUES (?, ?, ?, ?)',
+    'correspondents': 'INSERT INTO correspondents (id, record, relation, position, type, name, lifespan, gnd, place, '
+                      'division) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+    'correspondent_roles': 'INSERT INTO correspondent_roles (correspondent, role) VALUES (?, ?)',
+    'places': 'INSERT INTO places (record, position, name, gnd) VALUES (?, ?, ?, ?)',
+    'shelfmarks': 'INSERT INTO shelfmarks (record, position, institution, identifier, country, collection) '
+                  'VALUES (?, ?, ?, ?, ?, ?)',
+    'physical_descriptions': 'INSERT INTO physical_descriptions (record, position, extent, attribute, dimension, '
+                             'supplement) VALUES (?, ?, ?, ?, ?, ?)',
+    'dates': 'INSERT INTO dates (record, position, start_span, end_span, start_day, end_day, start_precision, '
+             'end_precision) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+    'original_dates': 'INSERT INTO original_dates (record, position, date, place) VALUES (?, ?, ?, ?)',
+    'remarks': 'INSERT INTO remarks (record, kind, position, text) VALUES (?, ?, ?, ?)',
+    'languages': 'INSERT INTO languages (record, position, language) VALUES (?, ?, ?)',
+    'dois': 'INSERT INTO dois (record, position, doi) VALUES (?, ?, ?)',
+    'bibliographic_references': 'INSERT INTO bibliographic_references (record, position, prefix, reference) '
+                                'VALUES (?, ?, ?, ?)',
+}
+
+CORRESPONDENT_RELATIONS = ('author', 'recipient', 'mentioned_person', 'mentioned_organisation')
+REMARK_KINDS = ('general_remarks', 'content_summary', 'supplement_remarks', 'document_state',
+                'references_to_related_entries')
+
+
+def _value(value):
+    """
+    The getters return False for missing values, they are stored as NULL.
+    """
+    return value if value is not False else None
+
+
+class SQLiteExporter(object):
+    """
+    Writes records to an SQLite database in batches.
+    Can be used as a context manager, which writes the last batch, creates the indexes and closes the database on exit.
+    :param str path: the path of the database, created if it does not exist. Records are appended to existing ones.
+    :param int batch_size: the number of records written per transaction.
+    """
+    def __init__(self, path, batch_size=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+
+        self.__db = sqlite3.connect(path)
+        self.__db.execute('PRAGMA journal_mode=WAL')
+        self.__db.execute('PRAGMA synchronous=NORMAL')
+        self.__db.executescript(_SCHEMA)
+        # maintaining the indexes while loading is slower than building them afterwards
+        with self.__db:
+            for name in INDEXES:
+                self.__db.execute('DROP INDEX IF EXISTS {}'.format(name))
+
+        self.__next_record = self.__get_next_id('records')
+        self.__next_correspondent = self.__get_next_id('correspondents')
+        self.__rows = dict((table, []) for table in _INSERTS)
+        # (record, position, start span, end span) of the dates of the batch, parsed all at once on flush
+        self.__dates = []
+        self.__batch = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.finish()
+        else:
+            self.__db.close()
+
+    def __get_next_id(self, table):
+        return self.__db.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM {}'.format(table)).fetchone()[0]
+
+    def add(self, reader, record_id=None):
+        """
+        Adds a record.
+        :param AbstractAlephMarcReader reader: the reader of the record.
+        :param str|None record_id: the id of the record, defaults to the system number
+        (see `AbstractAlephMarcReader.record_id`).
+        :return: int the id of the record in the `records` table.
+        """
+        data = reader.extract_all()
+        record = self.__next_record
+        self.__next_record += 1
+
+        rows = self.__rows
+        rows['records'].append((record, record_id if record_id is not None else reader.record_id(),
+                                reader._file_path, reader.control_field('005')))
+
+        for relation in CORRESPONDENT_RELATIONS:
+            for position, correspondent in enumerate(data[relation]):
+                correspondent_id = self.__next_correspondent
+                self.__next_correspondent += 1
+                rows['correspondents'].append((
+                    correspondent_id, record, relation, position, correspondent.get_type(),
+                    _value(correspondent.name), _value(getattr(correspondent, 'lifespan', None)),
+                    _value(correspondent.gnd), _value(getattr(correspondent, 'place', None)),
+                    _value(getattr(correspondent, 'division', None))))
+                rows['correspondent_roles'].extend((correspondent_id, role) for role in correspondent.roles or [])
+
+        rows['places'].extend((record, position, _value(place.name), _value(place.gnd))
+                              for position, place in enumerate(data['creation_place']))
+        rows['shelfmarks'].extend((record, position, _value(shelfmark.institution), _value(shelfmark.identifier),
+                                   _value(shelfmark.country), _value(shelfmark.collection))
+                                  for position, shelfmark in enumerate(data['shelfmark']))
+        rows['physical_descriptions'].extend(
+            (record, position, _value(description.extent), _value(description.attribute),
+             _value(description.dimension), _value(description.supplement))
+            for position, description in enumerate(data['physical_description']))
+        self.__dates.extend((record, position, date.start_span, _value(date.end_span))
+                            for position, date in enumerate(data['standardized_date']))
+        rows['original_dates'].extend((record, position, _value(original.date), _value(original.place))
+                                      for position, original in enumerate(data['original_date_and_place']))
+        for kind in REMARK_KINDS:
+            rows['remarks'].extend((record, kind, position, text) for position, text in enumerate(data[kind]))
+        rows['languages'].extend((record, position, language) for position, language in enumerate(data['language']))
+        rows['dois'].extend((record, position, doi) for position, doi in enumerate(data['emanuscripta_doi']))
+        rows['bibliographic_references'].extend(
+            (record, position, _value(reference.prefix), _value(reference.reference))
+            for position, reference in enumerate(data['bibliographic_references']))
+
+        self.count += 1
+        self.__batch += 1
+        if self.__batch >= self.batch_size:
+            self.flush()
+        return record
+
+    def flush(self):
+        """
+        Writes the buffered records in one transaction.
+        """
+        if self.__dates:
+            spans = DateSpans.parse([date[2] for date in self.__dates], [date[3] for date in self.__dates])
+            valid = spans.is_valid()
+            self.__rows['dates'] = [
+                date + ((int(start), int(end)) if is_valid else (None, None)) + (int(start_precision), int(end_precision))
+                for date, start, end, is_valid, start_precision, end_precision
+                in zip(self.__dates, spans.start, spans.end, valid, spans.start_precision, spans.end_precision)]
+
+        with self.__db:
+            for table, insert in _INSERTS.items():
+                if self.__rows[table]:
+                    self.__db.executemany(insert, self.__rows[table])
+
+        self.__rows = dict((table, []) for table in _INSERTS)
+        self.__dates = []
+        self.__batch = 0
+
+    def finish(self):
+        """
+        Writes the last batch, creates the indexes and closes the database.
+        """
+        self.flush()
+        with self.__db:
+            for name, (table, columns) in sorted(INDEXES.items()):
+                self.__db.execute('CREATE INDEX IF NOT EXISTS {} ON {} ({})'.format(name, table, columns))
+        self.__db.execute('ANALYZE')
+        self.__db.close()
+
+
+def export(readers, path, record_ids=None, batch_size=10000):
+    """
+    Exports a corpus into an SQLite database.
+    :param iterable readers: the readers of the records, e.g. from `iter_records` with `tags=GETTER_TAGS`.
+    :param str path: the path of the database, created if it does not exist. Records are appended to existing ones.
+    :param iterable|None record_ids: an id per record, defaults to the system numbers
+    (see `AbstractAlephMarcReader.record_id`).
+    :param int batch_size: the number of records written per transaction.
+    :return: int the number of records exported.
+    """
+    record_ids = iter(record_ids) if record_ids is not None else None
+    with SQLiteExporter(path, batch_size) as exporter:
+        for reader in readers:
+            exporter.add(reader, next(record_ids) if record_ids is not None else None)
+    return exporter.count
+export.__annotations__ = {'path': str, 'return': int}
@@ -0,0 +1,164 @@
+"""
+Persistent cache of the extracted data (`to_dict()`, the results of all getters) of record files, stored in an SQLite file.
+
+A file is recognised as unchanged by its size and modification time, without reading it.
+If these have changed, the file is hashed: files whose content is unchanged (e.g. only touched or copied)
+are still answered from the cache. Results are stored per content hash, format and `SCHEMA_VERSION`,
+so results of an older version of the getters are never returned.
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+
+from .batch import get_reader_class
+
+# increase whenever the getters or `to_dict` change what they return
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT NOT NULL,
+    format TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (path, format)
+);
+CREATE TABLE IF NOT EXISTS results (
+    hash TEXT NOT NULL,
+    format TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (hash, format, version)
+);
+"""
+
+
+def _get_signature(file_path):
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _hash_file(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as data_file:
+        for block in iter(lambda: data_file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache(object):
+    """
+    Caches the extracted data of record files in an SQLite file.
+    Can be used as a context manager, which closes the file on exit.
+    :param str path: the path of the SQLite file, created if it does not exist.
+    """
+    def __init__(self, path):
+        self.path = path
+
+        self.hits = 0
+        self.misses = 0
+
+        self.__db = sqlite3.connect(path)
+        self.__db.execute('PRAGMA journal_mode=WAL')
+        self.__db.execute('PRAGMA synchronous=NORMAL')
+        self.__db.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.__db.execute('SELECT COUNT(*) FROM results WHERE version = ?', (SCHEMA_VERSION,)).fetchone()[0]
+
+    def close(self):
+        """
+        Closes the SQLite file.
+        """
+        self.__db.close()
+
+    def stats(self):
+        """
+        :return: dict hits, misses, hit rate and number of cached results.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': float(self.hits) / lookups if lookups else 0.0,
+            'entries': len(self),
+        }
+
+    def get(self, file_path, file_format):
+        """
+        Returns the cached data of a file, or None if the file is not cached or has changed.
+        :param str file_path: the path of the record file.
+        :param str file_format: the format of the file, see `alephmarcreader.batch`.
+        :return: dict|None
+        """
+        size, mtime_ns = _get_signature(file_path)
+        row = self.__db.execute('SELECT size, mtime_ns, hash FROM files WHERE path = ? AND format = ?',
+                                (file_path, file_format)).fetchone()
+
+        if row is not None and (row[0], row[1]) == (size, mtime_ns):
+            content_hash = row[2]
+        else:
+            content_hash = _hash_file(file_path)
+
+        data = self.__db.execute('SELECT data FROM results WHERE hash = ? AND format = ? AND version = ?',
+                                 (content_hash, file_format, SCHEMA_VERSION)).fetchone()
+        if data is None:
+            self.misses += 1
+            return None
+
+        if row is None or tuple(row) != (size, mtime_ns, content_hash):
+            # the content is known, remember the file for the next time
+            with self.__db:
+                self.__put_file(file_path, file_format, size, mtime_ns, content_hash)
+        self.hits += 1
+        return pickle.loads(data[0])
+
+    def put(self, file_path, file_format, data):
+        """
+        Stores the extracted data of a file.
+        :param str file_path: the path of the record file.
+        :param str file_format: the format of the file, see `alephmarcreader.batch`.
+        :param dict data: the data, as returned by `to_dict()`.
+        """
+        size, mtime_ns = _get_signature(file_path)
+        content_hash = _hash_file(file_path)
+
+        with self.__db:
+            self.__put_file(file_path, file_format, size, mtime_ns, content_hash)
+            self.__db.execute('INSERT OR REPLACE INTO results (hash, format, version, data) VALUES (?, ?, ?, ?)',
+                              (content_hash, file_format, SCHEMA_VERSION,
+                               sqlite3.Binary(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))))
+
+    def extract(self, file_path, file_format):
+        """
+        Returns the data of a file from the cache, or extracts it (and adds it to the cache).
+        :param str file_path: the path of the record file.
+        :param str file_format: the format of the file, see `alephmarcreader.batch`.
+        :return: dict
+        """
+        data = self.get(file_path, file_format)
+        if data is None:
+            reader_class = get_reader_class(file_format)
+            data = reader_class(file_path, tags=reader_class.GETTER_TAGS).to_dict()
+            self.put(file_path, file_format, data)
+        return data
+
+    def clear(self):
+        """
+        Removes all cached data. The counters are kept.
+        """
+        with self.__db:
+            self.__db.execute('DELETE FROM files')
+            self.__db.execute('DELETE FROM results')
+
+    def __put_file(self, file_path, file_format, size, mtime_ns, content_hash):
+        self.__db.execute('INSERT OR REPLACE INTO files (path, format, size, mtime_ns, hash) VALUES (?, ?, ?, ?, ?)',
+                          (file_path, file_format, size, mtime_ns, content_hash))
@@ -0,0 +1,253 @@
+"""
+Persistent inverted index from GND identifiers to the records they occur in and their role there.
+
+A corpus is streamed once; for every record the GNDs of the authors and recipients (by role 'aut' and 'rcp'),
+the mentioned persons (600) and organisations (610) and the creation places (751) are collected.
+The index is written to one file that is memory mapped on lookup:
+
+- the GNDs, sorted, as a fixed width byte string array (binary searched),
+- per GND, the offset of its posting list,
+- the posting lists: per GND the sorted postings `record number << 3 | role code`, delta encoded
+  (the first value of each list as is, then the differences), so that a list is decoded with one `cumsum`,
+- the record ids (e.g. the system numbers), by record number.
+
+Requires NumPy.
+"""
+import struct
+
+from ._storage import MemoryMappedIndex, require_numpy, to_bytes_array, write_index
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ROLE_AUTHOR = 'aut'
+ROLE_RECIPIENT = 'rcp'
+ROLE_MENTIONED_PERSON = '600'
+ROLE_MENTIONED_ORGANISATION = '610'
+ROLE_PLACE = '751'
+
+# the role code is the index in this tuple, it must fit into ROLE_BITS
+ROLES = (ROLE_AUTHOR, ROLE_RECIPIENT, ROLE_MENTIONED_PERSON, ROLE_MENTIONED_ORGANISATION, ROLE_PLACE)
+ROLE_BITS = 3
+
+# magic, number of GNDs, width of a GND, number of records, width of a record id, number of postings,
+# size of a delta in bytes
+_HEADER = struct.Struct('<8sqqqqqq')
+_MAGIC = b'AMRGND01'
+
+
+def _intersect_sorted(a, b):
+    """
+    Intersects two sorted arrays of unique values by binary searching the values of the shorter one in the longer one.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    positions = numpy.minimum(numpy.searchsorted(b, a), max(len(b) - 1, 0))
+    return a[b[positions] == a] if len(b) else a[:0]
+
+
+def get_gnd_roles(reader):
+    """
+    Returns the GNDs of a record with their role.
+    :param AbstractAlephMarcReader reader: the reader of the record.
+    :return: [(str, str)] (GND, role) pairs, role is one of ROLES.
+    """
+    data = reader.extract_all()
+    pairs = []
+    for role, key in ((ROLE_AUTHOR, 'author'), (ROLE_RECIPIENT, 'recipient'),
+                      (ROLE_MENTIONED_PERSON, 'mentioned_person'),
+                      (ROLE_MENTIONED_ORGANISATION, 'mentioned_organisation'),
+                      (ROLE_PLACE, 'creation_place')):
+        pairs.extend((entity.gnd, role) for entity in data[key] if entity.gnd)
+    return pairs
+
+
+class GndIndexBuilder(object):
+    """
+    Collects the postings of a corpus record by record and writes the index.
+    Postings are kept in compact arrays (16 bytes each) until `write`.
+    """
+    def __init__(self):
+        require_numpy(__name__)
+        self.__gnd_codes = {}
+        self.__record_ids = []
+        # GND code and posting of every posting, in the order they were added
+        self.__posting_gnds = numpy.empty(1024, dtype=numpy.int64)
+        self.__postings = numpy.empty(1024, dtype=numpy.uint64)
+        self.__count = 0
+
+    def __len__(self):
+        return len(self.__record_ids)
+
+    def add(self, record_id, gnd_roles):
+        """
+        Adds a record.
+        :param str record_id: the id of the record, e.g. its system number.
+        :param [(str, str)] gnd_roles: (GND, role) pairs, role is one of ROLES.
+        """
+        record_number = len(self.__record_ids)
+        self.__record_ids.append(record_id)
+
+        for gnd, role in gnd_roles:
+            if self.__count == len(self.__postings):
+                self.__posting_gnds = numpy.resize(self.__posting_gnds, 2 * self.__count)
+                self.__postings = numpy.resize(self.__postings, 2 * self.__count)
+            self.__posting_gnds[self.__count] = self.__gnd_codes.setdefault(gnd, len(self.__gnd_codes))
+            self.__postings[self.__count] = record_number << ROLE_BITS | ROLES.index(role)
+            self.__count += 1
+
+    def write(self, path):
+        """
+        Writes the index file.
+        :param str path: the path of the index file.
+        """
+        gnds = sorted(self.__gnd_codes)
+        # GND code -> rank in the sorted GNDs
+        ranks = numpy.empty(len(gnds), dtype=numpy.int64)
+        ranks[[self.__gnd_codes[gnd] for gnd in gnds]] = numpy.arange(len(gnds))
+
+        posting_gnds = ranks[self.__posting_gnds[:self.__count]]
+        postings = self.__postings[:self.__count]
+        order = numpy.lexsort((postings, posting_gnds))
+        posting_gnds, postings = posting_gnds[order], postings[order]
+
+        # a GND may occur several times with the same role in a record
+        keep = numpy.ones(len(postings), dtype=bool)
+        keep[1:] = (posting_gnds[1:] != posting_gnds[:-1]) | (postings[1:] != postings[:-1])
+        posting_gnds, postings = posting_gnds[keep], postings[keep]
+
+        offsets = numpy.zeros(len(gnds) + 1, dtype=numpy.int64)
+        offsets[1:] = numpy.cumsum(numpy.bincount(posting_gnds, minlength=len(gnds)))
+
+        deltas = postings.copy()
+        deltas[1:] -= postings[:-1]
+        # the first posting of each list is stored as is (every GND has at least one posting)
+        deltas[offsets[:-1]] = postings[offsets[:-1]]
+        if len(deltas) == 0 or deltas.max() <= numpy.iinfo(numpy.uint32).max:
+            deltas = deltas.astype(numpy.uint32)
+
+        gnd_array = to_bytes_array(gnds)
+        record_id_array = to_bytes_array(self.__record_ids)
+
+        write_index(path, _HEADER.pack(_MAGIC, len(gnds), gnd_array.itemsize, len(self.__record_ids),
+                                       record_id_array.itemsize, len(deltas), deltas.itemsize),
+                    [gnd_array, offsets, deltas, record_id_array])
+
+
+def build(readers, path, record_ids=None):
+    """
+    Streams a corpus once and writes the index.
+    :param iterable readers: the readers of the records, e.g. from `iter_records` with `tags=GETTER_TAGS`.
+    :param str path: the path of the index file.
+    :param iterable|None record_ids: an id per record, defaults to the system numbers
+    (see `AbstractAlephMarcReader.record_id`).
+    :return: int the number of records.
+    """
+    builder = GndIndexBuilder()
+    record_ids = iter(record_ids) if record_ids is not None else None
+    for reader in readers:
+        builder.add(next(record_ids) if record_ids is not None else reader.record_id(), get_gnd_roles(reader))
+    builder.write(path)
+    return len(builder)
+build.__annotations__ = {'path': str, 'return': int}
+
+
+class GndIndex(MemoryMappedIndex):
+    """
+    Looks up the records a GND occurs in, in a memory mapped index file written by `build`.
+    Can be used as a context manager, which releases the file on exit.
+    :param str path: the path of the index file.
+    """
+    def __init__(self, path):
+        require_numpy(__name__)
+        super(GndIndex, self).__init__(path)
+
+        gnd_count, gnd_width, record_count, record_id_width, posting_count, delta_size = \
+            self._open(_HEADER, _MAGIC, 'GND index')
+        self.__gnds = self._take('S{}'.format(gnd_width), gnd_count)
+        self.__offsets = self._take(numpy.int64, gnd_count + 1)
+        self.__deltas = self._take(numpy.uint32 if delta_size == 4 else numpy.uint64, posting_count)
+        self._take_record_ids(record_id_width, record_count)
+        self.__role_codes = dict((role, code) for code, role in enumerate(ROLES))
+
+    def __len__(self):
+        return len(self.__gnds)
+
+    def __contains__(self, gnd):
+        return self.__find(gnd) is not None
+
+    def close(self):
+        """
+        Releases the memory map. Arrays returned before are not valid any more.
+        """
+        self.__gnds = self.__offsets = self.__deltas = None
+        super(GndIndex, self).close()
+
+    def __find(self, gnd):
+        key = gnd.encode('utf-8')
+        n = int(numpy.searchsorted(self.__gnds, key))
+        if n < len(self.__gnds) and self.__gnds[n] == key:
+            return n
+        return None
+
+    def postings(self, gnd, roles=None):
+        """
+        Returns the decoded postings of a GND.
+        :param str gnd: the GND, e.g. '(DE-588)118656503'.
+        :param [str]|None roles: if given, only postings with these roles (of ROLES).
+        :return: (numpy.ndarray, numpy.ndarray) record numbers and role codes (indices into ROLES),
+        sorted by record number.
+        """
+        n = self.__find(gnd)
+        if n is None:
+            return numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=numpy.int64)
+
+        postings = numpy.cumsum(self.__deltas[self.__offsets[n]:self.__offsets[n + 1]], dtype=numpy.uint64)
+        records = (postings >> numpy.uint64(ROLE_BITS)).astype(numpy.int64)
+        role_codes = (postings & numpy.uint64((1 << ROLE_BITS) - 1)).astype(numpy.int64)
+        if roles is not None:
+            wanted = numpy.zeros(1 << ROLE_BITS, dtype=bool)
+            wanted[[self.__role_codes[role] for role in roles]] = True
+            keep = wanted[role_codes]
+            records, role_codes = records[keep], role_codes[keep]
+        return records, role_codes
+
+    def records(self, gnd, roles=None):
+        """
+        Returns the records a GND occurs in.
+        :param str gnd: the GND, e.g. '(DE-588)118656503'.
+        :param [str]|None roles: if given, only records where the GND has one of these roles (of ROLES).
+        :return: numpy.ndarray the record numbers, sorted and unique.
+        """
+        records = self.postings(gnd, roles)[0]
+        # sorted already, a record is repeated if the GND has several roles in it
+        keep = numpy.ones(len(records), dtype=bool)
+        keep[1:] = records[1:] != records[:-1]
+        return records[keep]
+
+    def intersect(self, *queries):
+        """
+        Returns the records all the given GNDs occur in.
+        :param queries: GNDs, or (GND, roles) pairs to restrict a GND to some roles.
+        :return: numpy.ndarray the record numbers, sorted and unique.
+        """
+        result = None
+        for query in queries:
+            gnd, roles = (query, None) if isinstance(query, str) else query
+            records = self.records(gnd, roles)
+            result = records if result is None else _intersect_sorted(result, records)
+            if len(result) == 0:
+                break
+        return result if result is not None else numpy.empty(0, dtype=numpy.int64)
+
+    def lookup(self, gnd, roles=None):
+        """
+        Returns where a GND occurs.
+        :param str gnd: the GND, e.g. '(DE-588)118656503'.
+        :param [str]|None roles: if given, only postings with these roles (of ROLES).
+        :return: [(str, str)] (record id, role) pairs, by record number.
+        """
+        records, role_codes = self.postings(gnd, roles)
+        return list(zip(self.get_record_ids(records), [ROLES[code] for code in role_codes]))
@@ -0,0 +1,168 @@
+"""
+Low level access to ISO 2709 (Marc21 transmission format) data, without parsing records.
+"""
+from array import array
+
+LEADER_LENGTH = 24
+DIRECTORY_ENTRY_LENGTH = 12
+SUBFIELD_DELIMITER = b'\x1f'
+FIELD_TERMINATOR = b'\x1e'
+RECORD_TERMINATOR = b'\x1d'
+
+# Python 2 has no 'q', 'l' is 64 bit there on 64 bit Linux and macOS
+try:
+    array('q')
+    _OFFSET_TYPECODE = 'q'
+except ValueError:
+    _OFFSET_TYPECODE = 'l'
+
+
+def get_record_length(data, offset=0):
+    """
+    Reads the record length from the leader of the record starting at `offset`.
+    :param bytes|mmap.mmap data: ISO 2709 data.
+    :param int offset: start of the record.
+    :return: int
+    """
+    length = data[offset:offset + 5]
+    if len(length) < 5 or not length.isdigit():
+        raise ValueError('No valid record leader at byte offset {}'.format(offset))
+    return int(length)
+get_record_length.__annotations__ = {'offset': int, 'return': int}
+
+
+def scan_record_offsets(data):
+    """
+    Hops from leader to leader and returns the byte offset and length of every record.
+    Only the first five bytes of each record are looked at.
+    :param bytes|mmap.mmap data: ISO 2709 data, possibly holding many records.
+    :return: (array, array) offsets and lengths, one entry per record.
+    """
+    offsets = array(_OFFSET_TYPECODE)
+    lengths = array(_OFFSET_TYPECODE)
+
+    size = len(data)
+    offset = 0
+    while offset < size:
+        if data[offset:offset + 1] in (b'\r', b'\n'):
+            # some exports put line breaks between records
+            offset += 1
+            continue
+
+        length = get_record_length(data, offset)
+        if length < LEADER_LENGTH or offset + length > size:
+            raise ValueError('Record at byte offset {} has an invalid length of {}'.format(offset, length))
+
+        offsets.append(offset)
+        lengths.append(length)
+        offset += length
+
+    return offsets, lengths
+
+
+def get_control_field(data, tag, offset=0):
+    """
+    Returns the value of a control field (e.g. '001') of the record starting at `offset`,
+    reading only the leader, the directory and the field itself.
+    :param bytes|mmap.mmap data: ISO 2709 data.
+    :param str tag: the tag of the control field.
+    :param int offset: start of the record.
+    :return: str|None
+    """
+    base_address = int(data[offset + 12:offset + 17])
+    tag = tag.encode('ascii')
+
+    entry = offset + LEADER_LENGTH
+    end = offset + base_address - 1
+    while entry < end:
+        if data[entry:entry + 3] == tag:
+            length = int(data[entry + 3:entry + 7])
+            start = offset + base_address + int(data[entry + 7:entry + 12])
+            # the field terminator is not part of the value
+            return data[start:start + length - 1].decode('utf-8')
+        entry += DIRECTORY_ENTRY_LENGTH
+
+    return None
+get_control_field.__annotations__ = {'tag': str, 'offset': int}
+
+
+def _to_bytes(data):
+    # bytes() of a memoryview returns its repr on Python 2
+    return data.tobytes() if isinstance(data, memoryview) else data
+
+
+def iter_directory(record):
+    """
+    Reads the directory of a record and yields tag, start and length (including the field terminator) of every field.
+    :param bytes|memoryview record: the raw data of one record.
+    :return: iterator of (bytes, int, int)
+    """
+    leader = _to_bytes(record[:LEADER_LENGTH])
+    if len(leader) < LEADER_LENGTH or not leader[12:17].isdigit():
+        raise ValueError('No valid record leader')
+    base_address = int(leader[12:17])
+    if base_address <= LEADER_LENGTH or base_address > len(record):
+        raise ValueError('Invalid base address {}'.format(base_address))
+
+    directory = _to_bytes(record[LEADER_LENGTH:base_address - 1])
+    if len(directory) % DIRECTORY_ENTRY_LENGTH != 0:
+        raise ValueError('Invalid directory of length {}'.format(len(directory)))
+
+    for entry in range(0, len(directory), DIRECTORY_ENTRY_LENGTH):
+        length = int(directory[entry + 3:entry + 7])
+        start = base_address + int(directory[entry + 7:entry + 12])
+        if start + length > len(record):
+            raise ValueError('Field at directory entry {} exceeds the record'.format(entry // DIRECTORY_ENTRY_LENGTH))
+        yield directory[entry:entry + 3], start, length
+
+
+def read_records(stream):
+    """
+    Reads a binary stream record by record and yields the raw data of every record.
+    :param file stream: ISO 2709 data, opened in binary mode.
+    :return: iterator of bytes
+    """
+    offset = 0
+    while True:
+        head = stream.read(1)
+        if not head:
+            return
+        if head in (b'\r', b'\n'):
+            # some exports put line breaks between records
+            offset += 1
+            continue
+
+        head += stream.read(4)
+        length = get_record_length(head)
+        rest = stream.read(length - 5) if length > 5 else b''
+        if length < LEADER_LENGTH or len(rest) < length - 5:
+            raise ValueError('Record at byte offset {} has an invalid length of {}'.format(offset, length))
+
+        yield head + rest
+        offset += length
+
+
+def project_record(record, tags):
+    """
+    Returns a copy of a record that only holds its control fields (00X) and the data fields with the given tags.
+    Only the directory is read, the other fields are skipped without being decoded.
+    :param bytes record: the raw data of one record.
+    :param set tags: the tags of the data fields to keep.
+    :return: bytes
+    """
+    tags = frozenset(tag.encode('ascii') for tag in tags)
+
+    directory = []
+    fields = []
+    position = 0
+    for tag, start, length in iter_directory(record):
+        if tag.startswith(b'00') or tag in tags:
+            fields.append(record[start:start + length])
+            directory.append(tag + ('%04d%05d' % (length, position)).encode('ascii'))
+            position += length
+
+    base_address = LEADER_LENGTH + DIRECTORY_ENTRY_LENGTH * len(directory) + 1
+    leader = ('%05d' % (base_address + position + 1)).encode('ascii') + record[5:12] + \
+        ('%05d' % base_address).encode('ascii') + record[17:LEADER_LENGTH]
+    return b''.join([leader] + directory + [FIELD_TERMINATOR] + fields + [RECORD_TERMINATOR])
+project_record.__annotations__ = {'record': bytes, 'return': bytes}
@@ -0,0 +1,191 @@
+"""
+On-disk cache of raw responses (e.g. of AlephX), stored in an SQLite file.
+
+Entries are keyed by the request URL (which holds the base URL and the system number) and point to
+content addressed blobs (SHA-256 of the response), so identical responses are stored only once.
+Entries expire after a time to live, and the total size of the blobs is capped by evicting the least recently used entries.
+"""
+import hashlib
+import sqlite3
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    hash TEXT NOT NULL REFERENCES blobs (hash),
+    stored REAL NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_hash ON entries (hash);
+"""
+
+
+class ResponseCache(object):
+    """
+    Caches raw responses in an SQLite file.
+    Can be used as a context manager, which closes the file on exit.
+    The cache may be used from another thread than the one that created it (e.g. by `aio.fetch_records`),
+    but only by one thread at a time.
+    :param str path: the path of the SQLite file, created if it does not exist.
+    :param float|None ttl: seconds an entry stays valid, None for no expiry. Can be overridden per entry.
+    :param int|None max_size: the maximum total size of the stored responses in bytes, None for no limit.
+    """
+    def __init__(self, path, ttl=None, max_size=None):
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        self.__db.execute('PRAGMA journal_mode=WAL')
+        self.__db.execute('PRAGMA synchronous=NORMAL')
+        self.__db.executescript(_SCHEMA)
+        self.__size = self.__get_size()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.__db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def __contains__(self, key):
+        row = self.__db.execute('SELECT expires FROM entries WHERE key = ?', (key,)).fetchone()
+        return row is not None and not self.__is_expired(row[0])
+
+    def close(self):
+        """
+        Closes the SQLite file.
+        """
+        self.__db.close()
+
+    def size(self):
+        """
+        :return: int the total size of the stored responses in bytes.
+        """
+        return self.__size
+
+    def stats(self):
+        """
+        :return: dict hits, misses, hit rate, evictions, entries and size.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': float(self.hits) / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self),
+            'size': self.__size,
+        }
+
+    def get(self, key):
+        """
+        Returns the cached response for a key, or None if there is none or it has expired.
+        :param str key: the key, e.g. the request URL.
+        :return: bytes|None
+        """
+        row = self.__db.execute('SELECT entries.expires, blobs.data FROM entries JOIN blobs USING (hash) '
+                                'WHERE entries.key = ?', (key,)).fetchone()
+        if row is None or self.__is_expired(row[0]):
+            if row is not None:
+                self.__delete_entries([key])
+                self.__db.commit()
+            self.misses += 1
+            return None
+
+        with self.__db:
+            self.__db.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+        self.hits += 1
+        return bytes(row[1])
+
+    def put(self, key, data, ttl=None):
+        """
+        Stores a response, replacing the entry for the key if there is one.
+        Evicts the least recently used entries if the size limit is exceeded.
+        :param str key: the key, e.g. the request URL.
+        :param bytes data: the response.
+        :param float|None ttl: seconds the entry stays valid, defaults to the `ttl` of the cache.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+
+        with self.__db:
+            self.__delete_entries([key])
+            if self.__db.execute('SELECT 1 FROM blobs WHERE hash = ?', (digest,)).fetchone() is None:
+                self.__db.execute('INSERT INTO blobs (hash, data, size) VALUES (?, ?, ?)',
+                                  (digest, sqlite3.Binary(data), len(data)))
+                self.__size += len(data)
+            self.__db.execute('INSERT INTO entries (key, hash, stored, expires, accessed) VALUES (?, ?, ?, ?, ?)',
+                              (key, digest, now, now + ttl if ttl is not None else None, now))
+
+            if self.max_size is not None and self.__size > self.max_size:
+                self.__evict()
+
+    def clear(self):
+        """
+        Removes all entries and responses. The counters are kept.
+        """
+        with self.__db:
+            self.__db.execute('DELETE FROM entries')
+            self.__db.execute('DELETE FROM blobs')
+        self.__size = 0
+
+    def purge_expired(self):
+        """
+        Removes all expired entries.
+        :return: int the number of entries removed.
+        """
+        with self.__db:
+            keys = [row[0] for row in self.__db.execute(
+                'SELECT key FROM entries WHERE expires IS NOT NULL AND expires <= ?', (time.time(),))]
+            self.__delete_entries(keys)
+        return len(keys)
+
+    @staticmethod
+    def __is_expired(expires):
+        return expires is not None and expires <= time.time()
+
+    def __get_size(self):
+        return self.__db.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def __delete_entries(self, keys):
+        """
+        Deletes entries and the responses that are no longer referenced. Must be called within a transaction.
+        """
+        for key in keys:
+            row = self.__db.execute('SELECT hash FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                continue
+            self.__db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            if self.__db.execute('SELECT 1 FROM entries WHERE hash = ? LIMIT 1', (row[0],)).fetchone() is None:
+                size = self.__db.execute('SELECT size FROM blobs WHERE hash = ?', (row[0],)).fetchone()[0]
+                self.__db.execute('DELETE FROM blobs WHERE hash = ?', (row[0],))
+                self.__size -= size
+
+    def __evict(self):
+        """
+        Deletes the least recently used entries until the size limit is met. Must be called within a transaction.
+        """
+        while self.__size > self.max_size:
+            keys = [row[0] for row in self.__db.execute('SELECT key FROM entries ORDER BY accessed LIMIT 64')]
+            if not keys:
+                break
+            for key in keys:
+                if self.__size <= self.max_size:
+                    break
+                self.__delete_entries([key])
+                self.evictions += 1
@@ -0,0 +1,173 @@
+"""
+Incremental synchronisation of a corpus with a new Marc21 or MarcXML dump.
+
+A manifest keeps, per Aleph system number (controlfield 001), the date and time of the latest transaction
+(controlfield 005) and a hash of the raw record as found in the last dump. A new dump is scanned record by record
+without parsing; only records that are new or whose 005 or content has changed are parsed and passed to the getters.
+Records of the manifest that are missing from the dump are reported as deleted.
+
+    for change in sync('export.mrc', 'export.manifest'):
+        print(change.kind, change.sysno)
+"""
+import collections
+import hashlib
+import mmap
+import os
+
+from . import diagnostics as _diagnostics
+from . import iso2709
+from ._storage import replace_atomically
+from .sysnoindex import FORMAT_MARC21, FORMAT_MARCXML, detect_format, scan_marc21, scan_marcxml, \
+    get_marcxml_control_field, get_xml_namespaces, wrap_marcxml_record
+
+CHANGE_ADDED = 'added'
+CHANGE_CHANGED = 'changed'
+CHANGE_DELETED = 'deleted'
+
+Change = collections.namedtuple('Change', ['kind', 'sysno', 'timestamp', 'data'])
+Change.__doc__ = """
+A record that has been added, changed or deleted since the last synchronisation.
+:param str kind: CHANGE_ADDED, CHANGE_CHANGED or CHANGE_DELETED.
+:param str sysno: the system number (controlfield 001).
+:param str|None timestamp: the date and time of the latest transaction (controlfield 005), None if the record has none.
+For deleted records, the one of the last synchronisation.
+:param dict|None data: the results of all getters as plain data (see `to_dict`), None for deleted records.
+"""
+
+
+class Manifest(object):
+    """
+    The system numbers, 005 and content hashes of the records of the last synchronised dump.
+    It is stored as a text file with one tab separated line per record.
+    :param str path: the path of the manifest file.
+    :param dict|None entries: system number -> (005, hash).
+    """
+    def __init__(self, path, entries=None):
+        self.path = path
+        self.entries = entries if entries is not None else {}
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a manifest file.
+        :param str path: the path of the manifest file. If it does not exist, the manifest is empty.
+        :return: Manifest
+        """
+        entries = {}
+        if os.path.exists(path):
+            with open(path, 'r') as manifest_file:
+                for line in manifest_file:
+                    sysno, timestamp, content_hash = line.rstrip('\n').split('\t')
+                    entries[sysno] = (timestamp or None, content_hash)
+        return cls(path, entries)
+    load.__annotations__ = {'path': str}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, sysno):
+        return sysno in self.entries
+
+    def get(self, sysno):
+        """
+        :param str sysno: the system number.
+        :return: (str|None, str)|None 005 and content hash of the record, None if it is not in the manifest.
+        """
+        return self.entries.get(sysno)
+
+    def save(self):
+        """
+        Writes the manifest, sorted by system number.
+        """
+        # an interrupted run keeps the previous manifest
+        with replace_atomically(self.path, 'w') as manifest_file:
+            for sysno in sorted(self.entries):
+                timestamp, content_hash = self.entries[sysno]
+                manifest_file.write('{}\t{}\t{}\n'.format(sysno, timestamp or '', content_hash))
+
+
+def _get_marc21_timestamp(data, offset, length):
+    return iso2709.get_control_field(data, '005', offset)
+
+
+def _get_marcxml_timestamp(data, offset, length):
+    return get_marcxml_control_field(data, '005', offset, length)
+
+
+def _get_reader(dump_format, record, dump_path, reader_class, xml_namespaces):
+    if dump_format == FORMAT_MARCXML:
+        from .alephmarcxmlreader import AlephMarcXMLReader
+        reader_class = reader_class or AlephMarcXMLReader
+        record = wrap_marcxml_record(record, xml_namespaces)
+    else:
+        from .alephmarc21reader import AlephMarc21Reader
+        reader_class = reader_class or AlephMarc21Reader
+    # only the fields read by the getters are parsed
+    return reader_class.from_bytes(record, dump_path, tags=reader_class.GETTER_TAGS)
+
+
+def sync(dump_path, manifest_path, dump_format=None, reader_class=None):
+    """
+    Compares a dump with the manifest of the last synchronisation and yields the changes.
+
+    Only new and changed records are parsed. Records without a system number in controlfield 001 are skipped
+    and reported to the default diagnostics sink. So are new and changed records that cannot be read:
+    they are tried again on the next run. Once all changes have been yielded, the manifest is replaced
+    by the one of the new dump; if the iteration is not completed, the previous manifest is kept.
+    :param str dump_path: the path to the Marc21 or MarcXML dump.
+    :param str manifest_path: the path of the manifest, created on the first run (when all records are new).
+    :param str|None dump_format: FORMAT_MARC21 or FORMAT_MARCXML, detected from the data if not given.
+    :param type|None reader_class: the reader for changed records, defaults to `AlephMarc21Reader` or
+    `AlephMarcXMLReader`. Must provide `from_bytes`, e.g. `AlephMarc21RawReader`.
+    :return: iterator of Change, the added and changed records in dump order, then the deleted ones.
+    """
+    manifest = Manifest.load(manifest_path)
+    current = Manifest(manifest_path)
+
+    with open(dump_path, 'rb') as dump_file:
+        size = os.fstat(dump_file.fileno()).st_size
+        data = mmap.mmap(dump_file.fileno(), 0, access=mmap.ACCESS_READ) if size > 0 else b''
+        try:
+            if dump_format is None:
+                dump_format = detect_format(data)
+            xml_namespaces = None
+            if dump_format == FORMAT_MARCXML:
+                scan, get_timestamp = scan_marcxml, _get_marcxml_timestamp
+                xml_namespaces = get_xml_namespaces(data)
+            else:
+                scan, get_timestamp = scan_marc21, _get_marc21_timestamp
+
+            for sysno, offset, length in scan(data):
+                if not sysno:
+                    _diagnostics.get_default().report(_diagnostics.ISSUE_NO_SYSTEM_NUMBER, dump_path, '001',
+                                                      detail=offset)
+                    continue
+
+                record = data[offset:offset + length]
+                entry = (get_timestamp(data, offset, length), hashlib.sha256(record).hexdigest())
+
+                previous = manifest.get(sysno)
+                if previous == entry:
+                    current.entries[sysno] = entry
+                    continue
+                try:
+                    record_data = _get_reader(dump_format, record, dump_path, reader_class, xml_namespaces).to_dict()
+                except Exception as e:
+                    # the manifest keeps the previous state of the record, so that it is tried again on the next run
+                    _diagnostics.get_default().report(_diagnostics.ISSUE_PARSE_ERROR, dump_path,
+                                                      detail="Reading record " + sysno + " failed: " + str(e) +
+                                                      " for file_path: " + dump_path + "\n")
+                    if previous is not None:
+                        current.entries[sysno] = previous
+                    continue
+                current.entries[sysno] = entry
+                yield Change(CHANGE_ADDED if previous is None else CHANGE_CHANGED, sysno, entry[0], record_data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    for sysno in sorted(set(manifest.entries) - set(current.entries)):
+        yield Change(CHANGE_DELETED, sysno, manifest.get(sysno)[0], None)
+
+    current.save()
+sync.__annotations__ = {'dump_path': str, 'manifest_path': str}
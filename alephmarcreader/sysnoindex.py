@@ -0,0 +1,294 @@
+"""
+Persistent sidecar index from Aleph system number (controlfield 001) to the position of the record in a dump file.
+
+The index is built by scanning a Marc21 or MarcXML dump once. It is written next to the dump
+(`<dump>.sysidx`) as a sorted array of fixed size entries and is memory mapped and binary searched on lookup.
+It is rebuilt automatically when the size or modification time of the dump changes.
+"""
+import mmap
+import os
+import re
+import struct
+
+from . import diagnostics as _diagnostics
+from . import iso2709
+from ._storage import replace_atomically
+
+FORMAT_MARC21 = 'marc21'
+FORMAT_MARCXML = 'marcxml'
+
+INDEX_SUFFIX = '.sysidx'
+
+# magic, size of the dump, mtime of the dump (ns), number of entries
+_HEADER = struct.Struct('<8sqqq')
+_MAGIC = b'AMRSYS01'
+
+# system number, byte offset, length
+_ENTRY = struct.Struct('<Qqq')
+
+_XML_RECORD_START = re.compile(br'<(?:[\w.-]+:)?record[\s>]')
+_XML_RECORD_END = re.compile(br'</(?:[\w.-]+:)?record\s*>')
+_XML_NAMESPACE = re.compile(br'\s(xmlns(?::[\w.-]+)?)\s*=\s*("[^"]*"|\'[^\']*\')')
+
+# compiled patterns of the control fields, by tag
+_XML_CONTROL_FIELDS = {}
+
+# the namespaces a record cut out of a collection relies on if the dump does not declare them
+_XML_DEFAULT_NAMESPACES = {b'xmlns': b'"http://www.loc.gov/MARC21/slim"',
+                           b'xmlns:marc': b'"http://www.loc.gov/MARC21/slim"'}
+_XML_WRAPPER_END = b'</collection>'
+
+
+def detect_format(data):
+    """
+    Guesses the format of a dump from its first bytes.
+    :param bytes|mmap.mmap data: the dump.
+    :return: str either FORMAT_MARCXML or FORMAT_MARC21.
+    """
+    head = data[:64].lstrip()
+    if head.startswith(b'<') or head.startswith(b'\xef\xbb\xbf'):
+        return FORMAT_MARCXML
+    return FORMAT_MARC21
+
+
+def get_xml_namespaces(data):
+    """
+    Returns the namespace declarations of the elements enclosing the first record of a MarcXML dump,
+    e.g. of its `<collection>`, which a record cut out of the dump may rely on.
+    :param bytes|mmap.mmap data: the dump.
+    :return: {bytes: bytes} the quoted namespace URIs by attribute name, e.g. `b'xmlns:marc'`.
+    """
+    start = _XML_RECORD_START.search(data)
+    if start is None:
+        return {}
+    return dict(_XML_NAMESPACE.findall(data[:start.start()]))
+get_xml_namespaces.__annotations__ = {'return': {bytes: bytes}}
+
+
+def wrap_marcxml_record(record, namespaces=None):
+    """
+    Wraps a record cut out of a MarcXML dump into a collection, so that it can be parsed on its own.
+    :param bytes record: the raw `<record>` element, e.g. from `scan_marcxml`.
+    :param dict|None namespaces: the namespace declarations of the dump (see `get_xml_namespaces`).
+    The MARC21 slim namespace is declared as default and as `marc` unless they override it.
+    :return: bytes
+    """
+    declarations = dict(_XML_DEFAULT_NAMESPACES)
+    declarations.update(namespaces or {})
+    return b''.join([b'<collection'] + [b' ' + name + b'=' + uri for name, uri in sorted(declarations.items())] +
+                    [b'>', record, _XML_WRAPPER_END])
+wrap_marcxml_record.__annotations__ = {'record': bytes, 'return': bytes}
+
+
+def get_marcxml_control_field(data, tag, offset, length):
+    """
+    Returns the data of the first control field with the given tag of a record in a MarcXML dump, without parsing it.
+    :param bytes|mmap.mmap data: the dump.
+    :param str tag: the tag of the control field, e.g. '001'.
+    :param int offset: the byte offset of the record.
+    :param int length: the length of the record in bytes.
+    :return: str|None
+    """
+    pattern = _XML_CONTROL_FIELDS.get(tag)
+    if pattern is None:
+        # the tag may follow other attributes
+        pattern = _XML_CONTROL_FIELDS[tag] = re.compile(
+            br'<(?:[\w.-]+:)?controlfield\s(?:[^>]*?\s)?tag\s*=\s*["\']' + tag.encode('ascii') +
+            br'["\'][^>]*(?<!/)>\s*([^<]*?)\s*<')
+    field = pattern.search(data, offset, offset + length)
+    return field.group(1).decode('utf-8') if field else None
+get_marcxml_control_field.__annotations__ = {'tag': str, 'offset': int, 'length': int}
+
+
+def scan_marc21(data):
+    """
+    Yields (system number, offset, length) for every record of a Marc21 dump, without parsing the records.
+    :param bytes|mmap.mmap data: the dump.
+    :return: iterator of (str|None, int, int)
+    """
+    offsets, lengths = iso2709.scan_record_offsets(data)
+    for offset, length in zip(offsets, lengths):
+        yield iso2709.get_control_field(data, '001', offset), offset, length
+
+
+def scan_marcxml(data):
+    """
+    Yields (system number, offset, length) for every record of a MarcXML dump, without parsing the records.
+    :param bytes|mmap.mmap data: the dump.
+    :return: iterator of (str|None, int, int)
+    """
+    pos = 0
+    while True:
+        start = _XML_RECORD_START.search(data, pos)
+        if start is None:
+            return
+        end = _XML_RECORD_END.search(data, start.end())
+        if end is None:
+            raise ValueError('Unterminated record at byte offset {}'.format(start.start()))
+
+        yield get_marcxml_control_field(data, '001', start.start(), end.end() - start.start()), \
+            start.start(), end.end() - start.start()
+        pos = end.end()
+
+
+def _get_dump_signature(dump_path):
+    stat = os.stat(dump_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def build_index(dump_path, dump_format=None, index_path=None):
+    """
+    Scans a dump once and writes the sidecar index.
+    Records without a numeric system number in controlfield 001 are skipped and reported to the default diagnostics sink.
+    :param str dump_path: the path to the Marc21 or MarcXML dump.
+    :param str|None dump_format: FORMAT_MARC21 or FORMAT_MARCXML, detected from the data if not given.
+    :param str|None index_path: the path of the index, defaults to the dump path with suffix `.sysidx`.
+    :return: str the path of the index.
+    """
+    if index_path is None:
+        index_path = dump_path + INDEX_SUFFIX
+
+    size, mtime = _get_dump_signature(dump_path)
+
+    entries = []
+    with open(dump_path, 'rb') as dump_file:
+        data = mmap.mmap(dump_file.fileno(), 0, access=mmap.ACCESS_READ) if size > 0 else b''
+        try:
+            if dump_format is None:
+                dump_format = detect_format(data)
+            scan = scan_marcxml if dump_format == FORMAT_MARCXML else scan_marc21
+
+            for sysno, offset, length in scan(data):
+                if sysno is None or not sysno.isdigit():
+                    _diagnostics.get_default().report(_diagnostics.ISSUE_NO_SYSTEM_NUMBER, dump_path, '001',
+                                                      detail=offset)
+                    continue
+                entries.append((int(sysno), offset, length))
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    entries.sort()
+
+    with replace_atomically(index_path) as index_file:
+        index_file.write(_HEADER.pack(_MAGIC, size, mtime, len(entries)))
+        for entry in entries:
+            index_file.write(_ENTRY.pack(*entry))
+
+    return index_path
+build_index.__annotations__ = {'dump_path': str, 'return': str}
+
+
+def _is_up_to_date(dump_path, index_path):
+    if not os.path.exists(index_path):
+        return False
+    with open(index_path, 'rb') as index_file:
+        header = index_file.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return False
+    magic, size, mtime, count = _HEADER.unpack(header)
+    return magic == _MAGIC and (size, mtime) == _get_dump_signature(dump_path)
+
+
+class SystemNumberIndex(object):
+    """
+    Looks up records in a dump by their Aleph system number.
+
+    Opening the index (re)builds the sidecar index if it is missing or the dump has changed.
+    Can be used as a context manager, which closes the files on exit.
+    :param str dump_path: the path to the Marc21 or MarcXML dump.
+    :param str|None dump_format: FORMAT_MARC21 or FORMAT_MARCXML, detected from the data if not given.
+    :param str|None index_path: the path of the index, defaults to the dump path with suffix `.sysidx`.
+    """
+    def __init__(self, dump_path, dump_format=None, index_path=None):
+        self._dump_path = dump_path
+        self.__index_path = index_path if index_path is not None else dump_path + INDEX_SUFFIX
+
+        if not _is_up_to_date(dump_path, self.__index_path):
+            build_index(dump_path, dump_format, self.__index_path)
+
+        self.__index_file = open(self.__index_path, 'rb')
+        self.__index = mmap.mmap(self.__index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__count = _HEADER.unpack_from(self.__index, 0)[3]
+
+        self.__dump_file = open(dump_path, 'rb')
+        self.__dump = mmap.mmap(self.__dump_file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if os.path.getsize(dump_path) > 0 else b''
+        self.__dump_format = dump_format if dump_format is not None else detect_format(self.__dump)
+        self.__xml_namespaces = get_xml_namespaces(self.__dump) if self.__dump_format == FORMAT_MARCXML else None
+
+    def __len__(self):
+        return self.__count
+
+    def __contains__(self, sysno):
+        return self.get_offset(sysno) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the memory maps and the files.
+        """
+        for data in (self.__index, self.__dump):
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self.__index_file.close()
+        self.__dump_file.close()
+
+    def __get_sysno(self, n):
+        return _ENTRY.unpack_from(self.__index, _HEADER.size + n * _ENTRY.size)[0]
+
+    def get_offset(self, sysno):
+        """
+        Returns byte offset and length of the record with the given system number.
+        :param str|int sysno: the system number, e.g. '000055275'.
+        :return: (int, int)|None None if there is no record with the system number.
+        """
+        # records without a numeric system number are not indexed
+        if not isinstance(sysno, int) and not sysno.isdigit():
+            return None
+        sysno = int(sysno)
+
+        low, high = 0, self.__count
+        while low < high:
+            mid = (low + high) // 2
+            if self.__get_sysno(mid) < sysno:
+                low = mid + 1
+            else:
+                high = mid
+
+        if low < self.__count and self.__get_sysno(low) == sysno:
+            return _ENTRY.unpack_from(self.__index, _HEADER.size + low * _ENTRY.size)[1:]
+        return None
+
+    def get_record_bytes(self, sysno):
+        """
+        Returns the raw data of the record with the given system number.
+        :param str|int sysno: the system number, e.g. '000055275'.
+        :return: bytes
+        """
+        position = self.get_offset(sysno)
+        if position is None:
+            raise KeyError(sysno)
+        offset, length = position
+        return self.__dump[offset:offset + length]
+
+    def lookup(self, sysno):
+        """
+        Returns a reader for the record with the given system number. Only this record is parsed.
+        :param str|int sysno: the system number, e.g. '000055275'.
+        :return: AlephMarc21Reader|AlephMarcXMLReader
+        """
+        data = self.get_record_bytes(sysno)
+
+        if self.__dump_format == FORMAT_MARCXML:
+            from .alephmarcxmlreader import AlephMarcXMLReader
+            return AlephMarcXMLReader.from_bytes(wrap_marcxml_record(data, self.__xml_namespaces),
+                                                 self._dump_path)
+        else:
+            from .alephmarc21reader import AlephMarc21Reader
+            return AlephMarc21Reader.from_bytes(data, self._dump_path)
@@ -0,0 +1,223 @@
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+from alephmarcreader import AlephXReader
+from alephmarcreader.aio import fetch_records, ProtocolError, StaleConnectionError
+from alephmarcreader.responsecache import ResponseCache
+
+SAMPLE_DATA = 'alephmarcreader/tests/sample_data/AlephX'
+SYSNOS = sorted(name[:-len('.xml')] for name in os.listdir(SAMPLE_DATA) if name.startswith('0'))
+
+
+class StubAlephX(ThreadingMixIn, HTTPServer):
+    """
+    Serves the AlephX sample files as `find-doc` responses.
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StubAlephXHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = []
+        # system number -> statuses to respond with before the record is served
+        self.failures = {}
+        # system number -> seconds to wait before each response
+        self.delays = {}
+        # close every connection after the response, without announcing it
+        self.drop_connections = False
+        # system number -> raw (malformed) responses to send before the record is served
+        self.raw_responses = {}
+
+    def handle_error(self, request, client_address):
+        # clients that time out close the connection before the response is written
+        pass
+
+
+class StubAlephXHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        sysno = query['doc_num'][0]
+        assert query['op'] == ['find-doc']
+
+        with self.server.lock:
+            self.server.requests.append(sysno)
+            failures = self.server.failures.get(sysno)
+            status = failures.pop(0) if failures else 200
+            delays = self.server.delays.get(sysno)
+            delay = delays.pop(0) if delays else 0
+            raw_responses = self.server.raw_responses.get(sysno)
+            raw_response = raw_responses.pop(0) if raw_responses else None
+        time.sleep(delay)
+
+        if raw_response is not None:
+            self.wfile.write(raw_response)
+            self.close_connection = True
+            return
+
+        path = os.path.join(SAMPLE_DATA, sysno + '.xml')
+        if status != 200:
+            body = b''
+        elif os.path.exists(path):
+            with open(path, 'rb') as data_file:
+                body = data_file.read()
+        else:
+            body = (u'<?xml version = "1.0" encoding = "UTF-8"?>\n<find-doc>'
+                    u'<error>Document: {} was not found in the database.</error></find-doc>'.format(sysno)).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_connections:
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'requires asyncio.run')
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.server = StubAlephX()
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.base_url = 'http://127.0.0.1:{}/X'.format(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def fetch(self, sysnos, **kwargs):
+        return asyncio.run(fetch_records(sysnos, self.base_url, **kwargs))
+
+    def test_fetch_records(self):
+        results = self.fetch(SYSNOS * 3, concurrency=2)
+
+        self.assertEqual([result.sysno for result in results], SYSNOS * 3)
+        self.assertTrue(all(result.error is None for result in results))
+        for result in results:
+            expected = AlephXReader(os.path.join(SAMPLE_DATA, result.sysno + '.xml'))
+            self.assertEqual(result.reader.to_dict(), expected.to_dict())
+
+        # connections are kept alive and reused
+        self.assertEqual(len(self.server.requests), len(SYSNOS) * 3)
+        self.assertTrue(self.server.connections <= 2)
+
+    def test_retry(self):
+        self.server.failures = {'000055275': [503, 500], '000056870': [404]}
+
+        results = self.fetch(['000055275', '000056870', '000000001'], retries=2, backoff=0.01)
+
+        self.assertEqual(results[0].error, None)
+        self.assertEqual(results[0].reader.get_date(), [u'1734.03.12'])
+        self.assertEqual(self.server.requests.count('000055275'), 3)
+
+        # not retried
+        self.assertEqual(results[1].reader, None)
+        self.assertTrue(results[1].error.startswith('HTTP status 404'))
+        self.assertEqual(self.server.requests.count('000056870'), 1)
+
+        self.assertTrue('Document: 000000001 was not found' in results[2].error)
+
+    def test_retries_exhausted(self):
+        self.server.failures = {'000055275': [503, 503, 503]}
+
+        result = self.fetch(['000055275'], retries=1, backoff=0.01)[0]
+
+        self.assertEqual(result.reader, None)
+        self.assertTrue(result.error.startswith('HTTP status 503'))
+        self.assertEqual(self.server.requests.count('000055275'), 2)
+
+    def test_stale_connection(self):
+        self.server.drop_connections = True
+
+        # the idle connection has been closed by the server: retried right away on a new connection
+        results = self.fetch(SYSNOS[:2], concurrency=1, retries=1, backoff=10)
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertEqual(self.server.requests, SYSNOS[:2])
+
+        # the retry counts
+        results = self.fetch(SYSNOS[:2], concurrency=1, retries=0)
+        self.assertEqual(results[0].error, None)
+        self.assertTrue(results[1].error.startswith(StaleConnectionError.__name__))
+
+    def test_timeout(self):
+        # a timeout on a reused connection is retried like any other timeout
+        self.server.delays = {'000056870': [0.5, 0.5]}
+
+        results = self.fetch(['000055275', '000056870'], concurrency=1, retries=1, backoff=0.01, timeout=0.2)
+        self.assertEqual(results[0].error, None)
+        self.assertTrue(results[1].error.startswith('TimeoutError'))
+        self.assertEqual(self.server.requests.count('000056870'), 2)
+
+    def test_malformed_response(self):
+        self.server.raw_responses = {
+            '000055275': [b'garbage\r\n\r\n'],
+            '000056870': [b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n'] * 2,
+        }
+
+        # retried on a new connection, the other system numbers are not affected
+        results = self.fetch(['000055275', '000056870', '000054774'], retries=1, backoff=0.01)
+        self.assertEqual(results[0].error, None)
+        self.assertEqual(results[0].reader.get_date(), [u'1734.03.12'])
+        self.assertEqual(results[1].reader, None)
+        self.assertTrue(results[1].error.startswith(ProtocolError.__name__))
+        self.assertTrue('chunk size' in results[1].error)
+        self.assertEqual(results[2].error, None)
+        self.assertEqual(self.server.requests.count('000056870'), 2)
+
+    def test_negative_retries(self):
+        self.assertRaises(ValueError, self.fetch, ['000055275'], retries=-1)
+
+    def test_cache(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            with ResponseCache(os.path.join(tmp_dir, 'responses.sqlite')) as cache:
+                cold = self.fetch(SYSNOS + ['000000001'], cache=cache)
+                self.assertEqual(len(self.server.requests), len(SYSNOS) + 1)
+                self.assertEqual(cache.misses, len(SYSNOS) + 1)
+
+                # warm run: no requests at all, the same results
+                warm = self.fetch(SYSNOS + ['000000001'], cache=cache)
+                self.assertEqual(len(self.server.requests), len(SYSNOS) + 1)
+                self.assertEqual(cache.hits, len(SYSNOS) + 1)
+
+                self.assertEqual([result.reader.to_dict() for result in warm[:-1]],
+                                 [result.reader.to_dict() for result in cold[:-1]])
+                self.assertEqual(warm[-1].error, cold[-1].error)
+
+                # responses of other endpoints are not mixed up
+                self.fetch(['000055275'], cache=cache, library='DSV01')
+                self.assertEqual(len(self.server.requests), len(SYSNOS) + 2)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_connection_refused(self):
+        self.tearDown()
+
+        result = self.fetch(['000055275'], retries=1, backoff=0.01)[0]
+        self.assertEqual(result.reader, None)
+        self.assertTrue(result.error.startswith('ConnectionRefusedError'))
+
+
+if __name__ == '__main__':
+    unittest.main()
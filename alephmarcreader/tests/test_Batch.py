@@ -0,0 +1,47 @@
+import glob
+import json
+import unittest
+
+from alephmarcreader import AlephXReader
+from alephmarcreader.batch import extract_many, FORMAT_ALEPHX, FORMAT_MARC21
+
+
+class TestMethods(unittest.TestCase):
+    def test_extract_many(self):
+        paths = sorted(glob.glob('alephmarcreader/tests/sample_data/AlephX/0*.xml'))
+        paths.insert(2, 'alephmarcreader/tests/sample_data/AlephX/does_not_exist.xml')
+
+        calls = []
+        results = list(extract_many(paths, FORMAT_ALEPHX, workers=2, chunksize=3,
+                                    progress=lambda done, total: calls.append((done, total))))
+
+        self.assertEqual([result.path for result in results], paths)
+        self.assertEqual(calls[-1], (8, 8))
+
+        failed = results[2]
+        self.assertEqual(failed.data, None)
+        self.assertTrue('does_not_exist.xml' in failed.error)
+
+        data = results[0].data
+        self.assertEqual(data, AlephXReader(paths[0]).to_dict())
+        self.assertEqual(data['author'][0]['name'], u'Bernoulli, Nicolaus')
+        self.assertEqual(data['author'][0]['type'], u'Person')
+
+        # results are plain data
+        json.dumps([result.data for result in results])
+
+    def test_extract_many_unordered(self):
+        paths = sorted(glob.glob('alephmarcreader/tests/sample_data/Marc21/0*.marc'))
+
+        results = list(extract_many(paths, FORMAT_MARC21, workers=2, chunksize=1, ordered=False))
+
+        self.assertEqual(sorted(result.path for result in results), paths)
+        self.assertTrue(all(result.error is None for result in results))
+
+    def test_in_process(self):
+        paths = sorted(glob.glob('alephmarcreader/tests/sample_data/AlephX/0*.xml'))
+
+        results = list(extract_many(paths, FORMAT_ALEPHX, workers=1))
+
+        self.assertEqual(len(results), 7)
+        self.assertRaises(ValueError, lambda: list(extract_many(paths, 'pdf')))
@@ -0,0 +1,84 @@
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from alephmarcreader import AlephMarcXMLReader
+from alephmarcreader.tests.test_SystemNumberIndex import write_marcxml_dump
+
+try:
+    import numpy
+    from alephmarcreader import columnar
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'requires NumPy')
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        paths = sorted(glob.glob('alephmarcreader/tests/sample_data/MarcXML/0*.xml'))
+        self.readers = [AlephMarcXMLReader(path) for path in paths]
+        self.corpus = columnar.build(self.readers)
+
+    def test_build(self):
+        corpus = self.corpus
+
+        self.assertEqual(len(corpus), 7)
+        self.assertEqual(corpus['record_id'][1], u'000055275')
+
+        # authors and recipients share one GND dictionary
+        self.assertEqual(list(corpus.decode('author_gnd', corpus.values('author_gnd', 1))), [u'(DE-588)118656503'])
+        self.assertEqual(list(corpus.decode('recipient_gnd', corpus.values('recipient_gnd', 2))),
+                         [u'(DE-588)1085854191', u'(DE-588)1087006392'])
+
+        for n, reader in enumerate(self.readers):
+            self.assertEqual(list(corpus.decode('language', corpus.values('language', n))), reader.get_language())
+
+        self.assertEqual(list(corpus.decode('institution', corpus.first('institution'))).count(u'Basel UB'), 6)
+
+    def test_dates(self):
+        corpus = self.corpus
+
+        start = corpus.first('date_start')
+        self.assertEqual(start[1], numpy.datetime64('1734-03-12'))
+        self.assertEqual(corpus.first('date_end')[1], numpy.datetime64('1734-03-12'))
+        self.assertEqual(corpus.first('date_start_precision')[1], columnar.PRECISION_DAY)
+
+        # 1744--1782: year precision, covering the whole years
+        self.assertEqual(start[5], numpy.datetime64('1744-01-01'))
+        self.assertEqual(corpus.first('date_end')[5], numpy.datetime64('1782-12-31'))
+        self.assertEqual(corpus.first('date_end_precision')[5], columnar.PRECISION_YEAR)
+
+        # vectorized filtering
+        in_1720s = (start >= numpy.datetime64('1720-01-01')) & (start < numpy.datetime64('1730-01-01'))
+        self.assertEqual(list(corpus['record_id'][in_1720s]), [u'000054774', u'000059552'])
+
+    def test_dump(self):
+        """
+        Tests that the records of a dump get their system numbers as record ids, not the name of the dump.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            dump_path = os.path.join(tmp_dir, 'collection.xml')
+            write_marcxml_dump(dump_path, ['000055275', '000056870', '000054774'])
+
+            corpus = columnar.build(AlephMarcXMLReader.iter_records(dump_path))
+            self.assertEqual(list(corpus['record_id']), [u'000055275', u'000056870', u'000054774'])
+            self.assertEqual(corpus.first('date_start')[1], numpy.datetime64('1703-08-27'))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_save_load(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'corpus.npz')
+            self.corpus.save(path)
+
+            loaded = columnar.Corpus.load(path)
+
+            self.assertEqual(sorted(loaded.arrays), sorted(self.corpus.arrays))
+            for name, array in self.corpus.arrays.items():
+                self.assertTrue(numpy.array_equal(loaded[name], array), name)
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -0,0 +1,163 @@
+import datetime
+import glob
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from alephmarcreader import AlephXReader, AlephMarc21Reader
+from alephmarcreader import dateindex
+from alephmarcreader.dateindex import DateIndex, DateIndexBuilder
+from alephmarcreader.tests.test_SystemNumberIndex import write_marc21_dump
+
+StandardizedDate = AlephXReader.StandardizedDate
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'corpus.dateidx')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def build_samples(self):
+        paths = sorted(glob.glob('alephmarcreader/tests/sample_data/AlephX/0*.xml'))
+        self.assertEqual(dateindex.build((AlephXReader(path, tags=AlephXReader.GETTER_TAGS) for path in paths),
+                                         self.path), len(paths))
+
+    def test_queries(self):
+        self.build_samples()
+
+        with DateIndex(self.path) as index:
+            self.assertEqual(index.record_count, 7)
+            self.assertEqual(len(index), 7)
+
+            def record_ids(records):
+                return index.get_record_ids(records)
+
+            self.assertEqual(record_ids(index.overlapping(datetime.date(1720, 1, 1), datetime.date(1725, 12, 31))),
+                             ['000054774', '000059552'])
+            self.assertEqual(record_ids(index.overlapping(datetime.date(1724, 11, 21), datetime.date(1724, 11, 21))),
+                             ['000054774'])
+            self.assertEqual(record_ids(index.overlapping(datetime.date(1760, 1, 1), datetime.date(1800, 1, 1))),
+                             ['000234529', '000307927'])
+            self.assertEqual(record_ids(index.overlapping(datetime.date(1800, 1, 1), datetime.date(1700, 1, 1))), [])
+
+            # year precision spans cover the whole years
+            self.assertEqual(record_ids(index.containing(datetime.date(1744, 1, 1))), ['000234529'])
+            self.assertEqual(record_ids(index.containing(datetime.date(1782, 12, 31))), ['000234529'])
+            self.assertEqual(record_ids(index.containing(datetime.date(1783, 1, 1))), [])
+            self.assertEqual(record_ids(index.containing(datetime.date(1763, 3, 26))), ['000234529', '000307927'])
+
+            self.assertEqual(record_ids(index.within(datetime.date(1700, 1, 1), datetime.date(1770, 1, 1))),
+                             ['000054774', '000055275', '000056870', '000059552', '000059794', '000307927'])
+            self.assertEqual(record_ids(index.covering(datetime.date(1750, 1, 1), datetime.date(1760, 1, 1))),
+                             ['000234529'])
+            self.assertEqual(record_ids(index.covering(datetime.date(1750, 1, 1), datetime.date(1790, 1, 1))), [])
+
+    def test_precision(self):
+        builder = DateIndexBuilder()
+        builder.add('year', [StandardizedDate(u'1705', False)])
+        builder.add('month', [StandardizedDate(u'1705.09', False)])
+        builder.add('day', [StandardizedDate(u'1705-09-23', False)])
+        builder.add('months', [StandardizedDate(u'1705-02', u'1705-03')])
+        builder.add('invalid', [StandardizedDate(u'17xx', False), StandardizedDate(u'1705', u'1704')])
+        builder.add('none', [])
+        builder.write(self.path)
+
+        with DateIndex(self.path) as index:
+            self.assertEqual(index.record_count, 6)
+            # dates that cannot be parsed or end before they start are left out
+            self.assertEqual(len(index), 4)
+            self.assertEqual(list(index.containing(datetime.date(1705, 9, 1))), [0, 1])
+            self.assertEqual(list(index.containing(datetime.date(1705, 9, 23))), [0, 1, 2])
+            self.assertEqual(list(index.containing(datetime.date(1705, 2, 28))), [0, 3])
+            self.assertEqual(list(index.within(datetime.date(1705, 9, 1), datetime.date(1705, 9, 30))), [1, 2])
+            self.assertEqual(list(index.covering(datetime.date(1705, 2, 1), datetime.date(1705, 3, 31))), [0, 3])
+
+    def test_same_as_scan(self):
+        """
+        Tests random queries against a scan of all dates.
+        """
+        randomness = random.Random(42)
+
+        def random_span():
+            year = randomness.randint(1600, 1800)
+            return randomness.choice([u'{}'.format(year), u'{}.{:02d}'.format(year, randomness.randint(1, 12)),
+                                      u'{}-{:02d}-{:02d}'.format(year, randomness.randint(1, 12),
+                                                                 randomness.randint(1, 28))])
+
+        def get_range(span):
+            parts = [int(part) for part in span.replace('.', '-').split('-')]
+            first = datetime.date(parts[0], parts[1] if len(parts) > 1 else 1, parts[2] if len(parts) > 2 else 1)
+            if len(parts) == 3:
+                return first.toordinal(), first.toordinal()
+            if len(parts) == 2:
+                following = datetime.date(parts[0] + parts[1] // 12, parts[1] % 12 + 1, 1)
+            else:
+                following = datetime.date(parts[0] + 1, 1, 1)
+            return first.toordinal(), following.toordinal() - 1
+
+        builder = DateIndexBuilder()
+        ranges = []
+        for record in range(2000):
+            dates = []
+            for _ in range(randomness.randint(0, 2)):
+                start = random_span()
+                end = random_span() if randomness.random() < 0.3 else False
+                first, last = get_range(start)
+                if end:
+                    last = get_range(end)[1]
+                if first <= last:
+                    dates.append(StandardizedDate(start, end))
+                    ranges.append((record, first, last))
+            builder.add(str(record), dates)
+        builder.write(self.path)
+
+        def scan(matches):
+            return sorted(set(record for record, first, last in ranges if matches(first, last)))
+
+        with DateIndex(self.path) as index:
+            self.assertEqual(len(index), len(ranges))
+            for _ in range(200):
+                first = randomness.randint(datetime.date(1590, 1, 1).toordinal(), datetime.date(1810, 1, 1).toordinal())
+                last = first + randomness.choice([0, 1, 31, 365, 3000])
+                self.assertEqual(list(index.containing(first)), scan(lambda a, b: a <= first <= b))
+                self.assertEqual(list(index.overlapping(first, last)), scan(lambda a, b: a <= last and b >= first))
+                self.assertEqual(list(index.within(first, last)), scan(lambda a, b: a >= first and b <= last))
+                self.assertEqual(list(index.covering(first, last)), scan(lambda a, b: a <= first and b >= last))
+
+    def test_record_ids(self):
+        dump_path = os.path.join(self.tmp_dir, 'dump.mrc')
+        write_marc21_dump(dump_path, ['000055275', '000056870'])
+
+        # the system numbers are used as record ids
+        dateindex.build(AlephMarc21Reader.iter_records(dump_path, tags=AlephMarc21Reader.GETTER_TAGS), self.path)
+        with DateIndex(self.path) as index:
+            self.assertEqual(index.get_record_ids(index.overlapping(datetime.date(1700, 1, 1),
+                                                                    datetime.date(1740, 1, 1))),
+                             ['000055275', '000056870'])
+
+        dateindex.build(AlephMarc21Reader.iter_records(dump_path), self.path, record_ids=['a', 'b'])
+        with DateIndex(self.path) as index:
+            self.assertEqual(index.get_record_ids(index.containing(datetime.date(1703, 8, 27))), ['b'])
+
+    def test_empty(self):
+        DateIndexBuilder().write(self.path)
+
+        with DateIndex(self.path) as index:
+            self.assertEqual(len(index), 0)
+            self.assertEqual(index.record_count, 0)
+            self.assertEqual(list(index.overlapping(datetime.date(1700, 1, 1), datetime.date(1800, 1, 1))), [])
+            self.assertEqual(list(index.containing(datetime.date(1700, 1, 1))), [])
+
+    def test_not_an_index(self):
+        with open(self.path, 'wb') as index_file:
+            index_file.write(b'not an index')
+        self.assertRaises(ValueError, DateIndex, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
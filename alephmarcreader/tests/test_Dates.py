@@ -0,0 +1,56 @@
+import datetime
+import glob
+import unittest
+
+from alephmarcreader import AlephMarcXMLReader
+from alephmarcreader.abstractalephmarcreader import AbstractAlephMarcReader
+
+try:
+    import numpy
+    from alephmarcreader import dates
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'requires NumPy')
+class TestMethods(unittest.TestCase):
+    def test_parse(self):
+        spans = dates.DateSpans.parse([u'1705', u'1705.09', u'1705-09-23', u'1705-02-30', u'17x5', u'1705-13'],
+                                      [False, u'1706', u'1705-09-29', None, None, u''])
+
+        self.assertEqual(list(spans.start_precision), [dates.PRECISION_YEAR, dates.PRECISION_MONTH, dates.PRECISION_DAY,
+                                                       dates.PRECISION_INVALID, dates.PRECISION_INVALID,
+                                                       dates.PRECISION_INVALID])
+        self.assertEqual(list(spans.end_precision), [dates.PRECISION_NONE, dates.PRECISION_YEAR, dates.PRECISION_DAY,
+                                                     dates.PRECISION_NONE, dates.PRECISION_NONE, dates.PRECISION_NONE])
+
+        # year and month precision spans cover the whole year or month
+        self.assertEqual(spans.start[0], datetime.date(1705, 1, 1).toordinal())
+        self.assertEqual(spans.end[0], datetime.date(1705, 12, 31).toordinal())
+        self.assertEqual(spans.start[1], datetime.date(1705, 9, 1).toordinal())
+        self.assertEqual(spans.end[1], datetime.date(1706, 12, 31).toordinal())
+        self.assertEqual(spans.end[2], datetime.date(1705, 9, 29).toordinal())
+
+        self.assertEqual(list(spans.is_valid()), [True, True, True, False, False, False])
+
+    def test_iso8601(self):
+        """
+        Tests that the parsed dates match `get_standardized_date_string_ISO8601`.
+        """
+        std_dates = [AbstractAlephMarcReader.StandardizedDate(start, end) for start, end in [
+            (u'1705', False), (u'1705.09', u'1706'), (u'1705.09.23', u'1705.09.29'), (u'0999.12', False)]]
+        for path in glob.glob('alephmarcreader/tests/sample_data/MarcXML/0*.xml'):
+            std_dates.extend(AlephMarcXMLReader(path).get_standardized_date())
+
+        spans = dates.DateSpans.from_standardized_dates(std_dates)
+
+        self.assertEqual(list(spans.to_iso8601()), [date.get_standardized_date_string_ISO8601() for date in std_dates])
+
+    def test_overlapping(self):
+        spans = dates.DateSpans.parse([u'1705-09-23', u'1720', u'1733-02', u'1726'], [None, u'1725', None, u'1730'])
+
+        may_be_in_1725 = spans.overlapping(datetime.date(1725, 1, 1), datetime.date(1725, 12, 31))
+        self.assertEqual(list(may_be_in_1725), [False, True, False, False])
+
+        start, end = spans.to_datetime64()
+        self.assertEqual(end[2], numpy.datetime64('1733-02-28'))
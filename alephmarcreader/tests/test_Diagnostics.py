@@ -0,0 +1,130 @@
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+
+from alephmarcreader import AlephMarcXMLReader, AlephMarc21Reader
+from alephmarcreader import diagnostics
+from alephmarcreader.batch import extract_many, FORMAT_MARCXML
+
+WRONG_CARDINALITY = 'alephmarcreader/tests/sample_data/MarcXML/wrong_cardinality.xml'
+KEY = ('046', 'c', diagnostics.ISSUE_CARDINALITY)
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.previous = sys.stderr
+        sys.stderr = self.catch_err = StringIO()
+
+    def tearDown(self):
+        sys.stderr = self.previous
+
+    def test_default(self):
+        AlephMarcXMLReader(WRONG_CARDINALITY).get_date()
+        self.assertEqual(self.catch_err.getvalue(), u'!!! WARNING: In \'{}\', Field \'046\', Subfield \'c\': '
+                                                    u'Expected maximum 1 Subfield, found 2.\n'.format(WRONG_CARDINALITY))
+
+    def test_aggregate(self):
+        sink = diagnostics.AggregateDiagnostics()
+
+        marcxml_rd = AlephMarcXMLReader(WRONG_CARDINALITY)
+        marcxml_rd.diagnostics = sink
+        self.assertEqual(marcxml_rd.get_date(), [u'1763.03.26'])
+        marcxml_rd.get_date()
+
+        self.assertEqual(self.catch_err.getvalue(), u'')
+        self.assertEqual(sink.counts[KEY], 2)
+        self.assertEqual(sink.total(), 2)
+        self.assertEqual(sink.samples[KEY], [WRONG_CARDINALITY])
+
+        out = StringIO()
+        sink.write_summary(out)
+        self.assertEqual(out.getvalue(), u'2 x cardinality in Field \'046\', Subfield \'c\', '
+                                         u'e.g. in \'{}\'\n'.format(WRONG_CARDINALITY))
+
+    def test_silent(self):
+        previous = diagnostics.set_default('silent')
+        try:
+            AlephMarcXMLReader(WRONG_CARDINALITY).get_date()
+        finally:
+            diagnostics.set_default(previous)
+        self.assertEqual(self.catch_err.getvalue(), u'')
+
+    def test_rate_limited(self):
+        sink = diagnostics.create('rate-limited', limit=1)
+
+        marcxml_rd = AlephMarcXMLReader(WRONG_CARDINALITY)
+        marcxml_rd.diagnostics = sink
+        for i in range(3):
+            marcxml_rd.get_date()
+
+        self.assertEqual(self.catch_err.getvalue().count(u'!!! WARNING'), 1)
+        self.assertEqual(sink.counts[KEY], 3)
+
+    def test_logging(self):
+        marcxml_rd = AlephMarcXMLReader(WRONG_CARDINALITY)
+        marcxml_rd.diagnostics = diagnostics.LoggingDiagnostics()
+
+        with self.assertLogs('alephmarcreader', logging.WARNING) as logs:
+            marcxml_rd.get_date()
+        self.assertEqual(len(logs.records), 1)
+        self.assertTrue(u'Expected maximum 1 Subfield, found 2.' in logs.output[0])
+        self.assertEqual(self.catch_err.getvalue(), u'')
+
+    def test_unknown_mode(self):
+        self.assertRaises(ValueError, diagnostics.create, 'loud')
+
+    def test_parse_error(self):
+        sink = diagnostics.AggregateDiagnostics()
+
+        AlephMarcXMLReader.diagnostics = sink
+        try:
+            self.assertRaises(Exception, AlephMarcXMLReader, 'alephmarcreader/tests/sample_data/MarcXML/missing.xml')
+        finally:
+            AlephMarcXMLReader.diagnostics = None
+
+        self.assertEqual(sink.counts[(None, None, diagnostics.ISSUE_PARSE_ERROR)], 1)
+        self.assertEqual(self.catch_err.getvalue(), u'')
+
+    def test_iter_records_parse_error(self):
+        """
+        Tests that a malformed record in a Marc21 file is reported, with and without a tag projection.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            dump_path = os.path.join(tmp_dir, 'dump.mrc')
+            with open('alephmarcreader/tests/sample_data/Marc21/000055275.marc', 'rb') as marc_file:
+                data = marc_file.read()
+            with open(dump_path, 'wb') as dump:
+                dump.write(data + b'xxxxx' + data[5:])
+
+            for tags in (None, AlephMarc21Reader.GETTER_TAGS):
+                sink = diagnostics.AggregateDiagnostics()
+                AlephMarc21Reader.diagnostics = sink
+                try:
+                    records = AlephMarc21Reader.iter_records(dump_path, tags=tags)
+                    next(records)
+                    self.assertRaises(Exception, next, records)
+                finally:
+                    AlephMarc21Reader.diagnostics = None
+                self.assertEqual(sink.counts[(None, None, diagnostics.ISSUE_PARSE_ERROR)], 1)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_batch(self):
+        paths = [WRONG_CARDINALITY, 'alephmarcreader/tests/sample_data/MarcXML/000055275.xml'] * 3
+        sink = diagnostics.AggregateDiagnostics()
+
+        results = list(extract_many(paths, FORMAT_MARCXML, workers=2, chunksize=2, diagnostics=sink))
+
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertEqual(sink.counts[KEY], 3)
+        self.assertEqual(sink.samples[KEY], [WRONG_CARDINALITY])
+        self.assertEqual(self.catch_err.getvalue(), u'')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import datetime
+import glob
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from alephmarcreader import AlephXReader, AlephMarc21Reader
+from alephmarcreader.export import sqlite as export_sqlite
+from alephmarcreader.tests.test_SystemNumberIndex import write_marc21_dump
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'corpus.sqlite')
+        self.paths = sorted(glob.glob('alephmarcreader/tests/sample_data/AlephX/0*.xml'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def export_samples(self, batch_size=10000):
+        readers = (AlephXReader(path, tags=AlephXReader.GETTER_TAGS) for path in self.paths)
+        return export_sqlite.export(readers, self.path, batch_size=batch_size)
+
+    def query(self, sql, *parameters):
+        db = sqlite3.connect(self.path)
+        try:
+            return db.execute(sql, parameters).fetchall()
+        finally:
+            db.close()
+
+    def test_export(self):
+        self.assertEqual(self.export_samples(), 7)
+
+        self.assertEqual(self.query('SELECT record_id FROM records ORDER BY id'),
+                         [(os.path.basename(path)[:-len('.xml')],) for path in self.paths])
+
+        # the rows are the same as the results of the getters
+        for path in self.paths:
+            reader = AlephXReader(path)
+            record_id = os.path.basename(path)[:-len('.xml')]
+            authors = self.query("SELECT c.name, c.gnd FROM correspondents c JOIN records r ON r.id = c.record "
+                                 "WHERE r.record_id = ? AND c.relation = 'author' ORDER BY c.position", record_id)
+            self.assertEqual(authors, [(author.name, author.gnd or None) for author in reader.get_author()])
+            shelfmarks = self.query("SELECT s.identifier FROM shelfmarks s JOIN records r ON r.id = s.record "
+                                    "WHERE r.record_id = ? ORDER BY s.position", record_id)
+            self.assertEqual(shelfmarks, [(shelfmark.identifier,) for shelfmark in reader.get_shelfmark()])
+            remarks = self.query("SELECT m.text FROM remarks m JOIN records r ON r.id = m.record "
+                                 "WHERE r.record_id = ? AND m.kind = 'general_remarks' ORDER BY m.position", record_id)
+            self.assertEqual(remarks, [(remark,) for remark in reader.get_general_remarks()])
+
+        self.assertEqual(self.query("SELECT r.record_id, cr.role FROM correspondents c "
+                                    "JOIN correspondent_roles cr ON cr.correspondent = c.id "
+                                    "JOIN records r ON r.id = c.record "
+                                    "WHERE c.gnd = '(DE-588)118656503' AND c.relation = 'author' ORDER BY r.id"),
+                         [('000055275', 'aut'), ('000234529', 'aut')])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM places WHERE gnd = '(DE-588)4004617-5'"), [(3,)])
+
+    def test_dates(self):
+        self.export_samples()
+
+        self.assertEqual(self.query("SELECT d.start_span, d.end_span, d.start_day, d.end_day FROM dates d "
+                                    "JOIN records r ON r.id = d.record WHERE r.record_id = '000234529'"),
+                         [('1744', '1782', datetime.date(1744, 1, 1).toordinal(),
+                           datetime.date(1782, 12, 31).toordinal())])
+
+        first = datetime.date(1724, 1, 1).toordinal()
+        last = datetime.date(1734, 12, 31).toordinal()
+        self.assertEqual(self.query('SELECT r.record_id FROM dates d JOIN records r ON r.id = d.record '
+                                    'WHERE d.start_day <= ? AND d.end_day >= ? ORDER BY r.id', last, first),
+                         [('000054774',), ('000055275',), ('000059552',)])
+
+    def test_batches(self):
+        """
+        Tests that the result does not depend on the size of the batches.
+        """
+        self.export_samples(batch_size=1000)
+        tables = [name for name, in self.query("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        expected = dict((table, self.query('SELECT * FROM {}'.format(table))) for table in tables)
+        os.remove(self.path)
+
+        self.export_samples(batch_size=2)
+        for table in expected:
+            self.assertEqual(self.query('SELECT * FROM {}'.format(table)), expected[table])
+
+    def test_append(self):
+        self.export_samples()
+        self.assertEqual(self.export_samples(), 7)
+
+        self.assertEqual(self.query('SELECT COUNT(*), COUNT(DISTINCT id), COUNT(DISTINCT record_id) FROM records'),
+                         [(14, 14, 7)])
+        self.assertEqual(self.query('SELECT COUNT(DISTINCT id) FROM correspondents'),
+                         self.query('SELECT COUNT(*) FROM correspondents'))
+
+        indexes = set(name for name, in self.query("SELECT name FROM sqlite_master WHERE type = 'index'"))
+        self.assertTrue(set(export_sqlite.INDEXES) <= indexes)
+
+    def test_iter_records(self):
+        dump_path = os.path.join(self.tmp_dir, 'dump.mrc')
+        write_marc21_dump(dump_path, ['000055275', '000056870'])
+
+        count = export_sqlite.export(AlephMarc21Reader.iter_records(dump_path, tags=AlephMarc21Reader.GETTER_TAGS),
+                                     self.path)
+        self.assertEqual(count, 2)
+        self.assertEqual(self.query('SELECT record_id, timestamp FROM records ORDER BY id'),
+                         [('000055275', '20180718120700.0'), ('000056870', '20180717202900.0')])
+
+        os.remove(self.path)
+        with export_sqlite.SQLiteExporter(self.path) as exporter:
+            for record_id, reader in zip(['a', 'b'], AlephMarc21Reader.iter_records(dump_path)):
+                exporter.add(reader, record_id)
+        self.assertEqual(self.query('SELECT record_id FROM records ORDER BY id'), [('a',), ('b',)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from alephmarcreader import AlephXReader
+from alephmarcreader import extractioncache
+from alephmarcreader.batch import extract_many, FORMAT_ALEPHX
+from alephmarcreader.extractioncache import ExtractionCache
+
+SAMPLE_DATA = 'alephmarcreader/tests/sample_data/AlephX'
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'extracted.sqlite')
+
+        # copies, so that they can be changed
+        self.files = []
+        for sample in sorted(glob.glob(os.path.join(SAMPLE_DATA, '0*.xml'))):
+            self.files.append(os.path.join(self.tmp_dir, os.path.basename(sample)))
+            shutil.copy(sample, self.files[-1])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_extract(self):
+        with ExtractionCache(self.path) as cache:
+            cold = [cache.extract(path, FORMAT_ALEPHX) for path in self.files]
+            self.assertEqual(cache.stats()['misses'], len(self.files))
+            self.assertEqual(cache.stats()['entries'], len(self.files))
+
+        # persisted
+        with ExtractionCache(self.path) as cache:
+            warm = [cache.extract(path, FORMAT_ALEPHX) for path in self.files]
+            self.assertEqual(cache.stats()['hits'], len(self.files))
+            self.assertEqual(cache.stats()['hit_rate'], 1.0)
+
+        self.assertEqual(warm, cold)
+        self.assertEqual(warm[0], AlephXReader(self.files[0]).to_dict())
+
+    def test_changed_file(self):
+        path = self.files[0]
+
+        with ExtractionCache(self.path) as cache:
+            self.assertEqual(cache.get(path, FORMAT_ALEPHX), None)
+            cache.extract(path, FORMAT_ALEPHX)
+
+            # only the modification time has changed: the content hash is still known
+            stat = os.stat(path)
+            os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+            self.assertEqual(cache.get(path, FORMAT_ALEPHX)['date'], [u'1724.11.21'])
+
+            # the content has changed
+            shutil.copy(self.files[1], path)
+            self.assertEqual(cache.get(path, FORMAT_ALEPHX), None)
+            self.assertEqual(cache.extract(path, FORMAT_ALEPHX)['date'], [u'1734.03.12'])
+
+            # files with the same content share the result
+            self.assertEqual(cache.get(self.files[1], FORMAT_ALEPHX)['date'], [u'1734.03.12'])
+
+            # other formats are cached separately
+            self.assertEqual(cache.get(path, 'marcxml'), None)
+
+    def test_schema_version(self):
+        with ExtractionCache(self.path) as cache:
+            cache.extract(self.files[0], FORMAT_ALEPHX)
+
+        version = extractioncache.SCHEMA_VERSION
+        extractioncache.SCHEMA_VERSION = version + 1
+        try:
+            with ExtractionCache(self.path) as cache:
+                self.assertEqual(cache.get(self.files[0], FORMAT_ALEPHX), None)
+                self.assertEqual(len(cache), 0)
+        finally:
+            extractioncache.SCHEMA_VERSION = version
+
+    def test_clear(self):
+        with ExtractionCache(self.path) as cache:
+            cache.extract(self.files[0], FORMAT_ALEPHX)
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+            self.assertEqual(cache.get(self.files[0], FORMAT_ALEPHX), None)
+
+    def test_extract_many(self):
+        paths = self.files[:]
+        paths.insert(2, os.path.join(self.tmp_dir, 'does_not_exist.xml'))
+
+        with ExtractionCache(self.path) as cache:
+            cold = list(extract_many(paths, FORMAT_ALEPHX, workers=1, cache=cache))
+            # the missing file is not looked up
+            self.assertEqual(cache.misses, len(paths) - 1)
+
+            with open(self.files[0], 'ab') as data_file:
+                data_file.write(b'\n')
+
+            calls = []
+            warm = list(extract_many(paths, FORMAT_ALEPHX, workers=1, cache=cache,
+                                     progress=lambda done, total: calls.append((done, total))))
+            # only the changed and the missing file are extracted
+            self.assertEqual(cache.hits, len(paths) - 2)
+            self.assertEqual(calls[-1], (len(paths), len(paths)))
+
+        self.assertEqual([result.path for result in warm], paths)
+        self.assertEqual(warm, cold)
+        self.assertTrue('does_not_exist.xml' in warm[2].error)
+
+    def test_extract_many_unordered(self):
+        with ExtractionCache(self.path) as cache:
+            list(extract_many(self.files[:3], FORMAT_ALEPHX, workers=2, cache=cache))
+            results = list(extract_many(self.files, FORMAT_ALEPHX, workers=2, ordered=False, cache=cache))
+
+            self.assertEqual(cache.hits, 3)
+            self.assertEqual(sorted(result.path for result in results), self.files)
+            self.assertTrue(all(result.error is None for result in results))
+            self.assertEqual(len(cache), len(self.files))
+
+
+if __name__ == '__main__':
+    unittest.main()
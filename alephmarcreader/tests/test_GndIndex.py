@@ -0,0 +1,118 @@
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from alephmarcreader import AlephXReader, AlephMarc21Reader
+from alephmarcreader import gndindex
+from alephmarcreader.gndindex import GndIndex, GndIndexBuilder
+from alephmarcreader.tests.test_SystemNumberIndex import write_marc21_dump
+
+BERNOULLI_DANIEL = '(DE-588)118656503'
+BERNOULLI_JOHANN = '(DE-588)118509969'
+BASEL = '(DE-588)4004617-5'
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'corpus.gndidx')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def build_samples(self):
+        paths = sorted(glob.glob('alephmarcreader/tests/sample_data/AlephX/0*.xml'))
+        self.assertEqual(gndindex.build((AlephXReader(path, tags=AlephXReader.GETTER_TAGS) for path in paths),
+                                        self.path), len(paths))
+
+    def test_lookup(self):
+        self.build_samples()
+
+        with GndIndex(self.path) as index:
+            self.assertEqual(index.record_count, 7)
+            self.assertEqual(len(index), 30)
+            self.assertTrue(BERNOULLI_DANIEL in index)
+            self.assertFalse('(DE-588)000000000' in index)
+
+            self.assertEqual(index.lookup(BERNOULLI_DANIEL),
+                             [('000054774', 'rcp'), ('000055275', 'aut'), ('000234529', 'aut')])
+            self.assertEqual(index.lookup(BERNOULLI_DANIEL, roles=['aut']),
+                             [('000055275', 'aut'), ('000234529', 'aut')])
+            self.assertEqual(index.lookup(BASEL), [('000054774', '751'), ('000055275', '751'), ('000056870', '751')])
+            self.assertEqual(index.lookup('(DE-588)000000000'), [])
+
+    def test_same_as_getters(self):
+        """
+        Tests that the index holds the same postings as the getters of each record.
+        """
+        paths = sorted(glob.glob('alephmarcreader/tests/sample_data/AlephX/0*.xml'))
+        self.build_samples()
+
+        with GndIndex(self.path) as index:
+            for path in paths:
+                record_id = os.path.basename(path)[:-len('.xml')]
+                for gnd, role in gndindex.get_gnd_roles(AlephXReader(path)):
+                    self.assertTrue((record_id, role) in index.lookup(gnd))
+
+    def test_intersect(self):
+        self.build_samples()
+
+        with GndIndex(self.path) as index:
+            records = index.intersect(BERNOULLI_JOHANN, BASEL)
+            self.assertEqual(index.get_record_ids(records), ['000054774', '000055275', '000056870'])
+
+            records = index.intersect((BERNOULLI_JOHANN, ['aut']), BASEL)
+            self.assertEqual(index.get_record_ids(records), ['000056870'])
+
+            self.assertEqual(len(index.intersect(BERNOULLI_DANIEL, '(DE-588)000000000')), 0)
+            self.assertEqual(len(index.intersect()), 0)
+
+    def test_record_ids(self):
+        dump_path = os.path.join(self.tmp_dir, 'dump.mrc')
+        write_marc21_dump(dump_path, ['000055275', '000056870'])
+
+        # the system numbers are used as record ids
+        gndindex.build(AlephMarc21Reader.iter_records(dump_path, tags=AlephMarc21Reader.GETTER_TAGS), self.path)
+        with GndIndex(self.path) as index:
+            self.assertEqual(index.lookup(BASEL), [('000055275', '751'), ('000056870', '751')])
+
+        gndindex.build(AlephMarc21Reader.iter_records(dump_path), self.path, record_ids=['a', 'b'])
+        with GndIndex(self.path) as index:
+            self.assertEqual(index.lookup(BASEL), [('a', '751'), ('b', '751')])
+
+    def test_builder(self):
+        builder = GndIndexBuilder()
+        for n in range(3000):
+            builder.add(str(n), [('g%d' % (n % 7), 'aut'), ('g%d' % (n % 7), 'aut'), ('all', 'rcp'), ('all', '600')])
+        builder.add('empty', [])
+        builder.write(self.path)
+
+        with GndIndex(self.path) as index:
+            self.assertEqual(index.record_count, 3001)
+            # duplicate postings are dropped
+            self.assertEqual(index.lookup('g3')[:2], [('3', 'aut'), ('10', 'aut')])
+            self.assertEqual(len(index.records('g3')), len(range(3, 3000, 7)))
+
+            records, role_codes = index.postings('all')
+            self.assertEqual(len(records), 6000)
+            self.assertEqual(list(index.records('all', roles=['600'])), list(range(3000)))
+            self.assertEqual(list(index.intersect('g1', 'g2')), [])
+
+    def test_empty(self):
+        GndIndexBuilder().write(self.path)
+
+        with GndIndex(self.path) as index:
+            self.assertEqual(len(index), 0)
+            self.assertEqual(index.record_count, 0)
+            self.assertEqual(index.lookup(BASEL), [])
+
+    def test_not_an_index(self):
+        with open(self.path, 'wb') as index_file:
+            index_file.write(b'not an index')
+        self.assertRaises(ValueError, GndIndex, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+import unittest
+
+import alephmarcreader
+
+
+def get_loaded(statement):
+    """
+    Returns which of lxml and pymarc are loaded after running a statement in a fresh interpreter.
+    """
+    output = subprocess.check_output([sys.executable, '-c', statement + '; import sys; '
+                                      'print(" ".join(name for name in ("lxml", "pymarc") if name in sys.modules))'],
+                                     universal_newlines=True)
+    return output.split()
+
+
+class TestMethods(unittest.TestCase):
+    @unittest.skipIf(sys.version_info < (3, 7), 'requires a module level __getattr__')
+    def test_lazy_imports(self):
+        self.assertEqual(get_loaded('import alephmarcreader'), [])
+        self.assertEqual(get_loaded('from alephmarcreader import AlephMarc21Reader'), ['pymarc'])
+        self.assertEqual(get_loaded('from alephmarcreader import AlephXReader'), ['lxml'])
+        self.assertEqual(get_loaded('from alephmarcreader import AlephMarc21RawReader'), [])
+        self.assertEqual(get_loaded('from alephmarcreader import AlephMarcXMLReader, AlephMarc21Dump'),
+                         ['lxml', 'pymarc'])
+
+    def test_names(self):
+        from alephmarcreader.alephmarcxmlreader import AlephMarcXMLReader
+
+        self.assertTrue(alephmarcreader.AlephMarcXMLReader is AlephMarcXMLReader)
+        self.assertTrue('AlephMarc21Reader' in dir(alephmarcreader))
+        self.assertRaises(AttributeError, getattr, alephmarcreader, 'AlephReader')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from alephmarcreader import AlephMarc21RawReader, AlephMarc21Reader
+from alephmarcreader import diagnostics
+
+SAMPLE_PATHS = sorted(glob.glob('alephmarcreader/tests/sample_data/Marc21/0*.marc'))
+
+
+class TestMethods(unittest.TestCase):
+    def test_same_as_pymarc(self):
+        """
+        Tests that the results of all getters are the same as those of the pymarc based reader.
+        """
+        for path in SAMPLE_PATHS:
+            self.assertEqual(AlephMarc21RawReader(path).to_dict(), AlephMarc21Reader(path).to_dict())
+
+    def test_getters(self):
+        marc21_rd = AlephMarc21RawReader('alephmarcreader/tests/sample_data/Marc21/000055275.marc')
+
+        author = marc21_rd.get_author()[0]
+        self.assertEqual(author.name, u'Bernoulli, Daniel,')
+        self.assertEqual(author.roles, [u'aut'])
+        self.assertEqual(marc21_rd.get_date(), [u'1734.03.12'])
+        self.assertEqual(marc21_rd.get_shelfmark()[0].institution, u'ZB Zürich')
+
+    def test_from_bytes(self):
+        with open(SAMPLE_PATHS[1], 'rb') as marc_file:
+            data = marc_file.read()
+
+        # data after the first record is ignored
+        marc21_rd = AlephMarc21RawReader.from_bytes(data + data)
+        self.assertEqual(marc21_rd.get_date(), [u'1734.03.12'])
+
+        marc21_rd = AlephMarc21RawReader.from_bytes(data, tags={'100'})
+        self.assertEqual(marc21_rd.get_author()[0].name, u'Bernoulli, Daniel,')
+        self.assertEqual(marc21_rd.get_date(), [])
+
+    def test_iter_records(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            dump_path = os.path.join(tmp_dir, 'dump.mrc')
+            with open(dump_path, 'wb') as dump:
+                for path in SAMPLE_PATHS:
+                    with open(path, 'rb') as marc_file:
+                        dump.write(marc_file.read())
+                    dump.write(b'\n')
+
+            self.assertEqual([rd.to_dict() for rd in AlephMarc21RawReader.iter_records(dump_path)],
+                             [AlephMarc21Reader(path).to_dict() for path in SAMPLE_PATHS])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_malformed(self):
+        with open(SAMPLE_PATHS[0], 'rb') as marc_file:
+            data = marc_file.read()
+
+        sink = diagnostics.AggregateDiagnostics()
+        AlephMarc21RawReader.diagnostics = sink
+        try:
+            # base address beyond the end of the data
+            self.assertRaises(ValueError, AlephMarc21RawReader.from_bytes, data[:12] + b'99999' + data[17:])
+            # field beyond the end of the record
+            self.assertRaises(ValueError, AlephMarc21RawReader.from_bytes, data[:-100])
+        finally:
+            AlephMarc21RawReader.diagnostics = None
+
+        self.assertEqual(sink.counts[(None, None, diagnostics.ISSUE_PARSE_ERROR)], 2)
+
+    def test_control_field(self):
+        """
+        Tests that the control fields are the same as those of the pymarc based reader.
+        """
+        for path in SAMPLE_PATHS:
+            raw = AlephMarc21RawReader(path, tags=AlephMarc21RawReader.GETTER_TAGS)
+            for tag in ['001', '003', '005', '008', '100']:
+                self.assertEqual(raw.control_field(tag), AlephMarc21Reader(path).control_field(tag))
+
+
+if __name__ == '__main__':
+    unittest.main()
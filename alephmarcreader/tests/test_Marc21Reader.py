@@ -1,6 +1,6 @@
 import unittest
 
-from alephmarcreader import AlephMarc21Reader
+from alephmarcreader import AlephMarc21Reader, AlephMarc21Dump
 
 class TestMethods(unittest.TestCase):
 
@@ -279,7 +279,181 @@ class TestMethods(unittest.TestCase):
         self.assertEqual(doc_states[0].prefix, u'Druck')
         self.assertEqual(doc_states[0].reference, u'Joh. I B. Briefe 1, p.444')
 
-
-
-
-
+    def test_iter_records(self):
+        """
+        Tests that all records of a Marc21 file holding several records are read.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        sysnos = ['000055275', '000056870', '000054774']
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            dump_path = os.path.join(tmp_dir, 'dump.mrc')
+            with open(dump_path, 'wb') as dump:
+                for sysno in sysnos:
+                    with open('alephmarcreader/tests/sample_data/Marc21/' + sysno + '.marc', 'rb') as marc_file:
+                        dump.write(marc_file.read())
+
+            marc21_rds = list(AlephMarc21Reader.iter_records(dump_path))
+
+            self.assertEqual(len(marc21_rds), 3)
+
+            for sysno, marc21_rd in zip(sysnos, marc21_rds):
+                single_rd = AlephMarc21Reader('alephmarcreader/tests/sample_data/Marc21/' + sysno + '.marc')
+
+                self.assertEqual([a.name for a in marc21_rd.get_author()], [a.name for a in single_rd.get_author()])
+                self.assertEqual(marc21_rd.get_date(), single_rd.get_date())
+                self.assertEqual([s.identifier for s in marc21_rd.get_shelfmark()],
+                                 [s.identifier for s in single_rd.get_shelfmark()])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_from_memory(self):
+        """
+        Tests that readers can be created from data that is already in memory.
+        """
+        path = 'alephmarcreader/tests/sample_data/Marc21/000055275.marc'
+
+        with open(path, 'rb') as data_file:
+            marc21_rd = AlephMarc21Reader.from_bytes(data_file.read())
+
+        self.assertEqual(marc21_rd.get_author()[0].name, u'Bernoulli, Daniel,')
+        self.assertEqual(marc21_rd.get_date(), [u'1734.03.12'])
+
+        import pymarc
+        with open(path, 'rb') as marc_file:
+            record = next(pymarc.MARCReader(marc_file, force_utf8=True, to_unicode=True))
+        marc21_rd = AlephMarc21Reader.from_record(record)
+        self.assertEqual(marc21_rd.get_author()[0].name, u'Bernoulli, Daniel,')
+
+    def test_dump(self):
+        """
+        Tests random access to the records of a memory mapped Marc21 file.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        sysnos = ['000055275', '000056870', '000054774']
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            dump_path = os.path.join(tmp_dir, 'dump.mrc')
+            with open(dump_path, 'wb') as dump:
+                for sysno in sysnos:
+                    with open('alephmarcreader/tests/sample_data/Marc21/' + sysno + '.marc', 'rb') as marc_file:
+                        dump.write(marc_file.read())
+                    # line breaks between records are tolerated
+                    dump.write(b'\n')
+
+            with AlephMarc21Dump(dump_path) as marc21_dump:
+                self.assertEqual(len(marc21_dump), 3)
+                self.assertEqual(marc21_dump.get_offset(0), (0, 1954))
+                self.assertEqual(marc21_dump.get_offset(1), (1955, 1538))
+
+                for n in [2, 0, 1]:
+                    single_rd = AlephMarc21Reader('alephmarcreader/tests/sample_data/Marc21/' + sysnos[n] + '.marc')
+                    self.assertEqual(marc21_dump.reader_at(n).get_date(), single_rd.get_date())
+
+                self.assertEqual(len(list(marc21_dump)), 3)
+
+            with open(dump_path, 'ab') as dump:
+                dump.write(b'01954ntm')
+
+            self.assertRaises(ValueError, AlephMarc21Dump, dump_path)
+
+            # the error of mapping the file is not masked
+            import mmap
+
+            class FailingMap(mmap.mmap):
+                def __new__(cls, *args, **kwargs):
+                    raise OSError('cannot map')
+            original, mmap.mmap = mmap.mmap, FailingMap
+            try:
+                self.assertRaises(OSError, AlephMarc21Dump, dump_path)
+            finally:
+                mmap.mmap = original
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_extract_all(self):
+        """
+        Tests that `extract_all` returns exactly what the individual getters return.
+        """
+        import glob
+
+        for path in glob.glob('alephmarcreader/tests/sample_data/Marc21/0*.marc'):
+            rd = AlephMarc21Reader(path)
+
+            extracted = rd.extract_all()
+
+            getters = [name for name in dir(rd) if name.startswith('get_')]
+            self.assertEqual(sorted(extracted), sorted(name[len('get_'):] for name in getters))
+
+            for name in getters:
+                self.assertEqual(rd._to_plain(extracted[name[len('get_'):]]), rd._to_plain(getattr(rd, name)()))
+
+            self.assertEqual(rd.to_dict()['author'][0]['type'], u'Person')
+
+    def test_projection(self):
+        """
+        Tests that readers keeping only `GETTER_TAGS` return the same results as readers of the complete record.
+        """
+        import glob
+        import os
+        import shutil
+        import tempfile
+
+        paths = sorted(glob.glob('alephmarcreader/tests/sample_data/Marc21/0*.marc'))
+
+        for path in paths:
+            self.assertEqual(AlephMarc21Reader(path, tags=AlephMarc21Reader.GETTER_TAGS).to_dict(), AlephMarc21Reader(path).to_dict())
+
+            with open(path, 'rb') as data_file:
+                self.assertEqual(AlephMarc21Reader.from_bytes(data_file.read(), tags=AlephMarc21Reader.GETTER_TAGS).to_dict(),
+                                 AlephMarc21Reader(path).to_dict())
+
+        # getters reading other tags return no results
+        rd = AlephMarc21Reader('alephmarcreader/tests/sample_data/Marc21/000055275.marc', tags={'100'})
+        self.assertEqual(rd.get_author()[0].name, u'Bernoulli, Daniel,')
+        self.assertEqual(rd.get_date(), [])
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            dump_path = os.path.join(tmp_dir, 'dump.mrc')
+            with open(dump_path, 'wb') as dump:
+                for path in paths:
+                    with open(path, 'rb') as marc_file:
+                        dump.write(marc_file.read())
+
+            projected = [rd.to_dict() for rd in AlephMarc21Reader.iter_records(dump_path, AlephMarc21Reader.GETTER_TAGS)]
+            self.assertEqual(projected, [rd.to_dict() for rd in AlephMarc21Reader.iter_records(dump_path)])
+            self.assertEqual(len(projected), len(paths))
+
+            # control fields are always kept
+            rd = next(AlephMarc21Reader.iter_records(dump_path, {'100'}))
+            self.assertEqual(rd._AlephMarc21Reader__record['005'].data, u'20180718104800.0')
+            self.assertEqual([field.tag for field in rd._AlephMarc21Reader__record.get_fields()
+                              if not field.is_control_field()], ['100'])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_control_field(self):
+        """
+        Tests the access to the control fields.
+        """
+        rd = AlephMarc21Reader('alephmarcreader/tests/sample_data/Marc21/000055275.marc',
+                               tags=AlephMarc21Reader.GETTER_TAGS)
+        self.assertEqual(rd.control_field('005'), u'20180718120700.0')
+        self.assertEqual(rd.control_field('003'), u'SzZuIDS')
+        self.assertEqual(rd.control_field('001'), None)
+        # data fields are not control fields
+        self.assertEqual(rd.control_field('100'), None)
+
+        # the samples have no system number, the file name is used as record id
+        self.assertEqual(rd.record_id(), u'000055275')
+        with open('alephmarcreader/tests/sample_data/Marc21/000055275.marc', 'rb') as marc_file:
+            self.assertEqual(AlephMarc21Reader.from_bytes(marc_file.read()).record_id(), u'')
@@ -1,6 +1,7 @@
 import unittest
 
 from alephmarcreader import AlephMarcXMLReader
+from alephmarcreader.abstractalephmarcreader import _intern_text
 
 class TestMethods(unittest.TestCase):
     def test_author(self):
@@ -278,6 +279,45 @@ class TestMethods(unittest.TestCase):
         self.assertEqual(doc_states[0].prefix, u'Druck')
         self.assertEqual(doc_states[0].reference, u'Joh. I B. Briefe 1, p.444')
 
+    def test_iter_records(self):
+        """
+        Tests that a MarcXML collection holding several records is streamed record by record.
+        """
+        import os
+        import shutil
+        import tempfile
+        from lxml import etree
+
+        sysnos = ['000055275', '000056870', '000054774']
+
+        collection = etree.Element('{http://www.loc.gov/MARC21/slim}collection')
+        for sysno in sysnos:
+            tree = etree.parse('alephmarcreader/tests/sample_data/MarcXML/' + sysno + '.xml')
+            collection.append(tree.getroot()[0])
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            collection_path = os.path.join(tmp_dir, 'collection.xml')
+            etree.ElementTree(collection).write(collection_path, encoding='UTF-8', xml_declaration=True)
+
+            count = 0
+            for sysno, marcxml_rd in zip(sysnos, AlephMarcXMLReader.iter_records(collection_path)):
+                single_rd = AlephMarcXMLReader('alephmarcreader/tests/sample_data/MarcXML/' + sysno + '.xml')
+
+                self.assertEqual([a.name for a in marcxml_rd.get_author()], [a.name for a in single_rd.get_author()])
+                self.assertEqual(marcxml_rd.get_date(), single_rd.get_date())
+                self.assertEqual([s.identifier for s in marcxml_rd.get_shelfmark()],
+                                 [s.identifier for s in single_rd.get_shelfmark()])
+                count += 1
+
+            self.assertEqual(count, 3)
+
+            # readers that are kept after the iterator advanced remain usable
+            kept = list(AlephMarcXMLReader.iter_records(collection_path))
+            self.assertEqual(kept[0].get_date(), [u'1734.03.12'])
+        finally:
+            shutil.rmtree(tmp_dir)
+
     def test_unexpected_cardinality(self):
         """
         Tests if the correct warning is printed, when a subfield occurs more than once,
@@ -306,5 +346,204 @@ class TestMethods(unittest.TestCase):
 
         sys.stderr = previous
 
+    def test_from_memory(self):
+        """
+        Tests that readers can be created from data that is already in memory.
+        """
+        path = 'alephmarcreader/tests/sample_data/MarcXML/000055275.xml'
+
+        with open(path, 'rb') as data_file:
+            marcxml_rd = AlephMarcXMLReader.from_bytes(data_file.read())
+
+        self.assertEqual(marcxml_rd.get_author()[0].name, u'Bernoulli, Daniel')
+        self.assertEqual(marcxml_rd.get_date(), [u'1734.03.12'])
+
+        from lxml import etree
+        marcxml_rd = AlephMarcXMLReader.from_element(etree.parse(path).getroot())
+        self.assertEqual(marcxml_rd.get_author()[0].name, u'Bernoulli, Daniel')
 
+        # warnings name a placeholder instead of a file path
+        with open('alephmarcreader/tests/sample_data/MarcXML/wrong_cardinality.xml', 'rb') as data_file:
+            marcxml_rd = AlephMarcXMLReader.from_bytes(data_file.read())
+
+        import sys
+        previous = sys.stderr
+
+        from io import StringIO
+        catch_err = StringIO()
+
+        sys.stderr = catch_err
+        marcxml_rd.get_date()
+        sys.stderr = previous
+
+        self.assertEqual(catch_err.getvalue(), u'!!! WARNING: In \'<in-memory record>\', '
+                                               u'Field \'046\', Subfield \'c\': Expected maximum 1 Subfield, found 2.\n')
+
+    def test_extract_all(self):
+        """
+        Tests that `extract_all` returns exactly what the individual getters return.
+        """
+        import glob
 
+        for path in glob.glob('alephmarcreader/tests/sample_data/MarcXML/0*.xml'):
+            rd = AlephMarcXMLReader(path)
+
+            extracted = rd.extract_all()
+
+            getters = [name for name in dir(rd) if name.startswith('get_')]
+            self.assertEqual(sorted(extracted), sorted(name[len('get_'):] for name in getters))
+
+            for name in getters:
+                self.assertEqual(rd._to_plain(extracted[name[len('get_'):]]), rd._to_plain(getattr(rd, name)()))
+
+            self.assertEqual(rd.to_dict()['author'][0]['type'], u'Person')
+
+    def test_memoize(self):
+        marcxml_rd = AlephMarcXMLReader('alephmarcreader/tests/sample_data/MarcXML/000055275.xml')
+
+        # not memoized by default
+        self.assertFalse(marcxml_rd.get_author()[0] is marcxml_rd.get_author()[0])
+
+        marcxml_rd.memoize = True
+
+        author = marcxml_rd.get_author()
+        self.assertTrue(author[0] is marcxml_rd.get_author()[0])
+        self.assertTrue(marcxml_rd.get_recipient()[0] is marcxml_rd.extract_all()['recipient'][0])
+
+        # the cached list itself is not handed out
+        author.append(None)
+        self.assertEqual(len(marcxml_rd.get_author()), 1)
+
+        marcxml_rd.clear_cache()
+        self.assertFalse(author[0] is marcxml_rd.get_author()[0])
+        self.assertEqual(author[0].name, marcxml_rd.get_author()[0].name)
+
+    def test_entities(self):
+        """
+        Tests that entities are slotted objects that can be frozen into value objects.
+        """
+        import pickle
+
+        marcxml_rd = AlephMarcXMLReader('alephmarcreader/tests/sample_data/MarcXML/000055275.xml')
+
+        author = marcxml_rd.get_author()[0]
+        self.assertFalse(hasattr(author, '__dict__'))
+
+        other = marcxml_rd.get_author()[0]
+        self.assertFalse(author is other)
+        # mutable entities compare by identity
+        self.assertNotEqual(author, other)
+        self.assertEqual(len(set([author, other])), 2)
+
+        # repeated strings are interned
+        self.assertTrue(author.gnd is other.gnd)
+        self.assertTrue(author.roles[0] is other.roles[0])
+        # also non-ASCII text, which is unicode on Python 2
+        self.assertTrue(_intern_text(u''.join([u'(DE-588)', u'\xe4'])) is _intern_text(u'(DE-588)\xe4'))
+
+        author.freeze()
+        self.assertEqual(type(author).__name__, u'FrozenPerson')
+        self.assertEqual(type(author).__module__, type(other).__module__)
+        self.assertEqual(author.get_type(), u'Person')
+        self.assertEqual(author.roles, (u'aut',))
+        self.assertNotEqual(author, other)
+        self.assertEqual(author, other.freeze())
+        self.assertEqual(hash(author), hash(other))
+        self.assertNotEqual(author, marcxml_rd.get_recipient()[0].freeze())
+        self.assertEqual(len(set([author, other])), 1)
+        self.assertRaises(AttributeError, setattr, author, 'name', u'Bernoulli, Johann')
+
+        unpickled = pickle.loads(pickle.dumps(author))
+        self.assertEqual(unpickled, author)
+        self.assertRaises(AttributeError, setattr, unpickled, 'name', u'Bernoulli, Johann')
+
+        mutable = marcxml_rd.get_author()[0]
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            unpickled = pickle.loads(pickle.dumps(mutable, protocol))
+            self.assertEqual(unpickled._get_values(), mutable._get_values())
+            self.assertEqual(unpickled.roles, [u'aut'])
+            unpickled.name = u'Bernoulli, Johann'
+            self.assertEqual(pickle.loads(pickle.dumps(author, protocol)), author)
+
+    def test_getter_tags(self):
+        """
+        Tests that `GETTER_TAGS` lists every tag read by the getters.
+        """
+        read_tags = set()
+
+        class RecordingReader(AlephMarcXMLReader):
+            def _AbstractAlephMarcReader__get_field(self, index):
+                read_tags.add(index)
+                return super(RecordingReader, self)._AbstractAlephMarcReader__get_field(index)
+
+        rd = RecordingReader('alephmarcreader/tests/sample_data/MarcXML/000055275.xml')
+        for name in dir(rd):
+            if name.startswith('get_'):
+                getattr(rd, name)()
+        rd.extract_all()
+
+        self.assertEqual(read_tags, set(AlephMarcXMLReader.GETTER_TAGS))
+
+    def test_projection(self):
+        """
+        Tests that readers keeping only `GETTER_TAGS` return the same results as readers of the complete record.
+        """
+        import glob
+        import os
+        import shutil
+        import tempfile
+
+        paths = sorted(glob.glob('alephmarcreader/tests/sample_data/MarcXML/0*.xml'))
+
+        for path in paths:
+            self.assertEqual(AlephMarcXMLReader(path, tags=AlephMarcXMLReader.GETTER_TAGS).to_dict(), AlephMarcXMLReader(path).to_dict())
+
+            with open(path, 'rb') as data_file:
+                self.assertEqual(AlephMarcXMLReader.from_bytes(data_file.read(), tags=AlephMarcXMLReader.GETTER_TAGS).to_dict(),
+                                 AlephMarcXMLReader(path).to_dict())
+
+        # getters reading other tags return no results
+        rd = AlephMarcXMLReader('alephmarcreader/tests/sample_data/MarcXML/000055275.xml', tags={'100'})
+        self.assertEqual(rd.get_author()[0].name, u'Bernoulli, Daniel')
+        self.assertEqual(rd.get_date(), [])
+
+        from lxml import etree
+
+        collection = etree.Element('{http://www.loc.gov/MARC21/slim}collection')
+        for path in paths:
+            collection.append(etree.parse(path).getroot()[0])
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            collection_path = os.path.join(tmp_dir, 'collection.xml')
+            etree.ElementTree(collection).write(collection_path, encoding='UTF-8', xml_declaration=True)
+
+            projected = [rd.to_dict() for rd in AlephMarcXMLReader.iter_records(collection_path, {'100', '046'})]
+            self.assertEqual(len(projected), len(paths))
+            self.assertEqual(projected[1]['author'][0]['name'], u'Bernoulli, Daniel')
+            self.assertEqual(projected[1]['date'], [u'1734.03.12'])
+            self.assertEqual(projected[1]['shelfmark'], [])
+
+            projected = [rd.to_dict() for rd in AlephMarcXMLReader.iter_records(collection_path,
+                                                                                AlephMarcXMLReader.GETTER_TAGS)]
+            self.assertEqual(projected, [rd.to_dict() for rd in AlephMarcXMLReader.iter_records(collection_path)])
+
+            # fields other than the requested ones are not part of the parsed tree
+            rd = AlephMarcXMLReader(paths[0], tags={'100'})
+            tags = [ele.get('tag') for ele in rd._AlephMarcXMLReader__root.iter('{*}datafield')]
+            self.assertEqual(tags, ['100'])
+            self.assertTrue(len(list(rd._AlephMarcXMLReader__root.iter('{*}controlfield'))) > 0)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_control_field(self):
+        """
+        Tests the access to the control fields.
+        """
+        rd = AlephMarcXMLReader('alephmarcreader/tests/sample_data/MarcXML/000055275.xml',
+                                tags=AlephMarcXMLReader.GETTER_TAGS)
+        self.assertEqual(rd.control_field('FMT'), u'BK')
+        self.assertEqual(rd.control_field('008'), u'040702s1734    xx            00    fre')
+        self.assertEqual(rd.control_field('001'), None)
+        # data fields are not control fields
+        self.assertEqual(rd.control_field('100'), None)
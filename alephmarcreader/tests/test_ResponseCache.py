@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from alephmarcreader.responsecache import ResponseCache
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'responses.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_get_put(self):
+        with ResponseCache(self.path) as cache:
+            self.assertEqual(cache.get('http://x/X?doc_num=1'), None)
+            cache.put('http://x/X?doc_num=1', b'<find-doc/>')
+            self.assertEqual(cache.get('http://x/X?doc_num=1'), b'<find-doc/>')
+            self.assertTrue('http://x/X?doc_num=1' in cache)
+
+            self.assertEqual(cache.stats()['hits'], 1)
+            self.assertEqual(cache.stats()['misses'], 1)
+            self.assertEqual(cache.stats()['hit_rate'], 0.5)
+
+        # persisted
+        with ResponseCache(self.path) as cache:
+            self.assertEqual(cache.get('http://x/X?doc_num=1'), b'<find-doc/>')
+            self.assertEqual(cache.size(), len(b'<find-doc/>'))
+
+    def test_content_addressed(self):
+        with ResponseCache(self.path) as cache:
+            cache.put('a', b'same response')
+            cache.put('b', b'same response')
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.size(), len(b'same response'))
+
+            # replacing one entry keeps the response of the other
+            cache.put('a', b'other response')
+            self.assertEqual(cache.get('b'), b'same response')
+            self.assertEqual(cache.size(), len(b'same response') + len(b'other response'))
+
+    def test_ttl(self):
+        with ResponseCache(self.path, ttl=0.05) as cache:
+            cache.put('a', b'expires')
+            cache.put('b', b'stays', ttl=60)
+            self.assertEqual(cache.get('a'), b'expires')
+
+            time.sleep(0.1)
+            self.assertEqual(cache.get('a'), None)
+            self.assertEqual(cache.get('b'), b'stays')
+            self.assertEqual(len(cache), 1)
+
+            cache.put('c', b'expires too', ttl=0)
+            self.assertEqual(cache.purge_expired(), 1)
+            self.assertEqual(cache.size(), len(b'stays'))
+
+    def test_lru_eviction(self):
+        with ResponseCache(self.path, max_size=30) as cache:
+            cache.put('a', b'0123456789')
+            time.sleep(0.01)
+            cache.put('b', b'1234567890')
+            time.sleep(0.01)
+            cache.put('c', b'2345678901')
+            time.sleep(0.01)
+
+            # 'a' becomes the most recently used entry
+            cache.get('a')
+            cache.put('d', b'3456789012')
+
+            self.assertEqual(cache.evictions, 1)
+            self.assertFalse('b' in cache)
+            self.assertEqual(sorted(key for key in 'abcd' if key in cache), ['a', 'c', 'd'])
+            self.assertTrue(cache.size() <= 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
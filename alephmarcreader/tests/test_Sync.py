@@ -0,0 +1,168 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pymarc
+from lxml import etree
+
+from alephmarcreader import diagnostics
+from alephmarcreader import AlephMarc21Reader, AlephMarc21RawReader
+from alephmarcreader.sync import sync, Manifest, CHANGE_ADDED, CHANGE_CHANGED, CHANGE_DELETED
+from alephmarcreader.tests.test_SystemNumberIndex import write_marc21_dump, write_marcxml_dump
+
+
+def set_timestamp(dump_path, sysno, timestamp):
+    """
+    Rewrites a Marc21 dump, replacing controlfield 005 of one record.
+    """
+    with open(dump_path, 'rb') as dump:
+        records = list(pymarc.MARCReader(dump, force_utf8=True, to_unicode=True))
+    with open(dump_path, 'wb') as dump:
+        for record in records:
+            if record['001'].data == sysno:
+                record['005'].data = timestamp
+            dump.write(record.as_marc())
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(self.tmp_dir, 'dump.manifest')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_sync_marc21(self):
+        dump_path = os.path.join(self.tmp_dir, 'dump.mrc')
+        write_marc21_dump(dump_path, ['000055275', '000056870', '000054774'])
+
+        # first run: everything is new
+        changes = list(sync(dump_path, self.manifest_path))
+        self.assertEqual([(change.kind, change.sysno) for change in changes],
+                         [(CHANGE_ADDED, '000055275'), (CHANGE_ADDED, '000056870'), (CHANGE_ADDED, '000054774')])
+        self.assertEqual(changes[0].timestamp, u'20180718120700.0')
+        self.assertEqual(changes[0].data,
+                         AlephMarc21Reader('alephmarcreader/tests/sample_data/Marc21/000055275.marc').to_dict())
+        self.assertEqual(len(Manifest.load(self.manifest_path)), 3)
+
+        # nothing has changed
+        self.assertEqual(list(sync(dump_path, self.manifest_path)), [])
+
+        # one record changed, one deleted, one added
+        write_marc21_dump(dump_path, ['000055275', '000054774', '000234529'])
+        set_timestamp(dump_path, '000054774', '20200101120000.0')
+
+        changes = list(sync(dump_path, self.manifest_path))
+        self.assertEqual([(change.kind, change.sysno) for change in changes],
+                         [(CHANGE_CHANGED, '000054774'), (CHANGE_ADDED, '000234529'), (CHANGE_DELETED, '000056870')])
+        self.assertEqual(changes[0].timestamp, u'20200101120000.0')
+        self.assertEqual(changes[0].data['date'], [u'1724.11.21'])
+        self.assertEqual(changes[2].timestamp, u'20180717202900.0')
+        self.assertEqual(changes[2].data, None)
+
+        self.assertEqual(sorted(Manifest.load(self.manifest_path).entries),
+                         ['000054774', '000055275', '000234529'])
+
+    def test_sync_reader_class(self):
+        dump_path = os.path.join(self.tmp_dir, 'dump.mrc')
+        write_marc21_dump(dump_path, ['000055275', '000056870'])
+
+        raw = list(sync(dump_path, self.manifest_path, reader_class=AlephMarc21RawReader))
+        os.remove(self.manifest_path)
+        self.assertEqual(list(sync(dump_path, self.manifest_path)), raw)
+
+    def test_sync_marcxml(self):
+        dump_path = os.path.join(self.tmp_dir, 'dump.xml')
+        write_marcxml_dump(dump_path, ['000055275', '000056870'])
+
+        changes = list(sync(dump_path, self.manifest_path))
+        self.assertEqual([change.kind for change in changes], [CHANGE_ADDED, CHANGE_ADDED])
+        self.assertEqual(changes[1].data['date'], [u'1703.08.27'])
+        # the samples have no 005
+        self.assertEqual(changes[1].timestamp, None)
+
+        # the content has changed, but not the 005
+        tree = etree.parse(dump_path)
+        date = tree.xpath('//*[@tag="046"]/*[@code="c"]')[1]
+        date.text = u'1703.08.28'
+        tree.write(dump_path, encoding='UTF-8', xml_declaration=True)
+
+        # an interrupted run keeps the previous manifest
+        changes = sync(dump_path, self.manifest_path)
+        next(changes)
+        changes.close()
+
+        changes = list(sync(dump_path, self.manifest_path))
+        self.assertEqual([(change.kind, change.sysno) for change in changes], [(CHANGE_CHANGED, '000056870')])
+        self.assertEqual(changes[0].data['date'], [u'1703.08.28'])
+
+    def test_sync_marcxml_prefixed(self):
+        dump_path = os.path.join(self.tmp_dir, 'dump.xml')
+        write_marcxml_dump(dump_path, ['000055275', '000056870'], prefix='m')
+
+        changes = list(sync(dump_path, self.manifest_path))
+        self.assertEqual([(change.kind, change.sysno) for change in changes],
+                         [(CHANGE_ADDED, '000055275'), (CHANGE_ADDED, '000056870')])
+        self.assertEqual(changes[1].data['date'], [u'1703.08.27'])
+
+    def test_no_system_number(self):
+        dump_path = os.path.join(self.tmp_dir, 'dump.mrc')
+        write_marc21_dump(dump_path, ['000055275'])
+        with open('alephmarcreader/tests/sample_data/Marc21/000056870.marc', 'rb') as marc_file:
+            record = marc_file.read()
+        with open(dump_path, 'ab') as dump:
+            dump.write(record)
+
+        sink = diagnostics.AggregateDiagnostics()
+        previous = diagnostics.set_default(sink)
+        try:
+            changes = list(sync(dump_path, self.manifest_path))
+        finally:
+            diagnostics.set_default(previous)
+
+        self.assertEqual([change.sysno for change in changes], ['000055275'])
+        self.assertEqual(sink.total(), 1)
+
+
+    def test_corrupt_record(self):
+        dump_path = os.path.join(self.tmp_dir, 'dump.xml')
+        write_marcxml_dump(dump_path, ['000055275', '000056870', '000054774'])
+        with open(dump_path, 'rb') as dump:
+            data = dump.read()
+
+        def write_dump(date):
+            with open(dump_path, 'wb') as dump:
+                dump.write(data.replace(b'1703.08.27', date))
+
+        def run():
+            sink = diagnostics.AggregateDiagnostics()
+            previous = diagnostics.set_default(sink)
+            try:
+                changes = list(sync(dump_path, self.manifest_path))
+            finally:
+                diagnostics.set_default(previous)
+            return [(change.kind, change.sysno) for change in changes], sink
+
+        # the record in the middle cannot be parsed: skipped, the others are synchronised
+        write_dump(b'<broken')
+        changes, sink = run()
+        self.assertEqual(changes, [(CHANGE_ADDED, '000055275'), (CHANGE_ADDED, '000054774')])
+        self.assertTrue(sink.total() >= 1)
+        self.assertEqual(sorted(Manifest.load(self.manifest_path).entries), ['000054774', '000055275'])
+
+        # it is tried again on the next run
+        write_dump(b'1703.08.27')
+        self.assertEqual(run()[0], [(CHANGE_ADDED, '000056870')])
+
+        # a changed record that cannot be parsed keeps its previous state, it is not deleted
+        previous = Manifest.load(self.manifest_path).get('000056870')
+        write_dump(b'<broken')
+        self.assertEqual(run()[0], [])
+        self.assertEqual(Manifest.load(self.manifest_path).get('000056870'), previous)
+        write_dump(b'1703.08.28')
+        self.assertEqual(run()[0], [(CHANGE_CHANGED, '000056870')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import pymarc
+from lxml import etree
+
+from alephmarcreader.sysnoindex import SystemNumberIndex, FORMAT_MARC21, FORMAT_MARCXML
+
+SYSNOS = ['000055275', '000056870', '000054774', '000234529']
+
+
+def write_marc21_dump(dump_path, sysnos):
+    """
+    Writes the sample records to one Marc21 file, adding the system number as controlfield 001.
+    """
+    with open(dump_path, 'wb') as dump:
+        for sysno in sysnos:
+            with open('alephmarcreader/tests/sample_data/Marc21/' + sysno + '.marc', 'rb') as marc_file:
+                record = next(pymarc.MARCReader(marc_file, force_utf8=True, to_unicode=True))
+            record.add_ordered_field(pymarc.Field(tag='001', data=sysno))
+            dump.write(record.as_marc())
+
+
+def write_marcxml_dump(dump_path, sysnos, prefix=None):
+    """
+    Writes the sample records to one MarcXML collection, adding the system number as controlfield 001.
+    :param str|None prefix: the namespace prefix of the elements, declared on the collection.
+    """
+    namespace = '{http://www.loc.gov/MARC21/slim}'
+    collection = etree.Element(namespace + 'collection', nsmap={prefix: namespace[1:-1]})
+    for sysno in sysnos:
+        record = etree.parse('alephmarcreader/tests/sample_data/MarcXML/' + sysno + '.xml').getroot()[0]
+        controlfield = etree.Element(namespace + 'controlfield', tag='001')
+        controlfield.text = sysno
+        record.insert(1, controlfield)
+        collection.append(record)
+    etree.ElementTree(collection).write(dump_path, encoding='UTF-8', xml_declaration=True)
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_lookup_marc21(self):
+        dump_path = os.path.join(self.tmp_dir, 'dump.mrc')
+        write_marc21_dump(dump_path, SYSNOS)
+
+        with SystemNumberIndex(dump_path) as index:
+            self.assertEqual(len(index), 4)
+            self.assertTrue(os.path.exists(dump_path + '.sysidx'))
+
+            self.assertEqual(index.lookup('000056870').get_date(), [u'1703.08.27'])
+            self.assertEqual(index.lookup(55275).get_author()[0].name, u'Bernoulli, Daniel,')
+            self.assertFalse('000000001' in index)
+            self.assertRaises(KeyError, index.lookup, '000000001')
+            self.assertFalse('abc' in index)
+            self.assertEqual(index.get_offset(''), None)
+            self.assertRaises(KeyError, index.lookup, 'abc')
+
+    def test_lookup_marcxml(self):
+        dump_path = os.path.join(self.tmp_dir, 'dump.xml')
+        write_marcxml_dump(dump_path, SYSNOS)
+
+        with SystemNumberIndex(dump_path, FORMAT_MARCXML) as index:
+            self.assertEqual(len(index), 4)
+
+            self.assertEqual(index.lookup('000056870').get_date(), [u'1703.08.27'])
+            self.assertEqual(index.lookup('000055275').get_author()[0].name, u'Bernoulli, Daniel')
+
+    def test_lookup_marcxml_prefixed(self):
+        """
+        Tests a dump whose namespace prefix is only declared on the collection, with attributes before the tag.
+        """
+        dump_path = os.path.join(self.tmp_dir, 'dump.xml')
+        write_marcxml_dump(dump_path, SYSNOS, prefix='m')
+        with open(dump_path, 'rb') as dump:
+            data = dump.read()
+        self.assertIn(b'<m:record', data)
+        with open(dump_path, 'wb') as dump:
+            dump.write(data.replace(b'tag="001"', b'id="sysno" tag="001"'))
+
+        with SystemNumberIndex(dump_path) as index:
+            self.assertEqual(len(index), 4)
+            self.assertEqual(index.lookup('000056870').get_date(), [u'1703.08.27'])
+
+    def test_rebuild(self):
+        """
+        Tests that the index is only rebuilt when the dump has changed.
+        """
+        dump_path = os.path.join(self.tmp_dir, 'dump.mrc')
+        write_marc21_dump(dump_path, SYSNOS[:2])
+
+        SystemNumberIndex(dump_path, FORMAT_MARC21).close()
+        index_mtime = os.stat(dump_path + '.sysidx').st_mtime_ns
+
+        with SystemNumberIndex(dump_path, FORMAT_MARC21) as index:
+            self.assertEqual(len(index), 2)
+        self.assertEqual(os.stat(dump_path + '.sysidx').st_mtime_ns, index_mtime)
+
+        time.sleep(0.01)
+        write_marc21_dump(dump_path, SYSNOS)
+
+        with SystemNumberIndex(dump_path, FORMAT_MARC21) as index:
+            self.assertEqual(len(index), 4)
+            self.assertEqual(index.lookup('000234529').get_date(), index.lookup(234529).get_date())
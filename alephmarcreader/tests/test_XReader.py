@@ -277,7 +277,125 @@ class TestMethods(unittest.TestCase):
         self.assertEqual(doc_states[0].prefix, u'Druck')
         self.assertEqual(doc_states[0].reference, u'Joh. I B. Briefe 1, p.444')
 
-
-
-
-
+    def test_iter_records(self):
+        """
+        Tests that an AlephX response holding several records is streamed record by record.
+        """
+        import os
+        import shutil
+        import tempfile
+        from lxml import etree
+
+        sysnos = ['000055275', '000056870', '000054774']
+
+        present = etree.Element('present')
+        for sysno in sysnos:
+            tree = etree.parse('alephmarcreader/tests/sample_data/AlephX/' + sysno + '.xml')
+            present.append(tree.find('record'))
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            present_path = os.path.join(tmp_dir, 'present.xml')
+            etree.ElementTree(present).write(present_path, encoding='UTF-8', xml_declaration=True)
+
+            count = 0
+            for sysno, alephx_rd in zip(sysnos, AlephXReader.iter_records(present_path)):
+                single_rd = AlephXReader('alephmarcreader/tests/sample_data/AlephX/' + sysno + '.xml')
+
+                self.assertEqual([a.name for a in alephx_rd.get_author()], [a.name for a in single_rd.get_author()])
+                self.assertEqual(alephx_rd.get_date(), single_rd.get_date())
+                self.assertEqual(len(alephx_rd.get_mentioned_person()), len(single_rd.get_mentioned_person()))
+                count += 1
+
+            self.assertEqual(count, 3)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_from_memory(self):
+        """
+        Tests that readers can be created from data that is already in memory.
+        """
+        path = 'alephmarcreader/tests/sample_data/AlephX/000055275.xml'
+
+        with open(path, 'rb') as data_file:
+            alephx_rd = AlephXReader.from_bytes(data_file.read())
+
+        self.assertEqual(alephx_rd.get_author()[0].name, u'Bernoulli, Daniel')
+        self.assertEqual(alephx_rd.get_date(), [u'1734.03.12'])
+
+        from lxml import etree
+        alephx_rd = AlephXReader.from_element(etree.parse(path).getroot())
+        self.assertEqual(alephx_rd.get_author()[0].name, u'Bernoulli, Daniel')
+
+    def test_extract_all(self):
+        """
+        Tests that `extract_all` returns exactly what the individual getters return.
+        """
+        import glob
+
+        for path in glob.glob('alephmarcreader/tests/sample_data/AlephX/0*.xml'):
+            rd = AlephXReader(path)
+
+            extracted = rd.extract_all()
+
+            getters = [name for name in dir(rd) if name.startswith('get_')]
+            self.assertEqual(sorted(extracted), sorted(name[len('get_'):] for name in getters))
+
+            for name in getters:
+                self.assertEqual(rd._to_plain(extracted[name[len('get_'):]]), rd._to_plain(getattr(rd, name)()))
+
+            self.assertEqual(rd.to_dict()['author'][0]['type'], u'Person')
+
+    def test_projection(self):
+        """
+        Tests that readers keeping only `GETTER_TAGS` return the same results as readers of the complete record.
+        """
+        import glob
+        import os
+        import shutil
+        import tempfile
+
+        paths = sorted(glob.glob('alephmarcreader/tests/sample_data/AlephX/0*.xml'))
+
+        for path in paths:
+            self.assertEqual(AlephXReader(path, tags=AlephXReader.GETTER_TAGS).to_dict(), AlephXReader(path).to_dict())
+
+            with open(path, 'rb') as data_file:
+                self.assertEqual(AlephXReader.from_bytes(data_file.read(), tags=AlephXReader.GETTER_TAGS).to_dict(),
+                                 AlephXReader(path).to_dict())
+
+        # getters reading other tags return no results
+        rd = AlephXReader('alephmarcreader/tests/sample_data/AlephX/000055275.xml', tags={'100'})
+        self.assertEqual(rd.get_author()[0].name, u'Bernoulli, Daniel')
+        self.assertEqual(rd.get_date(), [])
+
+        from lxml import etree
+
+        present = etree.Element('present')
+        for path in paths:
+            present.append(etree.parse(path).find('record'))
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            present_path = os.path.join(tmp_dir, 'present.xml')
+            etree.ElementTree(present).write(present_path, encoding='UTF-8', xml_declaration=True)
+
+            projected = [rd.to_dict() for rd in AlephXReader.iter_records(present_path, AlephXReader.GETTER_TAGS)]
+            self.assertEqual(projected, [rd.to_dict() for rd in AlephXReader.iter_records(present_path)])
+            self.assertEqual(len(projected), len(paths))
+
+            rd = AlephXReader(paths[0], tags={'100'})
+            self.assertEqual([ele.get('id') for ele in rd._AlephXReader__root.iter('varfield')], ['100'])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_control_field(self):
+        """
+        Tests the access to the control fields (fixfields).
+        """
+        rd = AlephXReader('alephmarcreader/tests/sample_data/AlephX/000055275.xml', tags=AlephXReader.GETTER_TAGS)
+        self.assertEqual(rd.control_field('FMT'), u'BK')
+        self.assertEqual(rd.control_field('008'), u'040702s1734----xx------------00----fre--')
+        self.assertEqual(rd.control_field('001'), None)
+        # data fields are not control fields
+        self.assertEqual(rd.control_field('100'), None)
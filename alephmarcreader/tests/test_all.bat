@@ -10,6 +10,8 @@ py -2 -m unittest alephmarcreader.tests.test_MarcXMLReader
 
 py -2 -m unittest alephmarcreader.tests.test_XReader
 
+py -2 -m unittest alephmarcreader.tests.test_Imports
+
 ECHO Python v.3
 
 py -3 -m unittest alephmarcreader.tests.test_Marc21Reader
@@ -18,4 +20,32 @@ py -3 -m unittest alephmarcreader.tests.test_MarcXMLReader
 
 py -3 -m unittest alephmarcreader.tests.test_XReader
 
+py -3 -m unittest alephmarcreader.tests.test_Imports
+
+py -3 -m unittest alephmarcreader.tests.test_SystemNumberIndex
+
+py -3 -m unittest alephmarcreader.tests.test_Batch
+
+py -3 -m unittest alephmarcreader.tests.test_Columnar
+
+py -3 -m unittest alephmarcreader.tests.test_Dates
+
+py -3 -m unittest alephmarcreader.tests.test_Diagnostics
+
+py -3 -m unittest alephmarcreader.tests.test_Marc21RawReader
+
+py -3 -m unittest alephmarcreader.tests.test_Aio
+
+py -3 -m unittest alephmarcreader.tests.test_ResponseCache
+
+py -3 -m unittest alephmarcreader.tests.test_ExtractionCache
+
+py -3 -m unittest alephmarcreader.tests.test_Sync
+
+py -3 -m unittest alephmarcreader.tests.test_GndIndex
+
+py -3 -m unittest alephmarcreader.tests.test_ExportSQLite
+
+py -3 -m unittest alephmarcreader.tests.test_DateIndex
+
 PAUSE
\ No newline at end of file
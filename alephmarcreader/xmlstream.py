@@ -0,0 +1,59 @@
+from lxml import etree
+
+
+def iter_elements(source, tag, projection=None):
+    """
+    Incrementally parses an XML document and yields every element with the given tag once it is complete.
+
+    After the consumer has advanced past an element, the element is cleared (its children, text and attributes
+    are removed) and removed from its parent together with all preceding siblings, so that memory use stays
+    at roughly one element regardless of the size of the document.
+    This also happens to elements the consumer keeps: only descendants the consumer still references
+    (e.g. the fields indexed by a reader created from the element) stay intact, together with their own subtrees.
+    :param str|file source: the path to the XML file or a file-like object opened in binary mode.
+    :param str tag: the (namespace qualified) tag of the elements to yield, e.g. '{http://www.loc.gov/MARC21/slim}record'.
+    :param (str, str, set)|None projection: the field element tag, the attribute holding the marc tag
+    and the marc tags to keep, see `parse`. Other fields are dropped once they have been parsed.
+    :return: iterator of etree.Element
+    """
+    if projection is None:
+        events = etree.iterparse(source, events=('end',), tag=tag)
+    else:
+        events = etree.iterparse(source, events=('end',), tag=(tag, projection[0]))
+
+    for event, ele in events:
+        if projection is not None and ele.tag == projection[0]:
+            _drop_field(ele, projection)
+            continue
+
+        yield ele
+
+        ele.clear()
+        parent = ele.getparent()
+        if parent is not None:
+            while ele.getprevious() is not None:
+                del parent[0]
+iter_elements.__annotations__ = {'tag': str}
+
+
+def parse(source, projection):
+    """
+    Parses an XML document, dropping the marc fields that are not part of the projection as soon as they are parsed,
+    so that they are not part of the returned tree.
+    lxml still parses and builds the dropped fields: the projection makes the retained tree smaller,
+    it does not save parsing work.
+    :param str|file source: the path to the XML file or a file-like object opened in binary mode.
+    :param (str, str, set) projection: the field element tag (e.g. '{http://www.loc.gov/MARC21/slim}datafield'),
+    the attribute holding the marc tag (e.g. 'tag') and the marc tags to keep.
+    :return: etree.ElementTree
+    """
+    context = etree.iterparse(source, events=('end',), tag=projection[0])
+    for event, ele in context:
+        _drop_field(ele, projection)
+    return context.root.getroottree()
+parse.__annotations__ = {'return': etree.ElementTree}
+
+
+def _drop_field(ele, projection):
+    if ele.get(projection[1]) not in projection[2]:
+        ele.getparent().remove(ele)
@@ -0,0 +1,69 @@
+"""
+Builds a date index for a synthetic corpus (dates of mixed precision between 1600 and 1800, some of them ranges
+of several years) and compares overlap queries with a scan of all dates with `DateSpans.overlapping`.
+
+Run from the project root: `python benchmarks/bench_date_index.py`
+"""
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy
+
+from alephmarcreader import AlephXReader
+from alephmarcreader.dateindex import DateIndex, DateIndexBuilder
+from alephmarcreader.dates import DateSpans
+
+
+def main(records=1000000):
+    random = numpy.random.RandomState(42)
+    years = random.randint(1600, 1800, records)
+    months = random.randint(1, 13, records)
+    days = random.randint(1, 29, records)
+    precisions = random.randint(0, 3, records)
+    end_years = numpy.where(random.rand(records) < 0.05, years + random.randint(0, 40, records), 0)
+
+    year_spans = years.astype('U4')
+    month_spans = numpy.char.add(numpy.char.add(year_spans, u'.'), numpy.char.zfill(months.astype('U2'), 2))
+    day_spans = numpy.char.add(numpy.char.add(month_spans, u'.'), numpy.char.zfill(days.astype('U2'), 2))
+    starts = numpy.select([precisions == 0, precisions == 1], [year_spans, month_spans], day_spans)
+    ends = numpy.where(end_years > 0, end_years.astype('U4'), u'')
+
+    start = time.perf_counter()
+    builder = DateIndexBuilder()
+    for n, (start_span, end_span) in enumerate(zip(starts.tolist(), ends.tolist())):
+        builder.add('{:09d}'.format(n), [AlephXReader.StandardizedDate(start_span, end_span or False)])
+    spans = DateSpans.parse(starts, ends)
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp_dir, 'corpus.dateidx')
+        builder.write(path)
+        print('built     {} dates in {:.1f} s, {:.1f} MB'.format(records, time.perf_counter() - start,
+                                                                 os.path.getsize(path) / 1e6))
+
+        with DateIndex(path) as index:
+            for first, last in ((datetime.date(1720, 1, 1), datetime.date(1725, 12, 31)),
+                                (datetime.date(1750, 6, 1), datetime.date(1750, 6, 30)),
+                                (datetime.date(1750, 6, 15), datetime.date(1750, 6, 15))):
+                # the first query pages the memory map in
+                index.overlapping(first, last)
+                start = time.perf_counter()
+                found = index.overlapping(first, last)
+                indexed = time.perf_counter() - start
+                start = time.perf_counter()
+                scanned = numpy.flatnonzero(spans.overlapping(first, last))
+                print('{} - {} {:7} records, index {:7.2f} ms, scan {:7.2f} ms'.format(
+                    first, last, len(found), indexed * 1000, (time.perf_counter() - start) * 1000))
+                assert len(found) == len(scanned)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
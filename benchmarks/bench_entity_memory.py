@@ -0,0 +1,73 @@
+"""
+Reports the memory used per entity, comparing the slotted entities of AbstractAlephMarcReader
+with equivalent plain classes holding a per-instance `__dict__` (as the entities were before).
+
+The strings of every entity are created anew (as a parser would), so the numbers include
+the savings from interning repeated values like role codes, GNDs and institutions.
+
+Run from the project root: `python benchmarks/bench_entity_memory.py`
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from alephmarcreader.abstractalephmarcreader import AbstractAlephMarcReader
+
+N = 100000
+
+
+class PlainPerson(object):
+    def __init__(self, name, lifespan, gnd, roles):
+        self.name = name
+        self.gnd = gnd
+        self.roles = roles
+        self.lifespan = lifespan
+
+
+class PlainShelfmark(object):
+    def __init__(self, institution, identifier, country, collection):
+        self.institution = institution
+        self.identifier = identifier
+        self.country = country
+        self.collection = collection
+
+
+def fresh(text):
+    # a new string object with the same value, as returned by a parser
+    return ''.join(list(text))
+
+
+def person_args(i):
+    return (fresh('Bernoulli, Daniel'), fresh('1700-1782'), fresh('(DE-588)118656503'), [fresh('aut')])
+
+
+def shelfmark_args(i):
+    return (fresh('UB Basel'), 'L Ia 21:Bl.{}'.format(i), fresh('CH'), fresh('Handschriften'))
+
+
+def measure(entity_class, make_args):
+    """
+    Returns the memory retained per entity, including its strings and lists.
+    """
+    tracemalloc.start()
+    entities = [entity_class(*make_args(i)) for i in range(N)]
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entities
+    return float(retained) / N
+
+
+def main():
+    for name, plain_class, slotted_class, make_args in [
+            ('Person', PlainPerson, AbstractAlephMarcReader.Person, person_args),
+            ('Shelfmark', PlainShelfmark, AbstractAlephMarcReader.Shelfmark, shelfmark_args)]:
+        before = measure(plain_class, make_args)
+        after = measure(slotted_class, make_args)
+        print('{:10} bytes/entity before: {:7.1f}  after: {:7.1f}  ({:.0%} less)'.format(
+            name, before, after, 1 - after / before))
+
+
+if __name__ == '__main__':
+    main()
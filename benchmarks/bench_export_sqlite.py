@@ -0,0 +1,39 @@
+"""
+Exports a synthetic corpus (the AlephX samples, repeated) into SQLite and reports the time
+with one transaction per record and with the default batch size.
+
+Run from the project root: `python benchmarks/bench_export_sqlite.py`
+"""
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from alephmarcreader import AlephXReader
+from alephmarcreader.export import sqlite
+
+
+def main(records=20000):
+    samples = [AlephXReader(path, tags=AlephXReader.GETTER_TAGS)
+               for path in sorted(glob.glob('alephmarcreader/tests/sample_data/AlephX/0*.xml'))]
+    for sample in samples:
+        sample.memoize = True
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for batch_size in (1, 10000):
+            path = os.path.join(tmp_dir, 'corpus{}.sqlite'.format(batch_size))
+            start = time.perf_counter()
+            sqlite.export((samples[n % len(samples)] for n in range(records)), path, batch_size=batch_size)
+            print('batch size {:6} {} records in {:.2f} s, {:.1f} MB'.format(
+                batch_size, records, time.perf_counter() - start, os.path.getsize(path) / 1e6))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
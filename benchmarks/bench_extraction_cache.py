@@ -0,0 +1,54 @@
+"""
+Extracts copies of the AlephX sample files with `extract_many`, once into an empty `ExtractionCache` (cold),
+once with the warm cache and once after touching all files (only their modification time changes), and reports times.
+
+Run from the project root: `python benchmarks/bench_extraction_cache.py`
+"""
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from alephmarcreader.batch import extract_many, FORMAT_ALEPHX
+from alephmarcreader.extractioncache import ExtractionCache
+
+
+def run(label, paths, cache):
+    hits = cache.hits
+    start = time.perf_counter()
+    results = list(extract_many(paths, FORMAT_ALEPHX, workers=1, cache=cache))
+    seconds = time.perf_counter() - start
+    assert all(result.error is None for result in results)
+    print('{:8} {:6} files  {:6} hits  {:8.1f} ms'.format(label, len(paths), cache.hits - hits, seconds * 1000))
+
+
+def main(copies=300):
+    samples = sorted(glob.glob('alephmarcreader/tests/sample_data/AlephX/0*.xml'))
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        # every copy gets a different content, so that no results are shared
+        paths = []
+        for copy in range(copies):
+            for sample in samples:
+                paths.append(os.path.join(tmp_dir, '{}_{}'.format(copy, os.path.basename(sample))))
+                with open(sample, 'rb') as source, open(paths[-1], 'wb') as target:
+                    target.write(source.read() + '<!-- {} -->\n'.format(copy).encode('ascii'))
+
+        with ExtractionCache(os.path.join(tmp_dir, 'extracted.sqlite')) as cache:
+            run('cold', paths, cache)
+            run('warm', paths, cache)
+            for path in paths:
+                os.utime(path, None)
+            run('touched', paths, cache)
+            print(cache.stats())
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Counts subfield lookups and subfield scans per record for all three backends
+and times a full extraction (all public getters) per record.
+
+Before the per-field subfield map, every subfield lookup was one scan (an XPath
+evaluation for MarcXML and AlephX, a `get_subfields` pass for Marc21).
+Now a field is scanned once, no matter how many subfields are looked up on it.
+
+Run from the project root: `python benchmarks/bench_field_access.py`
+"""
+import glob
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from alephmarcreader import AlephMarc21Reader, AlephMarcXMLReader, AlephXReader
+
+SAMPLE_DATA = os.path.join('alephmarcreader', 'tests', 'sample_data')
+
+GETTERS = [name for name in dir(AlephMarcXMLReader) if name.startswith('get_')]
+
+BACKENDS = [
+    ('Marc21', AlephMarc21Reader, os.path.join(SAMPLE_DATA, 'Marc21', '0*.marc')),
+    ('MarcXML', AlephMarcXMLReader, os.path.join(SAMPLE_DATA, 'MarcXML', '0*.xml')),
+    ('AlephX', AlephXReader, os.path.join(SAMPLE_DATA, 'AlephX', '0*.xml')),
+]
+
+
+def extract(reader):
+    for name in GETTERS:
+        getattr(reader, name)()
+
+
+def count(reader_class, paths):
+    """
+    Returns the number of subfield lookups and subfield scans for a full extraction of all records.
+    """
+    counts = {'lookups': 0, 'scans': 0}
+
+    class CountingReader(reader_class):
+        def _AbstractAlephMarcReader__get_subfield_texts(self, marc_field, index):
+            counts['lookups'] += 1
+            return super(CountingReader, self)._AbstractAlephMarcReader__get_subfield_texts(marc_field, index)
+
+        def _AbstractAlephMarcReader__iter_subfields(self, marc_field):
+            counts['scans'] += 1
+            return super(CountingReader, self)._AbstractAlephMarcReader__iter_subfields(marc_field)
+
+    for path in paths:
+        extract(CountingReader(path))
+
+    return counts['lookups'], counts['scans']
+
+
+def main(repeat=200):
+    for name, reader_class, pattern in BACKENDS:
+        paths = sorted(glob.glob(pattern))
+        lookups, scans = count(reader_class, paths)
+        seconds = min(timeit.repeat(lambda: [extract(reader_class(path)) for path in paths], number=1, repeat=repeat))
+        print('{:8} records: {}  subfield lookups/record: {:6.1f}  subfield scans/record: {:6.1f}  '
+              'ms/record: {:.3f}'.format(name, len(paths), float(lookups) / len(paths), float(scans) / len(paths),
+                                         seconds * 1000 / len(paths)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Builds a GND index for a synthetic corpus (the GND roles of the AlephX samples, with the GNDs drawn
+from a skewed distribution over many persons) and reports the size of the index and the time of lookups
+and intersections of frequent GNDs.
+
+Run from the project root: `python benchmarks/bench_gnd_index.py`
+"""
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy
+
+from alephmarcreader import AlephXReader
+from alephmarcreader.gndindex import GndIndex, GndIndexBuilder, get_gnd_roles
+
+
+def main(records=1000000, gnds=100000):
+    samples = [get_gnd_roles(AlephXReader(path))
+               for path in sorted(glob.glob('alephmarcreader/tests/sample_data/AlephX/0*.xml'))]
+
+    # the roles of the samples, with GNDs following a Zipf like distribution
+    random = numpy.random.RandomState(42)
+    start = time.perf_counter()
+    builder = GndIndexBuilder()
+    for n in range(records):
+        roles = [role for _, role in samples[n % len(samples)]]
+        picks = numpy.minimum(random.zipf(1.3, len(roles)), gnds) - 1
+        builder.add('{:09d}'.format(n), [('(DE-588)' + str(pick), role) for pick, role in zip(picks, roles)])
+    postings = sum(len(sample) for sample in samples) * records // len(samples)
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp_dir, 'corpus.gndidx')
+        builder.write(path)
+        print('built   {} records, {} postings in {:.1f} s, {:.1f} MB'.format(
+            records, postings, time.perf_counter() - start, os.path.getsize(path) / 1e6))
+
+        with GndIndex(path) as index:
+            for gnd in ('(DE-588)0', '(DE-588)1', '(DE-588)50'):
+                start = time.perf_counter()
+                found = index.records(gnd)
+                print('records {:14} {:8} records {:8.2f} ms'.format(gnd, len(found),
+                                                                      (time.perf_counter() - start) * 1000))
+
+            start = time.perf_counter()
+            found = index.intersect(('(DE-588)0', ['aut']), '(DE-588)1')
+            print('intersect           {:8} records {:8.2f} ms'.format(len(found),
+                                                                        (time.perf_counter() - start) * 1000))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Measures the import time of the package with `python -X importtime`, each in a fresh interpreter,
+for a plain `import alephmarcreader` and for each backend, and shows which of lxml and pymarc get loaded.
+
+Before the package level names were resolved lazily, every import loaded all three readers,
+and with them both lxml and pymarc.
+
+Run from the project root: `python benchmarks/bench_import_time.py`
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+STATEMENTS = [
+    ('package only', 'import alephmarcreader'),
+    ('Marc21', 'from alephmarcreader import AlephMarc21Reader'),
+    ('MarcXML', 'from alephmarcreader import AlephMarcXMLReader'),
+    ('AlephX', 'from alephmarcreader import AlephXReader'),
+    ('all readers', 'from alephmarcreader import AlephMarc21Reader, AlephMarcXMLReader, AlephXReader'),
+]
+
+
+def import_time(statement):
+    """
+    Returns the cumulative import time of a statement in microseconds.
+    """
+    # -X importtime reports all imports of the interpreter startup too, compare against an empty run
+    def run(code):
+        output = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                                stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+        modules = {}
+        for line in output.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            # only top level imports (not indented) add up to the total
+            if not name.startswith('  ', 1):
+                modules[name.strip()] = int(cumulative_us)
+        return modules
+
+    baseline = run('pass')
+    modules = run(statement)
+    added = dict((name, us) for name, us in modules.items() if name not in baseline)
+    return sum(added.values())
+
+
+def loaded(statement, names):
+    """
+    Returns which of the given modules are loaded after a statement.
+    """
+    output = subprocess.run([sys.executable, '-c', statement + '; import sys; print(" ".join(sorted(sys.modules)))'],
+                            cwd=ROOT, stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout.split()
+    return [name for name in names if name in output]
+
+
+def main(repeat=5):
+    for label, statement in STATEMENTS:
+        best = min(import_time(statement) for i in range(repeat))
+        print('{:13} {:8.1f} ms  loads: {}'.format(label, best / 1000.0,
+                                                  ', '.join(loaded(statement, ['lxml', 'pymarc'])) or '-'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Compares the pymarc based `AlephMarc21Reader` with the directory based `AlephMarc21RawReader` on a large Marc21 dump
+(copies of the sample records): streaming all records, streaming and reading one getter,
+and streaming and extracting all getters.
+
+Run from the project root: `python benchmarks/bench_marc21_backends.py`
+"""
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from alephmarcreader import AlephMarc21Reader, AlephMarc21RawReader
+
+SAMPLE_DATA = os.path.join('alephmarcreader', 'tests', 'sample_data')
+
+TASKS = [
+    ('open only', lambda reader: None),
+    ('get_author', lambda reader: reader.get_author()),
+    ('to_dict', lambda reader: reader.to_dict()),
+]
+
+
+def write_dump(path, copies):
+    samples = []
+    for sample in sorted(glob.glob(os.path.join(SAMPLE_DATA, 'Marc21', '0*.marc'))):
+        with open(sample, 'rb') as marc_file:
+            samples.append(marc_file.read())
+    with open(path, 'wb') as out:
+        for i in range(copies):
+            out.write(b''.join(samples))
+    return copies * len(samples)
+
+
+def main(copies=2000):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        dump_path = os.path.join(tmp_dir, 'dump.mrc')
+        records = write_dump(dump_path, copies)
+        print('{} records, {:.1f} MB'.format(records, os.path.getsize(dump_path) / 1e6))
+
+        for label, task in TASKS:
+            times = []
+            for reader_class in (AlephMarc21Reader, AlephMarc21RawReader):
+                start = time.perf_counter()
+                for reader in reader_class.iter_records(dump_path):
+                    task(reader)
+                times.append((time.perf_counter() - start) * 1e6 / records)
+            print('{:12} pymarc: {:7.1f} us/record  raw: {:7.1f} us/record  speedup: {:.1f}x'.format(
+                label, times[0], times[1], times[0] / times[1]))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
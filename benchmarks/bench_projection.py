@@ -0,0 +1,95 @@
+"""
+Times the streaming of a large Marc21 dump with and without the `GETTER_TAGS` projection
+(pymarc only parses the kept fields) and measures the peak memory of holding the parsed Marc21 records.
+For MarcXML, lxml still parses every field, so only the number of elements retained of the parsed collection
+is reported, not a time.
+
+Run from the project root: `python benchmarks/bench_projection.py`
+"""
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lxml import etree
+
+from alephmarcreader import AlephMarc21Reader, AlephMarcXMLReader
+from alephmarcreader import xmlstream
+
+SAMPLE_DATA = os.path.join('alephmarcreader', 'tests', 'sample_data')
+
+
+def write_collection(path, copies):
+    collection = etree.Element('{http://www.loc.gov/MARC21/slim}collection')
+    records = [etree.parse(sample).getroot()[0] for sample in sorted(glob.glob(os.path.join(SAMPLE_DATA, 'MarcXML', '0*.xml')))]
+    with open(path, 'wb') as out:
+        out.write(b'<?xml version="1.0" encoding="UTF-8"?>\n<collection xmlns="http://www.loc.gov/MARC21/slim">\n')
+        for i in range(copies):
+            for record in records:
+                out.write(etree.tostring(record))
+        out.write(b'</collection>\n')
+    return copies * len(records)
+
+
+def write_dump(path, copies):
+    samples = []
+    for sample in sorted(glob.glob(os.path.join(SAMPLE_DATA, 'Marc21', '0*.marc'))):
+        with open(sample, 'rb') as marc_file:
+            samples.append(marc_file.read())
+    with open(path, 'wb') as out:
+        for i in range(copies):
+            out.write(b''.join(samples))
+    return copies * len(samples)
+
+
+def run(label, records, iterate):
+    start = time.perf_counter()
+    for reader in iterate():
+        reader.to_dict()
+    seconds = time.perf_counter() - start
+    print('{:28} {:8.1f} us/record'.format(label, seconds * 1e6 / records))
+
+
+def peak_memory(iterate):
+    tracemalloc.start()
+    readers = list(iterate())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, len(readers)
+
+
+def main(copies=500):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        collection_path = os.path.join(tmp_dir, 'collection.xml')
+        dump_path = os.path.join(tmp_dir, 'dump.mrc')
+        xml_records = write_collection(collection_path, copies)
+        marc21_records = write_dump(dump_path, copies)
+
+        tags = AlephMarcXMLReader.GETTER_TAGS
+        run('Marc21', marc21_records, lambda: AlephMarc21Reader.iter_records(dump_path))
+        run('Marc21, GETTER_TAGS', marc21_records, lambda: AlephMarc21Reader.iter_records(dump_path, tags))
+
+        # peak memory of keeping all parsed records (the python side only, lxml allocates outside of tracemalloc)
+        for label, iterate in [('Marc21 kept', lambda: AlephMarc21Reader.iter_records(dump_path)),
+                               ('Marc21 kept, GETTER_TAGS', lambda: AlephMarc21Reader.iter_records(dump_path, tags))]:
+            peak, count = peak_memory(iterate)
+            print('{:28} {:8.0f} bytes/record'.format(label, float(peak) / count))
+
+        # the XML projection does not save parsing work, it drops fields from the retained tree
+        full = sum(1 for _ in etree.parse(collection_path).iter())
+        projected = sum(1 for _ in xmlstream.parse(
+            collection_path, ('{http://www.loc.gov/MARC21/slim}datafield', 'tag', tags)).iter())
+        print('{:28} {:8.1f} elements/record'.format('MarcXML kept', float(full) / xml_records))
+        print('{:28} {:8.1f} elements/record'.format('MarcXML kept, GETTER_TAGS', float(projected) / xml_records))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
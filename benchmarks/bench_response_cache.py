@@ -0,0 +1,55 @@
+"""
+Fetches the AlephX sample records many times from a local stand-in server (the stub of the unit tests),
+once without the response cache (cold) and once with a warm `ResponseCache`, and reports requests and time.
+
+Run from the project root: `python benchmarks/bench_response_cache.py`
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from alephmarcreader.aio import fetch_records
+from alephmarcreader.responsecache import ResponseCache
+from alephmarcreader.tests.test_Aio import StubAlephX, SYSNOS
+
+
+def run(label, base_url, server, sysnos, cache=None):
+    requests = len(server.requests)
+    start = time.perf_counter()
+    results = asyncio.run(fetch_records(sysnos, base_url, concurrency=8, cache=cache))
+    seconds = time.perf_counter() - start
+    assert all(result.error is None for result in results)
+    print('{:6} {:6} records  {:6} requests  {:7.1f} ms'.format(label, len(sysnos), len(server.requests) - requests,
+                                                               seconds * 1000))
+
+
+def main(copies=200):
+    server = StubAlephX()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    base_url = 'http://127.0.0.1:{}/X'.format(server.server_address[1])
+
+    # the sample system numbers, repeated; the cold run fetches every repetition
+    sysnos = SYSNOS * copies
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        with ResponseCache(os.path.join(tmp_dir, 'responses.sqlite')) as cache:
+            run('cold', base_url, server, sysnos, cache)
+            run('warm', base_url, server, sysnos, cache)
+            print(cache.stats())
+    finally:
+        shutil.rmtree(tmp_dir)
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+if __name__ == '__main__':
+    main()